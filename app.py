@@ -1,3 +1,4 @@
+import json
 import logging
 import time
 import uuid
@@ -6,6 +7,14 @@ from datetime import datetime, timedelta
 import streamlit as st
 
 from graph.compile_graph import graph
+from llm.circuit_breaker import CircuitOpenError
+from llm.llm_config import set_secrets_provider
+from ui.graph_adapter import (
+    StreamlitQueueStatus,
+    StreamlitResultsStream,
+    build_streamlit_graph_config,
+)
+from ui.speculation import get_document, start_speculative_work, take_speculative_result
 from ui.ui_components import (
     check_file_uploads,
     create_criteria_section,
@@ -14,18 +23,35 @@ from ui.ui_components import (
     create_project_upload_section,
     create_results_section,
     create_user_feedback_form,
+    read_about_section,
+    read_static_text,
+    render_prompt_editor,
+    show_rerun_timing,
 )
+from utils.admission_control import admission_controller
+from utils.artifact_store import artifact_store
 from utils.airtable_utils import AirtableHandler
-from utils.file_utils import delete_files, extract_text_from_file, save_uploaded_files
 from utils.prompt_manager import prompt_manager
-from utils.results_handler import handle_check_results, prepare_results_json
+from utils.results_handler import (
+    handle_check_results,
+    load_artifact,
+    prepare_results_json,
+    store_artifact,
+)
+from utils.run_index import run_index
 from utils.s3_utils import S3Handler, prepare_s3_files, save_to_s3
+from utils.text_extraction import EmptyDocumentError, has_text_content
 
 logging.basicConfig(level=logging.WARNING)
 
+# Ключи API веб-приложения хранятся в секретах Streamlit
+set_secrets_provider(st.secrets.get)
+
 
 def main():
 
+    rerun_start_time = time.perf_counter()
+
     st.set_page_config(
         layout="wide",
         page_title="AI-ассистент куратора проектного практикума",
@@ -44,15 +70,24 @@ def main():
     # Основная вкладка для проверки проектов
     with tab1:
         # Загружаем критерии по умолчанию
-        with open("Критерии.txt", "r", encoding="utf-8") as f:
-            default_criteria = f.read()
+        default_criteria = read_static_text("Критерии.txt")
 
         # Формируем основные элементы интерфейса
         passport_file, report_file = create_project_upload_section()
         custom_criteria, new_criteria_file = create_criteria_section(default_criteria)
-        skip_feedback, llm_choice = create_options_section()
+        skip_feedback, llm_choice, node_llm_choices, use_llm_cache, normalize_text = (
+            create_options_section()
+        )
 
         st.session_state["llm_choice"] = llm_choice
+        st.session_state["node_llm_choices"] = node_llm_choices
+        st.session_state["use_llm_cache"] = use_llm_cache
+
+        # Пока пользователь заполняет форму, заранее извлекаем текст
+        # и адаптируем критерии под паспорт
+        start_speculative_work(
+            passport_file, report_file, new_criteria_file, default_criteria, normalize_text
+        )
 
         # Запрашиваем согласие на обработку файлов
         consent = st.checkbox(
@@ -62,9 +97,26 @@ def main():
 
         start_check = st.button("🔍 Проверить отчет", disabled=not consent)
 
+        # Показываем загрузку сервиса, если проверки ожидают в очереди
+        admission_metrics = admission_controller.get_metrics()
+        if admission_metrics["queue_depth"]:
+            st.caption(
+                f"⏳ Сейчас выполняется проверок: {admission_metrics['running']}, "
+                f"в очереди: {admission_metrics['queue_depth']}"
+            )
+
         if start_check:
             # Очищаем все предыдущие результаты
-            keys_to_keep = ["llm_choice", "session_id"]
+            keys_to_keep = [
+                "llm_choice",
+                "node_llm_choices",
+                "use_llm_cache",
+                "session_id",
+                "speculation",
+                "speculation_taken",
+                "speculation_digests",
+                "rerun_timings",
+            ]
             for key in list(st.session_state.keys()):
                 if key not in keys_to_keep:
                     del st.session_state[key]
@@ -74,40 +126,90 @@ def main():
                 # если файлы не загружены
                 check_file_uploads(passport_file, new_criteria_file)
 
-                # Сохраняем загруженные файлы
-                files_to_save = {
-                    "passport": passport_file,
-                    "report": report_file,
-                    "criteria": new_criteria_file if new_criteria_file else None,
+                # Запоминаем загруженные файлы: в session_state хранятся только
+                # дескрипторы, а содержимое - в хранилище данных сессий
+                artifact_store.clear_session(st.session_state.session_id)
+                st.session_state.files_to_save = {
+                    slot: (
+                        artifact_store.put(
+                            st.session_state.session_id, file.name, file.getbuffer()
+                        )
+                        if file
+                        else None
+                    )
+                    for slot, file in (
+                        ("passport", passport_file),
+                        ("report", report_file),
+                        ("criteria", new_criteria_file),
+                    )
+                }
+
+                # Берем текст, извлеченный и очищенный от шума заранее,
+                # или извлекаем его сейчас
+                passport, passport_normalization = get_document(
+                    "passport", passport_file, normalize_text
+                )
+                report, report_normalization = get_document(
+                    "report", report_file, normalize_text
+                )
+                st.session_state.normalization = {
+                    "passport": passport_normalization,
+                    "report": report_normalization,
                 }
-                st.session_state.files_to_save = files_to_save
-                saved_files = save_uploaded_files(files_to_save)
 
                 # Формируем входные данные для графа
                 inputs = {
-                    "passport": (
-                        extract_text_from_file(saved_files.get("passport", ""))
-                        if passport_file
-                        else ""
-                    ),
-                    "report": (extract_text_from_file(saved_files.get("report", ""))),
+                    "passport": passport,
+                    "report": report,
                     "criteria": (
-                        extract_text_from_file(saved_files.get("criteria", ""))
+                        get_document("criteria", new_criteria_file, False)[0]
                         if new_criteria_file
                         else default_criteria
                     ),
                     "skip_feedback": skip_feedback,
                 }
 
+                # Если критерии уже адаптированы заранее, этап "Аналитик" пропускается
+                precomputed_criteria = take_speculative_result("criteria_forming")
+                if precomputed_criteria:
+                    inputs.update(precomputed_criteria)
+                st.session_state.speculation_used = precomputed_criteria is not None
+
                 try:
-                    # Запускаем граф
-                    config = {"configurable": {"thread_id": str(uuid.uuid4())}}
-                    start_time = time.time()
-                    graph.invoke(inputs, config=config)
-                    end_time = time.time()
+                    # Не ставим в очередь отчет без текста
+                    if not has_text_content(inputs["report"]):
+                        raise EmptyDocumentError("Отчет не содержит текста для проверки")
+
+                    # Ожидаем своей очереди, если запущено много проверок
+                    queue_status = StreamlitQueueStatus()
+                    with admission_controller.admit(
+                        on_wait=queue_status.on_wait
+                    ) as queue_wait:
+                        queue_status.clear()
+                        # Запускаем граф и показываем результаты каждого
+                        # этапа, не дожидаясь завершения остальных
+                        config = build_streamlit_graph_config()
+                        results_stream = StreamlitResultsStream()
+                        results_stream.update(inputs)
+                        start_time = time.time()
+                        for update in graph.stream(
+                            inputs, config=config, stream_mode="updates"
+                        ):
+                            for values in update.values():
+                                results_stream.update(values)
+                        end_time = time.time()
+                    st.session_state.queue_wait = queue_wait
+                    st.session_state.admission_metrics = (
+                        admission_controller.get_metrics()
+                    )
                     st.session_state.duration = end_time - start_time
+                    logging.info(
+                        f"Очередь проверок: {st.session_state.admission_metrics}"
+                    )
                     # Обрабатываем результаты проверки
                     handle_check_results(config, graph, custom_criteria, skip_feedback)
+                    # Полные результаты выводятся в секции после проверки
+                    results_stream.clear()
                     st.session_state.report_file_name = report_file.name.split(".")[0]
 
                     # Устанавливаем Московское время
@@ -117,6 +219,18 @@ def main():
                         "%Y%m%d_%H%M%S"
                     )
 
+                except EmptyDocumentError as e:
+                    st.error(
+                        "⚠️ Не удалось извлечь текст из отчета. Если отчет отсканирован, "
+                        "загрузите версию с текстовым слоем.",
+                    )
+                    logging.error(f"Ошибка при проверке: {e}")
+                except CircuitOpenError as e:
+                    st.error(
+                        f"{e}. Пожалуйста, выберите другую модель.",
+                        icon="⛔",
+                    )
+                    logging.error(f"Ошибка при проверке: {e}")
                 except Exception as e:
                     st.error(
                         "При проверке возникла ошибка. Пожалуйста попробуйте снова.\n"
@@ -124,9 +238,6 @@ def main():
                         icon="😞",
                     )
                     logging.error(f"Ошибка при проверке: {e}")
-                finally:
-                    # Удаляем загруженные файлы
-                    delete_files(list(saved_files.values()))
             else:
                 st.error(
                     "⚠️ Для запуска проверки необходимо загрузить отчет по проекту."
@@ -135,13 +246,12 @@ def main():
 
     # Вкладка для управления промптами
     with tab2:
-        prompt_manager.render_prompt_editor()
+        render_prompt_editor(prompt_manager)
 
     # Вкладка с информацией о проекте
     with tab3:
         try:
-            with open("README.md", "r", encoding="utf-8") as readme_file:
-                readme_content = readme_file.read().split("\n\n\n")[1]
+            readme_content = read_about_section("README.md")
 
             # Отображаем содержимое README с поддержкой Markdown
             st.markdown(readme_content, unsafe_allow_html=True)
@@ -162,15 +272,18 @@ def main():
     """
     )
 
+    # Результаты проверки хранятся в хранилище данных сессий и удаляются
+    # после долгого бездействия сессии
+    check_result = load_artifact("check_result")
+    if "check_result" in st.session_state and check_result is None:
+        del st.session_state["check_result"]
+        with tab1:
+            st.info("ℹ️ Результаты прошлой проверки удалены по истечении времени хранения.")
+
     # Секция после проверки
     if "check_result" in st.session_state:
-        # Подготавливаем файлы для сохранения в S3
-        files_to_s3_save = prepare_s3_files(
-            st.session_state.files_to_save,
-            st.session_state.check_result,
-            st.session_state.check_criteria,
-            st.session_state.feedback,
-        )
+        check_criteria = load_artifact("check_criteria")
+        feedback = load_artifact("feedback")
 
         # Создаем уникальное имя папки для сохранения результатов в S3
         if "folder_name" not in st.session_state:
@@ -178,21 +291,36 @@ def main():
                 f"{st.session_state.current_time}_{uuid.uuid4()}"
             )
 
-        # Подготавливаем JSON для сохранения результатов
-        results_json = prepare_results_json()
+        # Подготавливаем JSON для сохранения результатов один раз за проверку
+        if "results_json" not in st.session_state:
+            results_json = prepare_results_json()
+            store_artifact("results_json", json.dumps(results_json, ensure_ascii=False))
+        else:
+            results_json = json.loads(load_artifact("results_json"))
+
         # Сохраняем результаты
         if not st.session_state.get("s3_save_completed", False):
-            if "s3_handler" not in st.session_state:
-                st.session_state.s3_handler = S3Handler()
-                st.session_state.airtable_handler = AirtableHandler()
+            # Подготавливаем файлы для сохранения в S3
+            files_to_s3_save = prepare_s3_files(
+                {
+                    handle["name"]: artifact_store.get(handle)
+                    for handle in st.session_state.files_to_save.values()
+                    if handle
+                },
+                check_result,
+                check_criteria,
+                feedback,
+            )
 
-                # Создаем уникальную папку для данной проверки
-                st.session_state.s3_handler.set_base_path(st.session_state.folder_name)
+            # Создаем уникальную папку для данной проверки
+            s3_handler = S3Handler()
+            s3_handler.set_base_path(st.session_state.folder_name)
+            airtable_handler = AirtableHandler(st.session_state.folder_name)
 
             with st.spinner("Сохранение результатов..."):
                 # Сохраняем результаты в S3
                 save_to_s3(
-                    st.session_state.s3_handler,
+                    s3_handler,
                     files_to_s3_save,
                     st.session_state.report_file_name,
                     results_json,
@@ -200,7 +328,12 @@ def main():
                 )
 
                 # Сохраняем результаты в Airtable
-                st.session_state.airtable_handler.save_to_airtable(results_json)
+                airtable_handler.save_to_airtable(results_json)
+
+                # Добавляем запуск в индекс для аналитики; время записи
+                # совпадает с сохранением в S3, поэтому синхронизация
+                # индекса не загружает эту запись повторно
+                run_index.upsert(st.session_state.folder_name, results_json, time.time())
 
             # Отмечаем, что сохранение в S3 завершено
             st.session_state.s3_save_completed = True
@@ -209,11 +342,7 @@ def main():
         # и кнопку для скачивания результатов
         with tab1:
             # Отображаем результаты проверки
-            create_results_section(
-                st.session_state.check_criteria,
-                st.session_state.check_result,
-                st.session_state.feedback,
-            )
+            create_results_section(check_criteria, check_result, feedback)
 
             # Отображаем форму обратной связи
             # и кнопку для отправки обратной связи
@@ -224,9 +353,21 @@ def main():
             if sent_feedback:
                 results_json["feedback_from_user"]["rating"] = mark
                 results_json["feedback_from_user"]["comment"] = comment
+                store_artifact(
+                    "results_json", json.dumps(results_json, ensure_ascii=False)
+                )
+                # Обработчики не хранятся в сессии: папка в S3 определяется
+                # по имени, а запись Airtable - по ключу в общем хранилище
+                s3_handler = S3Handler()
+                s3_handler.set_base_path(st.session_state.folder_name)
                 with st.spinner("Сохранение обратной связи..."):
-                    st.session_state.s3_handler.save_results_json_to_s3(results_json)
-                    st.session_state.airtable_handler.update_airtable(results_json)
+                    s3_handler.save_results_json_to_s3(results_json)
+                    AirtableHandler(st.session_state.folder_name).update_airtable(
+                        results_json
+                    )
+                    run_index.upsert(
+                        st.session_state.folder_name, results_json, time.time()
+                    )
                 st.success("Благодарим за обратную связь!")
 
             # Формируем имя файла для скачивания результатов
@@ -238,12 +379,15 @@ def main():
 
             # Отображаем кнопку для скачивания результатов
             create_download_section(
-                st.session_state.check_result,
-                st.session_state.html_content,
-                st.session_state.pdf_bytes,
+                check_result,
+                load_artifact("html_content"),
+                load_artifact("pdf_bytes"),
                 file_name_base,
             )
 
+    # Длительность перезапуска сценария
+    show_rerun_timing(rerun_start_time)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,197 @@
+import argparse
+import csv
+import os
+import re
+import time
+from collections import Counter, defaultdict
+
+from utils.text_extraction import EXTRACTION_BACKENDS, get_available_backends, iter_pages
+
+# Бэкенды, с результатом которых сравнивается текст, если эталон не задан
+BASELINE_BACKENDS = {".pdf": "pypdf", ".docx": "docx2txt", ".txt": "decode"}
+
+
+def parse_arguments():
+    """Парсинг аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Сравнение скорости и качества бэкендов извлечения текста"
+    )
+
+    parser.add_argument(
+        "--corpus_dir",
+        "-c",
+        type=str,
+        required=True,
+        help="Директория с файлами PDF, DOCX и TXT для проверки",
+    )
+    parser.add_argument(
+        "--reference_dir",
+        "-r",
+        type=str,
+        default=None,
+        help="Директория с эталонным текстом файлов (<имя файла>.txt)",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-n",
+        type=int,
+        default=3,
+        help="Количество запусков каждого бэкенда (берется лучшее время)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="CSV-файл для сохранения результатов по каждому файлу",
+    )
+
+    return parser.parse_args()
+
+
+def tokenize(text):
+    """Разбиение текста на слова без учета регистра"""
+    return Counter(re.findall(r"\w+", text.lower()))
+
+
+def token_f1(text, reference):
+    """
+    F1-мера совпадения слов извлеченного текста с эталоном.
+
+    Порядок слов не учитывается, поэтому разный порядок колонок
+    и переносы строк не снижают оценку.
+    """
+    tokens, reference_tokens = tokenize(text), tokenize(reference)
+    common = sum((tokens & reference_tokens).values())
+    if not common:
+        return 1.0 if not tokens and not reference_tokens else 0.0
+    precision = common / sum(tokens.values())
+    recall = common / sum(reference_tokens.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def run_backend(data, file_name, backend, repeat):
+    """Извлечение текста бэкендом с замером лучшего времени"""
+    best_time = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        pages = list(iter_pages(data, file_name, backend))
+        elapsed = time.perf_counter() - start_time
+        best_time = elapsed if best_time is None else min(best_time, elapsed)
+    return pages, best_time
+
+
+def load_reference(reference_dir, file_name):
+    """Загрузка эталонного текста файла, если он есть"""
+    if not reference_dir:
+        return None
+    path = os.path.join(reference_dir, f"{os.path.splitext(file_name)[0]}.txt")
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def benchmark_file(path, reference_dir, repeat):
+    """Запуск всех доступных бэкендов для одного файла"""
+    file_name = os.path.basename(path)
+    extension = os.path.splitext(file_name)[1].lower()
+    with open(path, "rb") as f:
+        data = f.read()
+
+    texts = {}
+    rows = []
+    for backend in get_available_backends(extension):
+        row = {"file": file_name, "backend": backend, "size_mb": len(data) / 2**20}
+        try:
+            pages, elapsed = run_backend(data, file_name, backend, repeat)
+        except Exception as e:
+            row["error"] = str(e)
+        else:
+            texts[backend] = "\n".join(pages)
+            row.update(
+                {
+                    "seconds": elapsed,
+                    "pages": len(pages),
+                    "chars": len(texts[backend]),
+                    "mb_per_second": row["size_mb"] / elapsed if elapsed else None,
+                }
+            )
+        rows.append(row)
+
+    reference = load_reference(reference_dir, file_name)
+    if reference is None:
+        reference = texts.get(BASELINE_BACKENDS.get(extension))
+    for row in rows:
+        if reference is not None and row["backend"] in texts:
+            row["f1"] = token_f1(texts[row["backend"]], reference)
+    return rows
+
+
+def print_summary(rows):
+    """Вывод сводной таблицы по бэкендам"""
+    totals = defaultdict(lambda: defaultdict(float))
+    for row in rows:
+        total = totals[row["backend"]]
+        total["files"] += 1
+        if "error" in row:
+            total["errors"] += 1
+            continue
+        total["size_mb"] += row["size_mb"]
+        total["seconds"] += row["seconds"]
+        total["pages"] += row["pages"]
+        if "f1" in row:
+            total["f1"] += row["f1"]
+            total["f1_files"] += 1
+
+    header = f"{'Бэкенд':<12}{'Файлов':>8}{'Ошибок':>8}{'МБ/с':>10}{'Стр./с':>10}{'F1':>8}"
+    print(header)
+    print("-" * len(header))
+    for backend, total in totals.items():
+        seconds = total["seconds"] or float("nan")
+        f1 = total["f1"] / total["f1_files"] if total["f1_files"] else float("nan")
+        print(
+            f"{backend:<12}{int(total['files']):>8}{int(total['errors']):>8}"
+            f"{total['size_mb'] / seconds:>10.2f}{total['pages'] / seconds:>10.1f}"
+            f"{f1:>8.3f}"
+        )
+
+
+def main():
+
+    args = parse_arguments()
+
+    supported_formats = tuple(EXTRACTION_BACKENDS)
+    rows = []
+    for file_name in sorted(os.listdir(args.corpus_dir)):
+        if not file_name.lower().endswith(supported_formats):
+            continue
+        print(f"Обработка файла {file_name}...")
+        rows.extend(
+            benchmark_file(
+                os.path.join(args.corpus_dir, file_name),
+                args.reference_dir,
+                args.repeat,
+            )
+        )
+
+    if not rows:
+        print(f"В директории {args.corpus_dir} нет файлов поддерживаемых форматов")
+        return
+
+    print_summary(rows)
+
+    if args.output:
+        fields = [
+            "file", "backend", "size_mb", "seconds", "pages",
+            "chars", "mb_per_second", "f1", "error",
+        ]
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,23 @@ from datetime import datetime
 
 from tqdm import tqdm
 
-from cli.graph.compile_graph import graph
+from graph.compile_graph import build_graph
+from graph.graph_config import build_graph_config
+from llm.circuit_breaker import CircuitOpenError, circuit_breakers
+from llm.response_cache import response_cache
+from llm.scheduler import BATCH
 from utils.file_utils import extract_text_from_file
+from utils.prompt_manager import PromptManager
+from utils.results_table import (
+    RESULTS_LOG_NAME,
+    RESULTS_TABLE_FORMATS,
+    append_result_row,
+    export_results_table,
+    make_result_row,
+)
+from utils.text_normalization import normalize_document
+
+graph = build_graph()
 
 
 def parse_arguments():
@@ -58,6 +73,55 @@ def parse_arguments():
         default="DeepSeek Chat",
         help="Название LLM модели для использования",
     )
+    parser.add_argument(
+        "--model-criteria",
+        type=str,
+        default=None,
+        help="LLM модель для этапа адаптации критериев (по умолчанию --model)",
+    )
+    parser.add_argument(
+        "--model-check",
+        type=str,
+        default=None,
+        help="LLM модель для этапа проверки отчета (по умолчанию --model)",
+    )
+    parser.add_argument(
+        "--model-feedback",
+        type=str,
+        default=None,
+        help="LLM модель для этапа формирования обратной связи (по умолчанию --model)",
+    )
+    parser.add_argument(
+        "--fallback-models",
+        "-f",
+        type=str,
+        nargs="*",
+        default=[],
+        help="Резервные LLM модели, используемые при недоступности основной",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Не использовать сохраненные ответы LLM для повторных проверок",
+    )
+    parser.add_argument(
+        "--no-normalize",
+        action="store_true",
+        help="Не очищать текст отчетов и паспортов от колонтитулов, номеров страниц и оглавления",
+    )
+    parser.add_argument(
+        "--results-format",
+        type=str,
+        choices=RESULTS_TABLE_FORMATS,
+        default="jsonl",
+        help="Формат сводной таблицы результатов всех отчетов "
+        "(results.jsonl записывается всегда)",
+    )
+    parser.add_argument(
+        "--no-markdown",
+        action="store_true",
+        help="Не сохранять результаты каждого отчета в отдельные файлы Markdown",
+    )
     parser.add_argument(
         "--skip-feedback",
         "-s",
@@ -73,9 +137,29 @@ def setup_environment(args, output_dir):
     # Создаем директорию для результатов, если она не существует
     os.makedirs(output_dir, exist_ok=True)
 
-    # Устанавливаем модель LLM и путь к директории с проектом
-    os.environ["LLM_MODEL"] = args.model
-    os.environ["PROJECT_DIR"] = args.project_dir
+
+def build_cli_graph_config(args):
+    """
+    Формирование конфигурации запуска графа из аргументов командной строки.
+
+    Промпты загружаются один раз из директории prompts проекта.
+    """
+    prompt_manager = PromptManager(os.path.join(args.project_dir, "prompts"))
+    node_models = {
+        "criteria_forming": args.model_criteria,
+        "report_check": args.model_check,
+        "feedback_forming": args.model_feedback,
+    }
+    return build_graph_config(
+        get_prompt=prompt_manager.get_prompt,
+        model_name=args.model,
+        node_models={node: model for node, model in node_models.items() if model},
+        use_cache=not args.no_cache,
+        max_attempts=5,
+        retry_wait_max=15,
+        priority=BATCH,
+        tenant="cli",
+    )
 
 
 def load_criteria(criteria_file_path):
@@ -125,6 +209,38 @@ def save_results(file_name, results, output_dir, skip_feedback):
             f.write(results.get("feedback", ""))
 
 
+def invoke_with_fallback(inputs, config, models):
+    """
+    Запуск графа с переключением на резервные модели.
+
+    Модели с открытым предохранителем пропускаются сразу, без ожидания
+    повторных попыток.
+
+    Args:
+        inputs (dict): Входные данные графа
+        config (dict): Конфигурация запуска графа
+        models (list): Основная и резервные модели в порядке приоритета
+
+    Returns:
+        dict: Результаты работы графа
+
+    Raises:
+        CircuitOpenError: Если все модели временно недоступны
+    """
+    for model in models:
+        if not circuit_breakers.is_available(model):
+            logging.warning(f"⛔ Модель {model} временно недоступна, пропускаем")
+            continue
+
+        config["configurable"]["model_name"] = model
+        try:
+            return graph.invoke(inputs, config=config)
+        except CircuitOpenError as e:
+            logging.warning(f"⛔ {e}, переключаемся на резервную модель")
+
+    raise CircuitOpenError(f"Все модели временно недоступны: {', '.join(models)}")
+
+
 def check_input_format(reports_dir, passports_dir):
     """Проверка формата входных файлов"""
 
@@ -148,6 +264,7 @@ def main():
     output_dir = os.path.join(project_dir, args.output_dir)
     criteria_file_path = os.path.join(project_dir, args.criteria_file_path)
     status_file_path = os.path.join(project_dir, "docs_status.json")
+    results_log_path = os.path.join(output_dir, RESULTS_LOG_NAME)
     skip_feedback = args.skip_feedback
 
     logging.basicConfig(
@@ -168,6 +285,7 @@ def main():
 
     # Настраиваем окружение
     setup_environment(args, output_dir)
+    config = build_cli_graph_config(args)
 
     # Загружаем критерии
     criteria = load_criteria(criteria_file_path)
@@ -197,14 +315,29 @@ def main():
 
         # Инициализируем статусы обработки файлов
         docs_status[file_name] = dict.fromkeys(
-            ["status", "error_message", "processed_at"]
+            [
+                "status",
+                "error_message",
+                "processed_at",
+                "durations",
+                "models",
+                "output_tokens",
+                "cache_hits",
+                "queue_waits",
+                "prompt_versions",
+                "tokens_saved",
+                "total_score",
+            ]
         )
 
         try:
-            report = read_file_content(os.path.join(reports_dir, file_name))
+            report, report_normalization = normalize_document(
+                read_file_content(os.path.join(reports_dir, file_name)),
+                enabled=not args.no_normalize,
+            )
             report_file_name = os.path.splitext(file_name)[0]
 
-            passport = ""
+            passport, passport_normalization = "", None
 
             # Ищем паспорт, если он есть
             if has_passports:
@@ -213,25 +346,60 @@ def main():
                         report_file_name.lower() in passport_file.lower()
                         and passport_file not in processed_passports
                     ):
-                        passport = read_file_content(
-                            os.path.join(passports_dir, passport_file)
+                        passport, passport_normalization = normalize_document(
+                            read_file_content(os.path.join(passports_dir, passport_file)),
+                            enabled=not args.no_normalize,
                         )
                         processed_passports.append(passport_file)
                         break
 
-            results = graph.invoke(
+            results = invoke_with_fallback(
                 {
                     "report": report,
                     "criteria": criteria,
                     "passport": passport,
                     "skip_feedback": skip_feedback,
-                }
+                },
+                config,
+                [args.model, *args.fallback_models],
             )
 
             # Сохраняем результаты проверки
-            save_results(file_name, results, output_dir, skip_feedback)
+            if not args.no_markdown:
+                save_results(file_name, results, output_dir, skip_feedback)
+            append_result_row(
+                results_log_path,
+                make_result_row(
+                    file_name, results, datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                ),
+            )
+            docs_status[file_name]["durations"] = results.get("node_durations", {})
+            docs_status[file_name]["models"] = results.get("node_llms", {})
+            docs_status[file_name]["output_tokens"] = results.get(
+                "node_output_tokens", {}
+            )
+            docs_status[file_name]["cache_hits"] = results.get("node_cache_hits", {})
+            docs_status[file_name]["queue_waits"] = results.get("node_queue_waits", {})
+            docs_status[file_name]["prompt_versions"] = results.get(
+                "node_prompt_versions", {}
+            )
+            docs_status[file_name]["total_score"] = (
+                results.get("check_scores") or {}
+            ).get("total_score")
+            docs_status[file_name]["tokens_saved"] = {
+                "report": report_normalization["tokens_saved"],
+                "passport": (
+                    passport_normalization["tokens_saved"]
+                    if passport_normalization
+                    else 0
+                ),
+            }
             docs_status[file_name]["status"] = "success"
             logging.info(f"✅ Файл {file_name} успешно обработан")
+        except CircuitOpenError as e:
+            docs_status[file_name]["status"] = "skipped"
+            docs_status[file_name]["error_message"] = str(e)
+            logging.warning(f"⏭️ Файл {file_name} пропущен: {str(e)}")
         except Exception as e:
             docs_status[file_name]["status"] = "error"
             docs_status[file_name]["error_message"] = str(e)
@@ -242,6 +410,18 @@ def main():
                 "%Y-%m-%d %H:%M:%S"
             )
 
+    cache_metrics = response_cache.get_metrics()
+    logging.info(
+        f"♻️ Кэш ответов LLM: попаданий {cache_metrics['hits']}, "
+        f"промахов {cache_metrics['misses']} "
+        f"(доля попаданий {cache_metrics['hit_rate']:.0%})"
+    )
+
+    # Формируем сводную таблицу и статистику по всем проверенным отчетам
+    if os.path.exists(results_log_path):
+        for path in export_results_table(output_dir, args.results_format):
+            logging.info(f"📊 Сводные результаты сохранены в: {path}")
+
     logging.info("✅ Проверка завершена успешно!")
     logging.info(f"📁 Результаты сохранены в: {output_dir}")
 
@@ -0,0 +1,2 @@
+# Корень репозитория добавляется в sys.path, чтобы тесты импортировали
+# модули приложения (utils, llm, service) без установки пакета
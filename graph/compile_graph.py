@@ -1,9 +1,11 @@
-from typing import Optional
+import operator
+from typing import Annotated, Optional
 
-from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, MessagesState, StateGraph
 
 from graph.graph_functions import criteria_forming, report_check, feedback_forming
+from utils.shared_store import shared_store
+from utils.text_extraction import EmptyDocumentError, has_text_content
 
 
 class PPCheckState(MessagesState):
@@ -14,20 +16,33 @@ class PPCheckState(MessagesState):
     criteria: str  # Критерии проверки
     structured_criteria: str  # Структурированные критерии проверки
     check_results: str  # Результаты проверки
+    check_scores: dict  # Оценки по критериям и итоговая оценка
     feedback: Optional[str] = None  # Обратная связь для студента
     skip_feedback: bool = False  # Флаг для пропуска этапа формирования обратной связи
+    node_durations: Annotated[dict, operator.or_]  # Длительности этапов проверки
+    node_llms: Annotated[dict, operator.or_]  # Модели, использованные на этапах
+    node_output_tokens: Annotated[dict, operator.or_]  # Выходные токены этапов
+    node_cache_hits: Annotated[dict, operator.or_]  # Ответы этапов из кэша
+    node_queue_waits: Annotated[dict, operator.or_]  # Ожидание слота планировщика
+    node_prompt_versions: Annotated[dict, operator.or_]  # Версии промптов этапов
 
 
-builder = StateGraph(PPCheckState)
+# Условное ребро для начала проверки
+def select_entry_node(state):
+    """
+    Выбирает первый этап проверки.
 
-# Узлы
-builder.add_node("Аналитик", criteria_forming)
-builder.add_node("Проверяющий", report_check)
-builder.add_node("Преподаватель", feedback_forming)
+    Адаптация критериев пропускается, если структурированные критерии
+    уже сформированы заранее (например, пока пользователь заполнял форму).
+    На пустой отчет (например, скан без распознанного текста) вызовы
+    модели не тратятся.
 
-# Ребра
-builder.add_edge(START, "Аналитик")
-builder.add_edge("Аналитик", "Проверяющий")
+    Raises:
+        EmptyDocumentError: Если отчет не содержит текста
+    """
+    if not has_text_content(state["report"]):
+        raise EmptyDocumentError("Отчет не содержит текста для проверки")
+    return "Проверяющий" if state.get("structured_criteria") else "Аналитик"
 
 
 # Условное ребро для этапа обратной связи
@@ -35,10 +50,34 @@ def should_form_feedback(state):
     return not state["skip_feedback"]
 
 
-builder.add_conditional_edges(
-    "Проверяющий", should_form_feedback, {True: "Преподаватель", False: END}
-)
-builder.add_edge("Преподаватель", END)
+def build_graph(checkpointer=None):
+    """
+    Собирает граф проверки отчета.
 
-memory = MemorySaver()
-graph = builder.compile(checkpointer=memory)
+    Args:
+        checkpointer: Хранилище состояний графа или None
+
+    Returns:
+        CompiledStateGraph: Скомпилированный граф
+    """
+    builder = StateGraph(PPCheckState)
+
+    # Узлы
+    builder.add_node("Аналитик", criteria_forming)
+    builder.add_node("Проверяющий", report_check)
+    builder.add_node("Преподаватель", feedback_forming)
+
+    # Ребра
+    builder.add_conditional_edges(START, select_entry_node, ["Аналитик", "Проверяющий"])
+    builder.add_edge("Аналитик", "Проверяющий")
+
+    builder.add_conditional_edges(
+        "Проверяющий", should_form_feedback, {True: "Преподаватель", False: END}
+    )
+    builder.add_edge("Преподаватель", END)
+
+    return builder.compile(checkpointer=checkpointer)
+
+
+# Состояния графа веб-приложения хранятся в общем хранилище
+graph = build_graph(checkpointer=shared_store.create_checkpointer())
@@ -0,0 +1,100 @@
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from tenacity import (Retrying, retry_if_not_exception_type, stop_after_attempt,
+                      wait_exponential, wait_none)
+
+from llm.circuit_breaker import CircuitOpenError
+from llm.scheduler import BATCH
+
+# Названия этапов проверки и соответствующие им промпты
+NODE_PROMPTS = {
+    "criteria_forming": "CRITERIA_FORMING_TEMPLATE",
+    "report_check": "CHECK_REPORT_TEMPLATE",
+    "feedback_forming": "FEEDBACK_FORMING_TEMPLATE",
+}
+
+
+def build_graph_config(
+    get_prompt: Callable[[str], str],
+    model_name: str = "DeepSeek Chat",
+    node_models: Optional[Dict[str, str]] = None,
+    use_cache: bool = True,
+    on_node_start: Optional[Callable[[str], None]] = None,
+    on_node_end: Optional[Callable[[str], None]] = None,
+    max_attempts: int = 3,
+    retry_wait_max: float = 0,
+    thread_id: Optional[str] = None,
+    priority: str = BATCH,
+    tenant: str = "default",
+    cache_writes: Optional[list] = None,
+) -> Dict[str, Any]:
+    """
+    Формирует конфигурацию запуска графа проверки.
+
+    Граф не зависит от Streamlit: промпты, выбор моделей, настройки
+    повторных попыток и уведомления о ходе проверки передаются через
+    конфигурацию, поэтому граф можно запускать из потоков, процессов
+    и сервисов.
+
+    Args:
+        get_prompt (Callable): Функция получения текста промпта по имени
+        model_name (str): Основная модель
+        node_models (dict, optional): Отдельные модели для этапов проверки
+        use_cache (bool): Использовать ли кэш ответов LLM
+        on_node_start (Callable, optional): Вызывается перед этапом с его названием
+        on_node_end (Callable, optional): Вызывается после этапа с его названием
+        max_attempts (int): Количество попыток вызова модели на этапе
+        retry_wait_max (float): Максимальная пауза между попытками в секундах,
+                                0 - повторять без паузы
+        thread_id (str, optional): Идентификатор потока для checkpointer
+        priority (str): Класс приоритета вызовов модели (interactive или batch)
+        tenant (str): Источник проверки для справедливого распределения
+                      вызовов модели
+        cache_writes (list, optional): Список для отложенного сохранения
+                                       ответов в кэш при use_cache=False
+
+    Returns:
+        Dict[str, Any]: Конфигурация для graph.invoke
+    """
+    return {
+        "configurable": {
+            "thread_id": thread_id or str(uuid.uuid4()),
+            "get_prompt": get_prompt,
+            "model_name": model_name,
+            "node_models": node_models or {},
+            "use_cache": use_cache,
+            "on_node_start": on_node_start,
+            "on_node_end": on_node_end,
+            "max_attempts": max_attempts,
+            "retry_wait_max": retry_wait_max,
+            "priority": priority,
+            "tenant": tenant,
+            "cache_writes": cache_writes,
+        }
+    }
+
+
+def get_retrying(configurable: Dict[str, Any]) -> Retrying:
+    """
+    Создает объект повторных попыток по параметрам запуска графа.
+
+    При открытом предохранителе модели повторные попытки не выполняются.
+
+    Args:
+        configurable (Dict[str, Any]): Параметры запуска графа
+
+    Returns:
+        Retrying: Объект tenacity для повторных попыток
+    """
+    retry_wait_max = configurable.get("retry_wait_max", 0)
+    return Retrying(
+        stop=stop_after_attempt(configurable.get("max_attempts", 3)),
+        wait=(
+            wait_exponential(multiplier=1, min=min(4, retry_wait_max), max=retry_wait_max)
+            if retry_wait_max
+            else wait_none()
+        ),
+        retry=retry_if_not_exception_type(CircuitOpenError),
+        reraise=True,
+    )
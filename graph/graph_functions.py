@@ -1,16 +1,71 @@
 import time
 
-import streamlit as st
-from langchain.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from tenacity import retry, stop_after_attempt
+from langchain_core.runnables import RunnableConfig
 
-from llm.llm_config import get_llm
-from utils.prompt_manager import prompt_manager
+from graph.graph_config import NODE_PROMPTS, get_retrying
+from llm.llm_config import get_llm, get_llm_name
+from llm.llm_runner import invoke_llm
+from llm.scheduler import BATCH
+from utils.prompt_manager import compile_template, get_prompt_version
+from utils.score_extraction import extract_check_scores
+from utils.text_extraction import has_text_content
 
 
-@retry(stop=stop_after_attempt(3))
-def criteria_forming(state):
+def run_llm_node(node, inputs, config):
+    """
+    Выполняет этап проверки: вызывает LLM модель с повторными попытками
+    и уведомляет о начале и завершении этапа.
+
+    Args:
+        node (str): Название этапа проверки
+        inputs (dict): Значения для подстановки в шаблон промпта
+        config (RunnableConfig): Конфигурация запуска графа
+
+    Returns:
+        tuple: Ответ модели и словарь с длительностью этапа, использованной
+               моделью, числом выходных токенов, попаданием в кэш,
+               временем ожидания в очереди планировщика и версией промпта
+    """
+    configurable = config.get("configurable", {})
+    on_node_start = configurable.get("on_node_start")
+    on_node_end = configurable.get("on_node_end")
+
+    template = configurable["get_prompt"](NODE_PROMPTS[node])
+    prompt = compile_template(template)
+
+    if on_node_start:
+        on_node_start(node)
+    try:
+        start_time = time.time()
+        for attempt in get_retrying(configurable):
+            with attempt:
+                model_name = get_llm_name(configurable, node)
+                res, output_tokens, cache_hit, queue_wait = invoke_llm(
+                    prompt,
+                    inputs,
+                    model_name,
+                    node,
+                    get_llm,
+                    use_cache=configurable.get("use_cache", True),
+                    priority=configurable.get("priority", BATCH),
+                    tenant=configurable.get("tenant", "default"),
+                    cache_writes=configurable.get("cache_writes"),
+                )
+    finally:
+        if on_node_end:
+            on_node_end(node)
+
+    return res, {
+        "node_durations": {node: time.time() - start_time},
+        "node_llms": {node: model_name},
+        "node_output_tokens": {node: output_tokens},
+        "node_cache_hits": {node: cache_hit},
+        "node_queue_waits": {node: queue_wait},
+        "node_prompt_versions": {node: get_prompt_version(template)},
+    }
+
+
+def criteria_forming(state, config: RunnableConfig):
     """
     Адаптирует критерии оценки под конкретный проект.
 
@@ -19,37 +74,32 @@ def criteria_forming(state):
             - passport (str): Паспорт проекта
             - criteria (str): Исходные критерии оценки
             - structured_criteria (str): Структурированные критерии оценки
+        config (RunnableConfig): Конфигурация запуска графа
 
     Returns:
         dict: Словарь с ключом 'structured_criteria', содержащий
-              адаптированные критерии
+              адаптированные критерии, а также метрики этапа
     """
-    if not state["passport"]:
-        st.session_state["structuring_criteria_duration"] = 0
-        return {"structured_criteria": state["criteria"]}
-    with st.spinner("Адаптация критериев под проект..."):
-        template = prompt_manager.get_prompt("CRITERIA_FORMING_TEMPLATE")
-        prompt = ChatPromptTemplate.from_messages([("system", template)])
-
-        chain = prompt | get_llm() | StrOutputParser()
-
-        structured_criteria = state.get("structured_criteria", "")
-        start_time = time.time()
-        res = chain.invoke(
-            {
-                "passport": state["passport"],
-                "criteria": state["criteria"],
-                "structured_criteria": structured_criteria,
-            }
-        )
-        end_time = time.time()
-        st.session_state["structuring_criteria_duration"] = end_time - start_time
-
-        return {"structured_criteria": res}
-
-
-@retry(stop=stop_after_attempt(3))
-def report_check(state):
+    if not has_text_content(state["passport"]):
+        return {
+            "structured_criteria": state["criteria"],
+            "node_durations": {"criteria_forming": 0},
+        }
+
+    res, metrics = run_llm_node(
+        "criteria_forming",
+        {
+            "passport": state["passport"],
+            "criteria": state["criteria"],
+            "structured_criteria": state.get("structured_criteria", ""),
+        },
+        config,
+    )
+
+    return {"structured_criteria": res, **metrics}
+
+
+def report_check(state, config: RunnableConfig):
     """
     Проверяет отчет на соответствие структурированным критериям.
 
@@ -57,49 +107,42 @@ def report_check(state):
         state (dict): Словарь состояния, содержащий:
             - report (str): Текст отчета для проверки
             - structured_criteria (str): Структурированные критерии оценки
+        config (RunnableConfig): Конфигурация запуска графа
 
     Returns:
-        dict: Словарь с ключом 'check_results', содержащий результаты проверки
+        dict: Словарь с ключами 'check_results' (результаты проверки
+              в формате Markdown) и 'check_scores' (оценки по критериям
+              и итоговая оценка, см. extract_check_scores), а также метрики этапа
     """
-    with st.spinner("Проверка отчета..."):
-        template = prompt_manager.get_prompt("CHECK_REPORT_TEMPLATE")
-        prompt = ChatPromptTemplate.from_messages([("system", template)])
+    res, metrics = run_llm_node(
+        "report_check",
+        {
+            "report": state["report"],
+            "structured_criteria": state["structured_criteria"],
+        },
+        config,
+    )
 
-        chain = prompt | get_llm() | StrOutputParser()
+    check_results, check_scores = extract_check_scores(res)
 
-        start_time = time.time()
-        res = chain.invoke(
-            {
-                "report": state["report"],
-                "structured_criteria": state["structured_criteria"],
-            }
-        )
-        end_time = time.time()
-        st.session_state["checking_report_duration"] = end_time - start_time
-        return {"check_results": res}
-
-
-@retry(stop=stop_after_attempt(3))
-def feedback_forming(state):
+    return {"check_results": check_results, "check_scores": check_scores, **metrics}
+
+
+def feedback_forming(state, config: RunnableConfig):
     """
     Формирует дружелюбную обратную связь для студента на основе результатов проверки.
 
     Args:
         state (dict): Словарь состояния, содержащий:
             - check_results (str): Результаты проверки отчета
+        config (RunnableConfig): Конфигурация запуска графа
 
     Returns:
-        dict: Словарь с ключом 'feedback', содержащий сформированную обратную связь
+        dict: Словарь с ключом 'feedback', содержащий сформированную обратную связь,
+              а также метрики этапа
     """
-    with st.spinner("Формирование обратной связи для студента..."):
-        template = prompt_manager.get_prompt("FEEDBACK_FORMING_TEMPLATE")
-        prompt = ChatPromptTemplate.from_messages([("system", template)])
-
-        chain = prompt | get_llm() | StrOutputParser()
-
-        start_time = time.time()
-        res = chain.invoke({"check_results": state["check_results"]})
-        end_time = time.time()
-        st.session_state["feedback_forming_duration"] = end_time - start_time
+    res, metrics = run_llm_node(
+        "feedback_forming", {"check_results": state["check_results"]}, config
+    )
 
-        return {"feedback": res}
+    return {"feedback": res, **metrics}
@@ -0,0 +1,181 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Исключение при обращении к модели, предохранитель которой открыт."""
+
+
+class CircuitBreaker:
+    """
+    Предохранитель (circuit breaker) для одной LLM модели.
+
+    Состояния:
+        - closed: запросы проходят, подряд идущие ошибки подсчитываются
+        - open: запросы сразу отклоняются до истечения recovery_timeout
+        - half_open: пропускается один пробный запрос; успех закрывает
+          предохранитель, ошибка снова открывает его
+
+    Attributes:
+        failure_threshold (int): Количество ошибок подряд для открытия
+        recovery_timeout (float): Время в секундах до перехода в half_open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_progress = False
+
+    def _current_state(self) -> str:
+        """Возвращает состояние с учетом истечения таймера (вызывается под блокировкой)."""
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = self.HALF_OPEN
+            self._trial_in_progress = False
+        return self._state
+
+    @property
+    def state(self) -> str:
+        """Текущее состояние предохранителя."""
+        with self._lock:
+            return self._current_state()
+
+    def seconds_until_retry(self) -> float:
+        """Возвращает время в секундах до перехода в состояние half_open."""
+        with self._lock:
+            if self._current_state() != self.OPEN:
+                return 0.0
+            elapsed = time.monotonic() - self._opened_at
+            return max(0.0, self.recovery_timeout - elapsed)
+
+    def allow_request(self) -> bool:
+        """
+        Проверяет, можно ли выполнить запрос.
+
+        В состоянии half_open пропускает только один пробный запрос.
+
+        Returns:
+            bool: True, если запрос разрешен
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_progress:
+                self._trial_in_progress = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Фиксирует успешный запрос и закрывает предохранитель."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """Фиксирует ошибку и при необходимости открывает предохранитель."""
+        with self._lock:
+            self._failures += 1
+            if (
+                self._current_state() == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_progress = False
+
+
+class CircuitBreakerRegistry:
+    """
+    Реестр предохранителей для всех моделей.
+
+    Хранится на уровне процесса, поэтому состояние общее для всех
+    сессий Streamlit и для всех отчетов в рамках одного запуска CLI.
+    """
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str) -> CircuitBreaker:
+        """
+        Возвращает предохранитель для модели, создавая его при необходимости.
+
+        Args:
+            model_name (str): Название модели
+
+        Returns:
+            CircuitBreaker: Предохранитель модели
+        """
+        with self._lock:
+            if model_name not in self._breakers:
+                self._breakers[model_name] = CircuitBreaker(
+                    self.failure_threshold, self.recovery_timeout
+                )
+            return self._breakers[model_name]
+
+    def is_available(self, model_name: str) -> bool:
+        """
+        Проверяет, что предохранитель модели не открыт.
+
+        В отличие от allow_request не занимает пробный запрос half_open.
+
+        Args:
+            model_name (str): Название модели
+
+        Returns:
+            bool: True, если к модели можно обращаться
+        """
+        return self.get(model_name).state != CircuitBreaker.OPEN
+
+    @contextmanager
+    def guard(self, model_name: str):
+        """
+        Контекстный менеджер для вызова модели через предохранитель.
+
+        Args:
+            model_name (str): Название модели
+
+        Raises:
+            CircuitOpenError: Если предохранитель модели открыт
+        """
+        breaker = self.get(model_name)
+        if not breaker.allow_request():
+            raise CircuitOpenError(
+                f"Модель {model_name} временно недоступна, повторная попытка "
+                f"через {breaker.seconds_until_retry():.0f} с"
+            )
+        try:
+            yield
+        except Exception:
+            breaker.record_failure()
+            if breaker.state == CircuitBreaker.OPEN:
+                logging.warning(f"⚠️ Предохранитель модели {model_name} открыт")
+            raise
+        else:
+            breaker.record_success()
+
+
+# Global instance
+circuit_breakers = CircuitBreakerRegistry(
+    failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "3")),
+    recovery_timeout=float(os.getenv("LLM_CIRCUIT_RECOVERY_TIMEOUT", "60")),
+)
@@ -0,0 +1,101 @@
+import os
+import re
+from typing import Any, Dict, Optional, Tuple
+
+# Настройки генерации для моделей.
+# Модели с рассуждениями (DeepSeek R1, QwQ) генерируют длинную цепочку
+# рассуждений перед ответом, поэтому для них ограничивается объем вывода,
+# снижается уровень рассуждений и рассуждения исключаются из ответа
+# (параметр reasoning поддерживается только моделями через OpenRouter).
+MODEL_GENERATION_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "DeepSeek R1": {
+        "max_tokens": 8192,
+        "reasoning": {"effort": "low", "exclude": True},
+    },
+    "Qwen 32B": {
+        "max_tokens": 8192,
+        "reasoning": {"effort": "low", "exclude": True},
+    },
+}
+
+# Настройки генерации для этапов проверки.
+# Значения этапа имеют приоритет над значениями модели.
+NODE_GENERATION_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "criteria_forming": {},
+    "report_check": {},
+    "feedback_forming": {"max_tokens": 4096},
+}
+
+# Блоки рассуждений, которые некоторые модели включают в текст ответа
+REASONING_BLOCK_PATTERN = re.compile(
+    r"<(think|thinking|reasoning)>.*?(</\1>|$)", re.DOTALL | re.IGNORECASE
+)
+
+
+def get_generation_settings(model_name: str, node: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Возвращает настройки генерации для модели и этапа проверки.
+
+    Настройки модели дополняются настройками этапа и переменными окружения:
+        - LLM_MAX_TOKENS_<ЭТАП> или LLM_MAX_TOKENS: максимальное число
+          токенов в ответе
+        - LLM_REASONING_EFFORT: уровень рассуждений (low, medium, high)
+          для моделей с рассуждениями
+
+    Args:
+        model_name (str): Название модели
+        node (str, optional): Название этапа проверки
+
+    Returns:
+        Dict[str, Any]: Настройки с ключами max_tokens и reasoning
+    """
+    settings = dict(MODEL_GENERATION_SETTINGS.get(model_name, {}))
+    if node:
+        settings.update(NODE_GENERATION_SETTINGS.get(node, {}))
+
+    max_tokens = (
+        os.getenv(f"LLM_MAX_TOKENS_{node.upper()}") if node else None
+    ) or os.getenv("LLM_MAX_TOKENS")
+    if max_tokens:
+        settings["max_tokens"] = int(max_tokens)
+
+    reasoning_effort = os.getenv("LLM_REASONING_EFFORT")
+    if reasoning_effort and "reasoning" in settings:
+        settings["reasoning"] = {**settings["reasoning"], "effort": reasoning_effort}
+
+    return settings
+
+
+def strip_reasoning(text: str) -> str:
+    """
+    Удаляет блоки рассуждений (<think>...</think>) из ответа модели.
+
+    Args:
+        text (str): Ответ модели
+
+    Returns:
+        str: Ответ без блоков рассуждений
+    """
+    return REASONING_BLOCK_PATTERN.sub("", text).strip()
+
+
+def parse_llm_output(message: Any) -> Tuple[str, Optional[int]]:
+    """
+    Извлекает текст ответа и количество выходных токенов из ответа модели.
+
+    Args:
+        message: Ответ модели (AIMessage для чат-моделей или str)
+
+    Returns:
+        Tuple[str, Optional[int]]: Текст ответа без блоков рассуждений и
+                                   количество выходных токенов или None,
+                                   если модель его не сообщает
+    """
+    if isinstance(message, str):
+        return strip_reasoning(message), None
+
+    output_tokens = None
+    usage_metadata = getattr(message, "usage_metadata", None)
+    if usage_metadata:
+        output_tokens = usage_metadata.get("output_tokens")
+    return strip_reasoning(message.content), output_tokens
@@ -1,16 +1,70 @@
+import importlib
 import logging
+import os
 import random
-from typing import Any, Dict, Optional, Type, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Type
 
-import streamlit as st
 from dotenv import load_dotenv
-from langchain_community.llms import YandexGPT
-from langchain_gigachat import GigaChat
-from langchain_openai import ChatOpenAI
+
+from llm.generation_settings import get_generation_settings
+from llm.model_stats import resolve_model_name, select_node_model
 
 # Загрузка переменных окружения
 load_dotenv(override=True)
 
+# Источник секретов: по умолчанию переменные окружения,
+# веб-приложение подменяет его на st.secrets
+_secrets_provider: Callable[[str, str], Any] = os.getenv
+
+
+def set_secrets_provider(provider: Callable[[str, str], Any]) -> None:
+    """
+    Устанавливает источник секретов (ключей API).
+
+    Args:
+        provider: Функция вида provider(name, default), например st.secrets.get.
+    """
+    global _secrets_provider
+    _secrets_provider = provider
+
+
+def get_secret(name: str) -> str:
+    """
+    Возвращает значение секрета.
+
+    Args:
+        name: Название секрета.
+
+    Returns:
+        str: Значение секрета или пустая строка, если он не задан.
+    """
+    return _secrets_provider(name, "") or ""
+
+
+# Классы LLM моделей и модули, из которых они импортируются. SDK провайдеров
+# загружаются при первом создании модели, а не при запуске приложения
+LLM_CLASS_MODULES = {
+    "YandexGPT": "langchain_community.llms",
+    "GigaChat": "langchain_gigachat",
+    "ChatOpenAI": "langchain_openai",
+}
+
+
+@lru_cache(maxsize=None)
+def load_llm_class(class_name: str) -> Type:
+    """
+    Импортирует класс LLM модели.
+
+    Args:
+        class_name: Название класса из LLM_CLASS_MODULES.
+
+    Returns:
+        Type: Класс LLM модели.
+    """
+    module = importlib.import_module(LLM_CLASS_MODULES[class_name])
+    return getattr(module, class_name)
+
 
 class LLMConfig:
     """Класс для управления конфигурациями LLM моделей."""
@@ -22,8 +76,8 @@ class LLMConfig:
         openrouter_random_key_number = random.randint(1, 16)
 
         return {
-            "api_key": st.secrets.get(
-                f"OPENROUTER_API_KEY_{openrouter_random_key_number}", ""
+            "api_key": get_secret(
+                f"OPENROUTER_API_KEY_{openrouter_random_key_number}"
             ),
             "base_url": "https://openrouter.ai/api/v1",
         }
@@ -32,16 +86,16 @@ class LLMConfig:
     def get_yandex_config() -> Dict[str, str]:
         """Возвращает конфигурацию для YandexGPT."""
         return {
-            "api_key": st.secrets.get("YANDEX_API_KEY", ""),
-            "folder_id": st.secrets.get("YANDEX_FOLDER_ID", ""),
+            "api_key": get_secret("YANDEX_API_KEY"),
+            "folder_id": get_secret("YANDEX_FOLDER_ID"),
         }
 
     @staticmethod
     def get_gigachat_config() -> Dict[str, str]:
         """Возвращает конфигурацию для GigaChat."""
         return {
-            "api_key": st.secrets.get("GIGACHAT_CREDENTIALS", ""),
-            "scope": st.secrets.get("GIGACHAT_API_PERS", ""),
+            "api_key": get_secret("GIGACHAT_CREDENTIALS"),
+            "scope": get_secret("GIGACHAT_API_PERS"),
         }
 
     @classmethod
@@ -117,65 +171,82 @@ class LLMFactory:
     """Класс для создания экземпляров LLM моделей."""
 
     @staticmethod
-    def get_llm_classes() -> Dict[str, Type[Union[YandexGPT, GigaChat, ChatOpenAI]]]:
-        """Возвращает словарь соответствия названий моделей и их классов."""
+    def get_llm_classes() -> Dict[str, str]:
+        """
+        Возвращает словарь соответствия названий моделей и названий их классов
+        (см. LLM_CLASS_MODULES).
+        """
         return {
-            "YandexGPT Pro": YandexGPT,
-            "YandexGPT Lite": YandexGPT,
-            "GigaChat": GigaChat,
+            "YandexGPT Pro": "YandexGPT",
+            "YandexGPT Lite": "YandexGPT",
+            "GigaChat": "GigaChat",
             **{
-                model: ChatOpenAI
+                model: "ChatOpenAI"
                 for model in LLMConfig.get_model_configs().keys()
                 if model not in ["YandexGPT Lite", "YandexGPT Pro", "GigaChat"]
             },
         }
 
     @classmethod
-    def create_llm(cls, model_name: str = "DeepSeek Chat") -> Optional[Any]:
+    def create_llm(
+        cls,
+        model_name: str = "DeepSeek Chat",
+        generation_settings: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Any]:
         """
         Создает экземпляр LLM модели на основе выбора пользователя.
 
         Args:
             model_name: Название модели для создания.
+            generation_settings: Настройки генерации (max_tokens, reasoning).
 
         Returns:
-            Экземпляр LLM модели или None в случае ошибки.
+            Экземпляр LLM модели.
+
+        Raises:
+            ValueError: Если не заданы ключи API для выбранной модели.
         """
         # Проверяем наличие необходимых ключей API в зависимости от модели
         if model_name in ["YandexGPT Lite", "YandexGPT Pro"]:
-            if not st.secrets.get("YANDEX_API_KEY") or not st.secrets.get(
-                "YANDEX_FOLDER_ID"
-            ):
-                logging.error(
-                    "⚠️ Отсутствуют YANDEX_API_KEY или YANDEX_FOLDER_ID в secrets"
-                )
-                raise ValueError(
-                    "Отсутствуют YANDEX_API_KEY или YANDEX_FOLDER_ID в secrets"
-                )
+            if not get_secret("YANDEX_API_KEY") or not get_secret("YANDEX_FOLDER_ID"):
+                logging.error("⚠️ Отсутствуют YANDEX_API_KEY или YANDEX_FOLDER_ID")
+                raise ValueError("Отсутствуют YANDEX_API_KEY или YANDEX_FOLDER_ID")
         elif model_name == "GigaChat":
-            if not st.secrets.get("GIGACHAT_CREDENTIALS") or not st.secrets.get(
+            if not get_secret("GIGACHAT_CREDENTIALS") or not get_secret(
                 "GIGACHAT_API_PERS"
             ):
                 logging.error(
-                    "⚠️ Отсутствуют GIGACHAT_CREDENTIALS или GIGACHAT_API_PERS в secrets"
+                    "⚠️ Отсутствуют GIGACHAT_CREDENTIALS или GIGACHAT_API_PERS"
                 )
                 raise ValueError(
-                    "Отсутствуют GIGACHAT_CREDENTIALS или GIGACHAT_API_PERS в secrets"
+                    "Отсутствуют GIGACHAT_CREDENTIALS или GIGACHAT_API_PERS"
                 )
 
         model_configs = LLMConfig.get_model_configs()
         llm_classes = cls.get_llm_classes()
 
         config = model_configs.get(model_name, model_configs["DeepSeek Chat"])
-        llm_class = llm_classes.get(model_name, ChatOpenAI)
+        llm_class = load_llm_class(llm_classes.get(model_name, "ChatOpenAI"))
+
+        # Ограничение длины ответа поддерживается всеми моделями,
+        # управление рассуждениями - только моделями через OpenRouter
+        generation_settings = generation_settings or {}
+        generation_kwargs = {}
+        if generation_settings.get("max_tokens"):
+            generation_kwargs["max_tokens"] = generation_settings["max_tokens"]
 
         try:
             if llm_class.__name__ == "ChatOpenAI":
+                if generation_settings.get("reasoning"):
+                    generation_kwargs["extra_body"] = {
+                        "reasoning": generation_settings["reasoning"]
+                    }
                 return llm_class(
                     model=config["model"],
                     api_key=config["api_key"],
                     base_url=config["base_url"],
                     temperature=0,
+                    **generation_kwargs,
                 )
             elif llm_class.__name__ == "YandexGPT":
                 return llm_class(
@@ -183,6 +254,7 @@ class LLMFactory:
                     api_key=config["api_key"],
                     folder_id=config["folder_id"],
                     temperature=0,
+                    **generation_kwargs,
                 )
             elif llm_class.__name__ == "GigaChat":
                 return llm_class(
@@ -191,18 +263,45 @@ class LLMFactory:
                     scope=config["scope"],
                     temperature=0,
                     verify_ssl_certs=False,
+                    **generation_kwargs,
                 )
         except Exception as e:
             logging.error(f"Ошибка при инициализации LLM: {e}")
             raise e
 
 
-def get_llm() -> Optional[Any]:
+def get_llm_name(configurable: Dict[str, Any], node: Optional[str] = None) -> str:
+    """
+    Возвращает название LLM модели для этапа проверки.
+    В режиме автоматического выбора возвращает самую быструю доступную модель.
+
+    Args:
+        configurable: Параметры запуска графа с ключами model_name и node_models.
+        node: Название этапа проверки. Если для этапа выбрана отдельная модель
+              и она доступна, возвращается она.
+
+    Returns:
+        str: Название модели.
     """
-    Создает экземпляр LLM модели на основе выбора пользователя.
+    model_name = configurable.get("model_name") or "DeepSeek Chat"
+    node_model_name = (configurable.get("node_models") or {}).get(node)
+    if node_model_name:
+        model_name = select_node_model(node, node_model_name, model_name)
+    return resolve_model_name(model_name)
+
+
+def get_llm(model_name: str, node: Optional[str] = None) -> Optional[Any]:
+    """
+    Создает экземпляр LLM модели.
+
+    Args:
+        model_name: Название модели.
+        node: Название этапа проверки для выбора настроек генерации.
 
     Returns:
-        Экземпляр LLM модели или None в случае ошибки.
+        Экземпляр LLM модели.
     """
-    llm_choice = st.session_state.get("llm_choice", "DeepSeek Chat")
-    return LLMFactory.create_llm(llm_choice)
+    logging.info(f"Используемая модель: {model_name}")
+    return LLMFactory.create_llm(
+        model_name, get_generation_settings(model_name, node)
+    )
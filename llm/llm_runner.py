@@ -0,0 +1,84 @@
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from llm.circuit_breaker import circuit_breakers
+from llm.generation_settings import get_generation_settings, parse_llm_output
+from llm.model_stats import model_stats
+from llm.response_cache import response_cache
+from llm.scheduler import BATCH, llm_scheduler
+from llm.single_flight import single_flight
+
+
+def invoke_llm(
+    prompt: Any,
+    inputs: Dict[str, Any],
+    model_name: str,
+    node: str,
+    create_llm: Callable[[str, str], Any],
+    use_cache: bool = True,
+    priority: str = BATCH,
+    tenant: str = "default",
+    cache_writes: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
+) -> Tuple[str, Optional[int], bool, float]:
+    """
+    Вызывает LLM модель для этапа проверки.
+
+    Сначала ищет ответ в кэше. При промахе вызывает модель через
+    предохранитель, обновляет статистику модели и сохраняет ответ в кэш.
+    Одинаковые одновременные запросы (тот же промпт с теми же данными,
+    модель и параметры) объединяются в один вызов модели, а ответ
+    сохраняется в кэш каждым из них по его собственному режиму кэша.
+    Вызов модели выполняется после получения слота у планировщика.
+
+    Args:
+        prompt (ChatPromptTemplate): Шаблон промпта
+        inputs (Dict[str, Any]): Значения для подстановки в шаблон
+        model_name (str): Название модели
+        node (str): Название этапа проверки
+        create_llm (Callable): Функция создания модели по названию и этапу
+        use_cache (bool): Использовать ли кэш ответов
+        priority (str): Класс приоритета запроса (interactive или batch)
+        tenant (str): Источник запроса для планировщика
+        cache_writes (list, optional): Если передан при use_cache=False,
+            ответ добавляется в этот список (ключ кэша и ответ), чтобы
+            сохранить его в кэш позже
+
+    Returns:
+        Tuple[str, Optional[int], bool, float]: Текст ответа, количество
+            выходных токенов, признак ответа из кэша и время ожидания
+            слота планировщика в секундах
+    """
+    prompt_value = prompt.invoke(inputs)
+    cache_key = response_cache.make_key(
+        prompt_value.to_messages(),
+        model_name,
+        get_generation_settings(model_name, node),
+    )
+
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached["text"], cached["output_tokens"], True, 0.0
+
+    def call_llm():
+        llm = create_llm(model_name, node)
+        with llm_scheduler.acquire(priority, tenant) as queue_wait:
+            with circuit_breakers.guard(model_name), model_stats.track(model_name):
+                message = llm.invoke(prompt_value)
+        res, output_tokens = parse_llm_output(message)
+        return res, output_tokens, queue_wait
+
+    (res, output_tokens, queue_wait), shared = single_flight.do(cache_key, call_llm)
+    if shared:
+        logging.info(f"Этап {node}: получен результат одновременного запроса")
+
+    # Ответ сохраняется в соответствии с режимом кэша этого вызова, даже если
+    # он получен от одновременного запроса с другим режимом (например,
+    # заблаговременного, который не пишет в кэш)
+    value = {"text": res, "output_tokens": output_tokens}
+    if use_cache:
+        response_cache.set(cache_key, value)
+    elif cache_writes is not None:
+        cache_writes.append((cache_key, value))
+
+    return res, output_tokens, False, queue_wait
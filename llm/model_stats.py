@@ -0,0 +1,273 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from llm.circuit_breaker import CircuitOpenError, circuit_breakers
+
+# Название режима автоматического выбора модели
+AUTO_MODEL = "Auto"
+
+# Модели, из которых выбирает автоматический режим, если не задан
+# список в переменной окружения LLM_AUTO_MODELS
+DEFAULT_AUTO_MODELS = [
+    "DeepSeek Chat",
+    "Gemini 2.0 Flash",
+    "Qwen 2.5 72B",
+    "YandexGPT Pro",
+]
+
+
+class ModelStats:
+    """
+    Скользящая статистика задержек и успешности вызовов LLM моделей.
+
+    Для каждой модели хранится экспоненциально взвешенное среднее (EWMA)
+    длительности успешного вызова и доли успешных вызовов. Статистика
+    сохраняется в JSON файл и переживает перезапуск приложения.
+
+    Attributes:
+        path (str): Путь к файлу со статистикой
+        alpha (float): Коэффициент сглаживания EWMA
+        min_success_rate (float): Минимальная доля успешных вызовов,
+                                  при которой модель считается здоровой
+        probe_interval (float): Интервал в секундах, через который
+                                нездоровая модель снова выбирается
+                                для пробного вызова
+    """
+
+    def __init__(
+        self,
+        path: str,
+        alpha: float = 0.3,
+        min_success_rate: float = 0.5,
+        probe_interval: float = 300,
+    ):
+        self.path = path
+        self.alpha = alpha
+        self.min_success_rate = min_success_rate
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = self._load()
+        # Время последнего пробного выбора нездоровых моделей
+        self._probed_at: Dict[str, float] = {}
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        """Загружает статистику из файла."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.error(f"Не удалось загрузить статистику моделей: {e}")
+            return {}
+
+    def _save(self) -> None:
+        """Атомарно сохраняет статистику в файл (вызывается под блокировкой)."""
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._stats, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.error(f"Не удалось сохранить статистику моделей: {e}")
+
+    def record(self, model_name: str, duration: float, success: bool) -> None:
+        """
+        Обновляет статистику модели по результату вызова.
+
+        Args:
+            model_name (str): Название модели
+            duration (float): Длительность вызова в секундах
+            success (bool): Был ли вызов успешным
+        """
+        with self._lock:
+            stats = self._stats.get(model_name)
+            if stats is None:
+                stats = {
+                    "latency": duration,
+                    "success_rate": 1.0 if success else 0.0,
+                    "calls": 0,
+                }
+            else:
+                # Длительность неуспешных вызовов не отражает скорость ответа
+                if success:
+                    stats["latency"] += self.alpha * (duration - stats["latency"])
+                stats["success_rate"] += self.alpha * (
+                    (1.0 if success else 0.0) - stats["success_rate"]
+                )
+            stats["calls"] += 1
+            stats["updated_at"] = time.time()
+            self._stats[model_name] = stats
+            self._save()
+
+    @contextmanager
+    def track(self, model_name: str):
+        """
+        Контекстный менеджер, измеряющий вызов модели и записывающий результат.
+
+        Args:
+            model_name (str): Название модели
+        """
+        start_time = time.time()
+        try:
+            yield
+        except Exception:
+            self.record(model_name, time.time() - start_time, success=False)
+            raise
+        self.record(model_name, time.time() - start_time, success=True)
+
+    def get(self, model_name: str) -> Optional[Dict[str, float]]:
+        """
+        Возвращает статистику модели.
+
+        Args:
+            model_name (str): Название модели
+
+        Returns:
+            Optional[Dict[str, float]]: Статистика или None, если вызовов не было
+        """
+        with self._lock:
+            stats = self._stats.get(model_name)
+            return dict(stats) if stats else None
+
+    def _should_probe(self, model_name: str, stats: Dict[str, float]) -> bool:
+        """
+        Проверяет, пора ли выбрать нездоровую модель для пробного вызова.
+
+        Статистика модели обновляется только при ее вызовах, поэтому без
+        пробных вызовов модель не смогла бы восстановиться после серии ошибок.
+        Пробный вызов выполняется не чаще одного раза за probe_interval.
+        """
+        now = time.time()
+        with self._lock:
+            last_activity = max(
+                stats.get("updated_at", 0.0), self._probed_at.get(model_name, 0.0)
+            )
+            if now - last_activity < self.probe_interval:
+                return False
+            self._probed_at[model_name] = now
+        logging.info(f"Пробный вызов нездоровой модели {model_name}")
+        return True
+
+    def pick_fastest(self, candidates: Iterable[str]) -> Optional[str]:
+        """
+        Выбирает самую быструю здоровую модель из списка кандидатов.
+
+        Модели с открытым предохранителем исключаются. Модели без
+        статистики выбираются в первую очередь, чтобы их измерить.
+        Нездоровые модели пропускаются, но раз в probe_interval
+        выбираются для пробного вызова (см. _should_probe).
+        Остальные сравниваются по ожидаемому времени до успешного ответа:
+        EWMA задержки, деленной на долю успешных вызовов.
+
+        Args:
+            candidates (Iterable[str]): Допустимые модели
+
+        Returns:
+            Optional[str]: Название модели или None, если здоровых моделей нет
+        """
+        candidates = list(candidates)
+        best_model, best_score = None, None
+        for model_name in candidates:
+            if not circuit_breakers.is_available(model_name):
+                continue
+            stats = self.get(model_name)
+            if stats is None:
+                return model_name
+            if stats["success_rate"] < self.min_success_rate:
+                if self._should_probe(model_name, stats):
+                    return model_name
+                continue
+            score = stats["latency"] / stats["success_rate"]
+            if best_score is None or score < best_score:
+                best_model, best_score = model_name, score
+
+        if best_model is None:
+            # Если все модели нездоровы, но предохранители закрыты,
+            # выбираем модель с наибольшей долей успешных вызовов
+            available = [
+                model_name
+                for model_name in candidates
+                if circuit_breakers.is_available(model_name)
+            ]
+            if available:
+                best_model = max(
+                    available, key=lambda m: self.get(m)["success_rate"]
+                )
+        return best_model
+
+
+# Global instance
+model_stats = ModelStats(
+    os.getenv("LLM_STATS_PATH", ".cache/model_stats.json"),
+    probe_interval=float(os.getenv("LLM_STATS_PROBE_INTERVAL", "300")),
+)
+
+
+def get_auto_candidates() -> List[str]:
+    """
+    Возвращает список моделей, допустимых для автоматического выбора.
+
+    Returns:
+        List[str]: Названия моделей из LLM_AUTO_MODELS или список по умолчанию
+    """
+    env_models = os.getenv("LLM_AUTO_MODELS", "")
+    models = [model.strip() for model in env_models.split(",") if model.strip()]
+    return models or DEFAULT_AUTO_MODELS
+
+
+def resolve_model_name(model_name: str) -> str:
+    """
+    Заменяет режим автоматического выбора на конкретную модель.
+
+    Args:
+        model_name (str): Выбранная модель или AUTO_MODEL
+
+    Returns:
+        str: Название конкретной модели
+
+    Raises:
+        CircuitOpenError: Если в автоматическом режиме нет доступных моделей
+    """
+    if model_name != AUTO_MODEL:
+        return model_name
+
+    candidates = get_auto_candidates()
+    resolved = model_stats.pick_fastest(candidates)
+    if resolved is None:
+        raise CircuitOpenError(
+            f"Все модели автоматического выбора временно недоступны: "
+            f"{', '.join(candidates)}"
+        )
+    logging.info(f"Автоматически выбрана модель: {resolved}")
+    return resolved
+
+
+def select_node_model(node: str, node_model_name: str, default_model_name: str) -> str:
+    """
+    Выбирает модель для этапа проверки с учетом доступности.
+
+    Если предохранитель отдельной модели этапа открыт, этап сразу
+    переключается на основную модель вместо ожидания повторных попыток.
+
+    Args:
+        node (str): Название этапа проверки
+        node_model_name (str): Модель, выбранная для этапа
+        default_model_name (str): Основная модель
+
+    Returns:
+        str: Название модели для этапа
+    """
+    if node_model_name == AUTO_MODEL or circuit_breakers.is_available(node_model_name):
+        return node_model_name
+    logging.warning(
+        f"⛔ Модель {node_model_name} для этапа {node} временно недоступна, "
+        f"используется основная модель {default_model_name}"
+    )
+    return default_model_name
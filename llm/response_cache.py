@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+
+class ResponseCache:
+    """
+    Постоянный кэш ответов LLM на основе SQLite.
+
+    Все модели вызываются с temperature=0, поэтому ответ на один и тот же
+    запрос к одной и той же модели с теми же параметрами можно использовать
+    повторно. Записи удаляются по истечении времени жизни, а при превышении
+    максимального количества записей удаляются давно не использованные.
+
+    Attributes:
+        path (str): Путь к файлу базы данных
+        ttl (float): Время жизни записи в секундах
+        max_entries (int): Максимальное количество записей
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, max_entries: int = 2000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с базой и создает таблицу при первом обращении."""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with connection:
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS responses (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                    """
+                )
+            self._initialized = True
+        return connection
+
+    @staticmethod
+    def make_key(
+        messages: List[Any], model_name: str, settings: Dict[str, Any]
+    ) -> str:
+        """
+        Формирует ключ кэша по сформированному промпту, модели и параметрам.
+
+        Args:
+            messages (List[BaseMessage]): Сообщения, отправляемые модели
+            model_name (str): Название модели
+            settings (Dict[str, Any]): Параметры генерации
+
+        Returns:
+            str: SHA-256 хэш запроса
+        """
+        payload = json.dumps(
+            {
+                "messages": [[message.type, message.content] for message in messages],
+                "model": model_name,
+                "settings": settings,
+                "temperature": 0,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает сохраненный ответ.
+
+        Args:
+            key (str): Ключ кэша
+
+        Returns:
+            Optional[Dict[str, Any]]: Ответ или None, если его нет или он устарел
+        """
+        now = time.time()
+        try:
+            with self._lock, closing(self._connect()) as connection, connection:
+                row = connection.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl:
+                    connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    row = None
+                if row is None:
+                    self.misses += 1
+                    return None
+                connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self.hits += 1
+                return json.loads(row[0])
+        except Exception as e:
+            logging.error(f"Ошибка при чтении кэша ответов LLM: {e}")
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Сохраняет ответ и удаляет устаревшие и лишние записи.
+
+        Args:
+            key (str): Ключ кэша
+            value (Dict[str, Any]): Ответ для сохранения
+        """
+        now = time.time()
+        try:
+            with self._lock, closing(self._connect()) as connection, connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now),
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)
+                )
+                connection.execute(
+                    """
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses
+                        ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+        except Exception as e:
+            logging.error(f"Ошибка при записи в кэш ответов LLM: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Возвращает метрики использования кэша в текущем процессе.
+
+        Returns:
+            Dict[str, Any]: Количество попаданий, промахов и доля попаданий
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Global instance
+response_cache = ResponseCache(
+    os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite"),
+    ttl=float(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000")),
+)
@@ -0,0 +1,135 @@
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+# Классы приоритета запросов к LLM
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+
+class LLMScheduler:
+    """
+    Планировщик одновременных вызовов LLM моделей.
+
+    Ограничивает общее число одновременных вызовов (ключи OpenRouter
+    и квоты провайдеров общие для всех проверок) и число вызовов одного
+    источника. Свободный слот получает в первую очередь интерактивный
+    запрос, затем пакетный запрос источника с наименьшим числом
+    выполняющихся вызовов, а при равенстве - источника, дольше всех
+    не получавшего слот, чтобы одновременные пакетные проверки делили
+    слоты поровну. Запросы одного источника обслуживаются по очереди.
+
+    Attributes:
+        max_concurrency (int): Максимальное число одновременных вызовов
+        tenant_max_concurrency (int): Максимальное число одновременных вызовов
+                                      одного источника
+    """
+
+    def __init__(self, max_concurrency: int = 16, tenant_max_concurrency: int = 4):
+        self.max_concurrency = max_concurrency
+        self.tenant_max_concurrency = tenant_max_concurrency
+        self._condition = threading.Condition()
+        self._active = 0
+        self._tenant_active = Counter()
+        self._last_grant: Dict[str, int] = {}
+        self._waiting: List[Dict[str, Any]] = []
+        self._sequence = itertools.count()
+
+    def _next_ticket(self):
+        """Выбирает ожидающий запрос, которому достанется свободный слот."""
+        candidates = [
+            ticket
+            for ticket in self._waiting
+            if self._tenant_active[ticket["tenant"]] < self.tenant_max_concurrency
+        ]
+        if not candidates:
+            return None
+        return min(
+            candidates,
+            key=lambda ticket: (
+                PRIORITIES.index(ticket["priority"]),
+                self._tenant_active[ticket["tenant"]]
+                if ticket["priority"] == BATCH
+                else 0,
+                self._last_grant.get(ticket["tenant"], -1)
+                if ticket["priority"] == BATCH
+                else 0,
+                ticket["sequence"],
+            ),
+        )
+
+    @contextmanager
+    def acquire(self, priority: str = BATCH, tenant: str = "default") -> Iterator[float]:
+        """
+        Ожидает свободный слот для вызова модели.
+
+        Args:
+            priority (str): Класс приоритета запроса (interactive или batch)
+            tenant (str): Источник запроса (сессия куратора, пакетная проверка)
+
+        Yields:
+            float: Время ожидания слота в секундах
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Неизвестный приоритет: {priority}")
+
+        ticket = {
+            "priority": priority,
+            "tenant": tenant,
+            "sequence": next(self._sequence),
+        }
+        start_time = time.time()
+        with self._condition:
+            self._waiting.append(ticket)
+            try:
+                while not (
+                    self._active < self.max_concurrency
+                    and self._next_ticket() is ticket
+                ):
+                    self._condition.wait()
+            finally:
+                self._waiting.remove(ticket)
+            self._active += 1
+            self._tenant_active[tenant] += 1
+            self._last_grant[tenant] = next(self._sequence)
+            # Слот мог освободиться сразу для нескольких ожидающих
+            self._condition.notify_all()
+
+        try:
+            yield time.time() - start_time
+        finally:
+            with self._condition:
+                self._active -= 1
+                self._tenant_active[tenant] -= 1
+                if not self._tenant_active[tenant]:
+                    del self._tenant_active[tenant]
+                    if all(ticket["tenant"] != tenant for ticket in self._waiting):
+                        del self._last_grant[tenant]
+                self._condition.notify_all()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Возвращает текущую загрузку планировщика.
+
+        Returns:
+            Dict[str, Any]: Число выполняющихся вызовов и ожидающих запросов
+                            каждого класса приоритета
+        """
+        with self._condition:
+            waiting = Counter(ticket["priority"] for ticket in self._waiting)
+            return {
+                "active": self._active,
+                "waiting": {priority: waiting[priority] for priority in PRIORITIES},
+            }
+
+
+# Global instance
+llm_scheduler = LLMScheduler(
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "16")),
+    tenant_max_concurrency=int(os.getenv("LLM_TENANT_MAX_CONCURRENCY", "4")),
+)
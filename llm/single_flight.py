@@ -0,0 +1,77 @@
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+
+class _Call:
+    """Выполняющийся вызов, результат которого ожидают другие потоки."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных вызовов (single-flight).
+
+    Если вызов с таким же ключом уже выполняется в другом потоке
+    (например, в другой сессии Streamlit), новый вызов не выполняется,
+    а дожидается результата текущего. Ошибка выполняющегося вызова
+    передается всем ожидающим.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.shared_calls = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Выполняет функцию или дожидается результата такого же вызова.
+
+        Args:
+            key (str): Ключ вызова
+            fn (Callable): Функция без аргументов
+
+        Returns:
+            Tuple[Any, bool]: Результат функции и признак того, что результат
+                              получен от другого вызова
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared_calls += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Возвращает количество выполняющихся вызовов."""
+        with self._lock:
+            return len(self._calls)
+
+
+# Global instance
+single_flight = SingleFlight()
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# Модули, которые не должны загружаться при запуске: SDK провайдеров LLM,
+# библиотеки экспорта и сохранения результатов импортируются по требованию
+LAZY_MODULES = [
+    "langchain_community",
+    "langchain_gigachat",
+    "langchain_openai",
+    "s3fs",
+    "pyairtable",
+    "fpdf",
+    "markdown2",
+    "tiktoken",
+    "chardet",
+]
+
+# Строка отчета python -X importtime:
+# "import time:       self [us] |  cumulative | imported package"
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_arguments():
+    """Парсинг аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Профилирование времени импорта при запуске приложений"
+    )
+
+    parser.add_argument(
+        "--modules",
+        "-m",
+        nargs="+",
+        default=["app", "cli_app", "serve"],
+        help="Модули точек входа для профилирования",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-n",
+        type=int,
+        default=3,
+        help="Количество запусков каждого модуля (берется лучшее время)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=15,
+        help="Количество самых долгих импортов в отчете",
+    )
+    parser.add_argument(
+        "--baseline",
+        "-b",
+        type=str,
+        default=None,
+        help="JSON-файл с эталонным временем запуска для проверки регрессии",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Допустимое замедление относительно эталона (доля)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Сохранить текущее время запуска как эталонное",
+    )
+
+    return parser.parse_args()
+
+
+def profile_module(module):
+    """
+    Импорт модуля в отдельном процессе с python -X importtime.
+
+    Returns:
+        list: Записи (модуль, собственное время, суммарное время, вложенность)
+              в секундах
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            records.append(
+                (name, int(self_us) / 1e6, int(cumulative_us) / 1e6, len(indent) // 2)
+            )
+    return records
+
+
+def summarize(module, repeat):
+    """Лучшее время импорта модуля и список загруженных модулей"""
+    best = None
+    for _ in range(repeat):
+        records = profile_module(module)
+        total = sum(cumulative for _, _, cumulative, depth in records if depth == 0)
+        if best is None or total < best["seconds"]:
+            best = {"seconds": total, "records": records}
+    best["loaded"] = {name for name, _, _, _ in best["records"]}
+    return best
+
+
+def print_report(module, summary, top):
+    """Вывод самых долгих импортов верхнего уровня пакетов"""
+    print(f"\n{module}: {summary['seconds']:.3f} с, модулей: {len(summary['loaded'])}")
+    packages = {}
+    for name, _, cumulative, _ in summary["records"]:
+        package = name.split(".")[0]
+        packages[package] = max(packages.get(package, 0), cumulative)
+    header = f"{'Пакет':<32}{'Время, с':>10}"
+    print(header)
+    print("-" * len(header))
+    for package, seconds in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<32}{seconds:>10.3f}")
+
+
+def check_regressions(module, summary, baseline, tolerance):
+    """Проверка отложенных импортов и времени запуска относительно эталона"""
+    problems = [
+        f"{module}: при запуске загружается {name}"
+        for name in LAZY_MODULES
+        if name in summary["loaded"]
+    ]
+    if baseline and module in baseline:
+        limit = baseline[module] * (1 + tolerance)
+        if summary["seconds"] > limit:
+            problems.append(
+                f"{module}: время запуска {summary['seconds']:.3f} с "
+                f"превышает эталон {baseline[module]:.3f} с "
+                f"более чем на {tolerance:.0%}"
+            )
+    return problems
+
+
+def main():
+
+    args = parse_arguments()
+
+    baseline = {}
+    if args.baseline and os.path.isfile(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    problems = []
+    timings = {}
+    for module in args.modules:
+        try:
+            summary = summarize(module, args.repeat)
+        except RuntimeError as e:
+            problems.append(f"{module}: ошибка импорта: {e}")
+            continue
+        timings[module] = summary["seconds"]
+        print_report(module, summary, args.top)
+        problems.extend(check_regressions(module, summary, baseline, args.tolerance))
+
+    if args.update_baseline and args.baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **timings}, f, indent=4)
+        print(f"\nЭталон сохранен в {args.baseline}")
+
+    if problems:
+        print("\n⚠️ Обнаружены регрессии времени запуска:")
+        for problem in problems:
+            print(f"  - {problem}")
+        sys.exit(1)
+    print("\n✅ Регрессий времени запуска не обнаружено")
+
+
+if __name__ == "__main__":
+    main()
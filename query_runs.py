@@ -0,0 +1,143 @@
+import argparse
+import re
+import sys
+
+from llm.llm_config import get_secret
+from utils.results_archive import RESULTS_FILE_NAME, load_results
+from utils.run_index import run_index
+
+# Имя папки проверки: <время проверки>_<uuid>
+RUN_FOLDER_PATTERN = re.compile(
+    r"^\d{8}_\d{6}_[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+)
+
+# Статистика по моделям проверки
+STATS_QUERY = """
+    SELECT
+        COALESCE(llm_report_check, llm) AS model,
+        COUNT(*) AS runs,
+        ROUND(AVG(score), 1) AS avg_score,
+        ROUND(AVG(duration), 1) AS avg_duration,
+        ROUND(AVG(report_check_duration), 1) AS avg_check_duration,
+        SUM(rating IS NOT NULL) AS rated,
+        ROUND(AVG(output_tokens)) AS avg_output_tokens
+    FROM runs
+    GROUP BY model
+    ORDER BY runs DESC
+"""
+
+
+def parse_arguments():
+    """Парсинг аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="Запросы к индексу запусков проверки"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser(
+        "sync", help="Добавить в индекс новые и измененные запуски из S3"
+    )
+    sync_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Переиндексировать все запуски (например, после изменения "
+        "извлечения итоговой оценки)",
+    )
+
+    query_parser = subparsers.add_parser("query", help="Выполнить SQL-запрос к таблице runs")
+    query_parser.add_argument("sql", type=str, help="SQL-запрос")
+
+    subparsers.add_parser("stats", help="Статистика запусков по моделям")
+
+    export_parser = subparsers.add_parser(
+        "export", help="Выгрузить индекс в файл Parquet или CSV"
+    )
+    export_parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default="runs.parquet",
+        help="Файл для выгрузки (.parquet или .csv)",
+    )
+
+    return parser.parse_args()
+
+
+def print_table(columns, rows):
+    """Вывод результата запроса в виде таблицы"""
+    cells = [[("" if value is None else str(value)) for value in row] for row in rows]
+    widths = [
+        max([len(column)] + [len(row[i]) for row in cells])
+        for i, column in enumerate(columns)
+    ]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in cells:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+
+
+def sync_from_s3(full=False):
+    """
+    Инкрементальная синхронизация индекса с S3.
+
+    Список файлов результатов получается одним запросом, а загружаются
+    только записи, которых нет в индексе или которые изменились после
+    индексации (например, после добавления обратной связи). При full=True
+    загружаются все записи.
+    """
+    import s3fs
+
+    fs = s3fs.S3FileSystem(
+        key=get_secret("AWS_ACCESS_KEY_ID"),
+        secret=get_secret("AWS_SECRET_ACCESS_KEY"),
+        endpoint_url=get_secret("AWS_ENDPOINT_URL"),
+    )
+    bucket = get_secret("AWS_BUCKET_NAME")
+
+    # Время изменения файлов результатов по папкам проверки
+    source_mtimes = {}
+    for path, info in fs.find(bucket, maxdepth=2, detail=True).items():
+        folder, _, file_name = path[len(bucket) + 1 :].partition("/")
+        if not RUN_FOLDER_PATTERN.match(folder):
+            continue
+        if not file_name.startswith(RESULTS_FILE_NAME):
+            continue
+        modified = info.get("LastModified")
+        mtime = modified.timestamp() if modified is not None else 0.0
+        source_mtimes[folder] = max(mtime, source_mtimes.get(folder, 0.0))
+
+    indexed = run_index.get_source_mtimes()
+    changed = [
+        folder
+        for folder, mtime in sorted(source_mtimes.items())
+        if full or (indexed.get(folder) or 0.0) < mtime
+    ]
+    print(f"Запусков в S3: {len(source_mtimes)}, требуют индексации: {len(changed)}")
+
+    for folder in changed:
+        try:
+            results_json = load_results(fs, f"{bucket}/{folder}")
+        except Exception as e:
+            print(f"❌ {folder}: {e}", file=sys.stderr)
+            continue
+        if results_json is not None:
+            run_index.upsert(folder, results_json, source_mtimes[folder])
+    print(f"✅ Индекс обновлен: {run_index.path}")
+
+
+def main():
+    args = parse_arguments()
+
+    if args.command == "sync":
+        sync_from_s3(args.full)
+    elif args.command == "query":
+        print_table(*run_index.query(args.sql))
+    elif args.command == "stats":
+        print_table(*run_index.query(STATS_QUERY))
+    elif args.command == "export":
+        count = run_index.export(args.output)
+        print(f"✅ Выгружено запусков: {count} в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import argparse
+import json
+import logging
+import os
+import re
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from graph.compile_graph import build_graph
+from graph.graph_config import build_graph_config
+from llm.llm_config import LLMConfig
+from llm.model_stats import AUTO_MODEL
+from llm.scheduler import BATCH, PRIORITIES, llm_scheduler
+from service.job_queue import SUCCESS, IdempotencyConflictError, JobQueue
+from service.worker_pool import WorkerPool
+from utils.file_utils import extract_text_from_file
+from utils.prompt_manager import PromptManager
+from utils.text_extraction import has_text_content
+from utils.text_normalization import normalize_document
+
+graph = build_graph()
+
+# Поля результата проверки, возвращаемые клиенту
+RESULT_FIELDS = [
+    "structured_criteria",
+    "check_results",
+    "check_scores",
+    "feedback",
+    "node_durations",
+    "node_llms",
+    "node_output_tokens",
+    "node_cache_hits",
+    "node_queue_waits",
+    "node_prompt_versions",
+]
+
+# Максимальный размер тела запроса в байтах
+MAX_BODY_SIZE = 10 * 1024 * 1024
+
+JOB_PATH = re.compile(r"^/jobs/([0-9a-f-]+)(/result)?$")
+
+
+def parse_arguments():
+    """Парсинг аргументов командной строки"""
+    parser = argparse.ArgumentParser(
+        description="AI-ассистент куратора проектного практикума (сервис проверки)"
+    )
+
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Адрес сервиса")
+    parser.add_argument("--port", type=int, default=8000, help="Порт сервиса")
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        default=int(os.getenv("SERVICE_WORKERS", "2")),
+        help="Количество одновременно выполняемых проверок",
+    )
+    parser.add_argument(
+        "--queue-path",
+        type=str,
+        default=os.getenv("SERVICE_QUEUE_PATH", ".cache/jobs.sqlite"),
+        help="Путь к файлу очереди задач",
+    )
+    parser.add_argument(
+        "--tenant-max-jobs",
+        type=int,
+        default=int(os.getenv("SERVICE_TENANT_MAX_JOBS", "2")),
+        help="Максимальное количество одновременных проверок одного источника",
+    )
+    parser.add_argument(
+        "--criteria_file_path",
+        "-c",
+        type=str,
+        default="Критерии.txt",
+        help="Файл с критериями оценки по умолчанию (TXT)",
+    )
+    parser.add_argument(
+        "--prompts_dir",
+        type=str,
+        default="prompts",
+        help="Директория с промптами",
+    )
+    parser.add_argument(
+        "--model",
+        "-m",
+        type=str,
+        default="DeepSeek Chat",
+        help="LLM модель по умолчанию",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Не использовать сохраненные ответы LLM для повторных проверок",
+    )
+
+    return parser.parse_args()
+
+
+def validate_payload(payload):
+    """
+    Проверка данных задачи проверки.
+
+    Args:
+        payload (dict): Данные задачи
+
+    Raises:
+        ValueError: Если данные задачи некорректны
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Тело запроса должно быть JSON-объектом")
+    if not isinstance(payload.get("report"), str) or not payload["report"].strip():
+        raise ValueError("Не передан текст отчета (report)")
+    if not has_text_content(payload["report"]):
+        raise ValueError("Отчет не содержит текста для проверки")
+    for field in ("passport", "criteria", "model", "tenant"):
+        if field in payload and not isinstance(payload[field], str):
+            raise ValueError(f"Поле {field} должно быть строкой")
+    for field in ("skip_feedback", "normalize"):
+        if field in payload and not isinstance(payload[field], bool):
+            raise ValueError(f"Поле {field} должно быть логическим значением")
+    if payload.get("priority", BATCH) not in PRIORITIES:
+        raise ValueError(f"Поле priority должно принимать значения: {', '.join(PRIORITIES)}")
+    if "node_models" in payload and not isinstance(payload["node_models"], dict):
+        raise ValueError("Поле node_models должно быть объектом")
+    known_models = [*LLMConfig.get_model_configs(), AUTO_MODEL]
+    for model in [payload.get("model"), *payload.get("node_models", {}).values()]:
+        if model and model not in known_models:
+            raise ValueError(f"Неизвестная модель: {model}")
+
+
+def make_job_handler(args):
+    """
+    Создание функции выполнения задачи проверки.
+
+    Критерии по умолчанию и промпты загружаются один раз при запуске сервиса.
+    """
+    criteria = extract_text_from_file(args.criteria_file_path)
+    prompt_manager = PromptManager(args.prompts_dir)
+
+    def run_check(payload):
+        skip_feedback = payload.get("skip_feedback", False)
+        config = build_graph_config(
+            get_prompt=prompt_manager.get_prompt,
+            model_name=payload.get("model") or args.model,
+            node_models=payload.get("node_models"),
+            use_cache=not args.no_cache,
+            max_attempts=5,
+            retry_wait_max=15,
+            priority=payload.get("priority", BATCH),
+            tenant=payload.get("tenant") or "default",
+        )
+        normalize = payload.get("normalize", True)
+        report, report_normalization = normalize_document(
+            payload["report"], enabled=normalize
+        )
+        passport, passport_normalization = normalize_document(
+            payload.get("passport", ""), enabled=normalize
+        )
+        results = graph.invoke(
+            {
+                "report": report,
+                "criteria": payload.get("criteria") or criteria,
+                "passport": passport,
+                "skip_feedback": skip_feedback,
+            },
+            config=config,
+        )
+        return {
+            **{field: results.get(field) for field in RESULT_FIELDS},
+            "normalization": {
+                "report": report_normalization,
+                "passport": passport_normalization,
+            },
+        }
+
+    return run_check
+
+
+def describe_job(job):
+    """Описание задачи для ответа клиенту (без данных и результата)"""
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "error": job["error"],
+        "priority": job["priority"],
+        "tenant": job["tenant"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "started_at": job["started_at"],
+        "finished_at": job["finished_at"],
+        "queue_wait": job["queue_wait"],
+    }
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик HTTP-запросов сервиса проверки.
+
+    Эндпоинты:
+        POST /jobs - постановка отчета в очередь на проверку
+        GET /jobs/<id> - статус задачи
+        GET /jobs/<id>/result - результат проверки
+        GET /health - количество задач в каждом статусе и загрузка планировщика
+    """
+
+    queue: JobQueue = None
+
+    def _send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {"error": message})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            self._send_error(HTTPStatus.NOT_FOUND, "Неизвестный адрес")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            self._send_error(HTTPStatus.BAD_REQUEST, "Некорректный Content-Length")
+            return
+        if length < 0:
+            self._send_error(HTTPStatus.BAD_REQUEST, "Некорректный Content-Length")
+            return
+        if length > MAX_BODY_SIZE:
+            self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Слишком большой запрос")
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+            validate_payload(payload)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            self._send_error(HTTPStatus.BAD_REQUEST, "Тело запроса не является JSON")
+            return
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        try:
+            job, created = self.queue.submit(
+                payload,
+                self.headers.get("Idempotency-Key"),
+                priority=payload.get("priority", BATCH),
+                tenant=payload.get("tenant") or "default",
+            )
+        except IdempotencyConflictError as e:
+            self._send_error(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+            return
+        if created:
+            logging.info(f"📥 Задача {job['id']} поставлена в очередь")
+        self._send_json(
+            HTTPStatus.ACCEPTED if created else HTTPStatus.OK, describe_job(job)
+        )
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(
+                HTTPStatus.OK,
+                {"jobs": self.queue.get_counts(), "llm": llm_scheduler.get_metrics()},
+            )
+            return
+
+        match = JOB_PATH.match(self.path)
+        job = self.queue.get(match.group(1)) if match else None
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "Задача не найдена")
+            return
+
+        if not match.group(2):
+            self._send_json(HTTPStatus.OK, describe_job(job))
+        elif job["status"] != SUCCESS:
+            self._send_json(HTTPStatus.CONFLICT, describe_job(job))
+        else:
+            self._send_json(HTTPStatus.OK, {**describe_job(job), **job["result"]})
+
+    def log_message(self, format, *args):
+        logging.info(f"{self.address_string()} - {format % args}")
+
+
+def main():
+
+    args = parse_arguments()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(threadName)s - %(message)s",
+    )
+
+    queue = JobQueue(args.queue_path, tenant_max_concurrency=args.tenant_max_jobs)
+    requeued = queue.requeue_interrupted()
+    if requeued:
+        logging.info(f"🔁 Возвращено в очередь прерванных задач: {requeued}")
+
+    pool = WorkerPool(queue, make_job_handler(args), workers=args.workers)
+    pool.start()
+
+    JobRequestHandler.queue = queue
+    server = ThreadingHTTPServer((args.host, args.port), JobRequestHandler)
+    logging.info(
+        f"🚀 Сервис проверки запущен на http://{args.host}:{args.port}, "
+        f"потоков проверки: {args.workers}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Остановка сервиса...")
+    finally:
+        server.server_close()
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
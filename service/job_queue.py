@@ -0,0 +1,348 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Dict, Optional, Tuple
+
+from llm.scheduler import BATCH, INTERACTIVE
+
+# Статусы задач проверки
+QUEUED = "queued"
+RUNNING = "running"
+SUCCESS = "success"
+ERROR = "error"
+
+
+class IdempotencyConflictError(ValueError):
+    """Ключ идемпотентности уже использован для задачи с другими данными."""
+
+
+class JobQueue:
+    """
+    Постоянная очередь задач проверки на основе SQLite.
+
+    Задачи переживают перезапуск сервиса: задачи, выполнение которых было
+    прервано, при запуске возвращаются в очередь. Повторная отправка задачи
+    с тем же ключом идемпотентности возвращает уже созданную задачу.
+
+    Интерактивные задачи выполняются раньше пакетных. Среди задач одного
+    приоритета первой выполняется задача источника с наименьшим числом
+    выполняющихся задач, а число одновременно выполняемых задач одного
+    источника ограничено.
+
+    Attributes:
+        path (str): Путь к файлу базы данных
+        tenant_max_concurrency (int): Максимальное число одновременно
+                                      выполняемых задач одного источника
+    """
+
+    def __init__(self, path: str, tenant_max_concurrency: int = 2):
+        self.path = path
+        self.tenant_max_concurrency = tenant_max_concurrency
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с базой и создает таблицу при первом обращении."""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        if not self._initialized:
+            with connection:
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id TEXT PRIMARY KEY,
+                        idempotency_key TEXT UNIQUE NOT NULL,
+                        status TEXT NOT NULL,
+                        priority TEXT NOT NULL,
+                        tenant TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        result TEXT,
+                        error TEXT,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        created_at REAL NOT NULL,
+                        available_at REAL NOT NULL,
+                        started_at REAL,
+                        finished_at REAL,
+                        queued_at REAL,
+                        queue_wait REAL NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+                self._add_queue_wait_columns(connection)
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS jobs_status "
+                    "ON jobs (status, available_at, created_at)"
+                )
+            self._initialized = True
+        return connection
+
+    @staticmethod
+    def _add_queue_wait_columns(connection: sqlite3.Connection) -> None:
+        """
+        Добавляет столбцы учета времени ожидания в базу ранних версий.
+
+        Для уже запускавшихся задач время ожидания оценивается
+        как время от постановки в очередь до последнего запуска.
+        """
+        columns = {
+            row["name"] for row in connection.execute("PRAGMA table_info(jobs)")
+        }
+        if "queued_at" not in columns:
+            connection.execute("ALTER TABLE jobs ADD COLUMN queued_at REAL")
+        if "queue_wait" not in columns:
+            connection.execute(
+                "ALTER TABLE jobs ADD COLUMN queue_wait REAL NOT NULL DEFAULT 0"
+            )
+            connection.execute(
+                "UPDATE jobs SET queue_wait = started_at - created_at "
+                "WHERE started_at IS NOT NULL"
+            )
+
+    @staticmethod
+    def make_idempotency_key(payload: Dict[str, Any]) -> str:
+        """
+        Формирует ключ идемпотентности по содержимому задачи.
+
+        Args:
+            payload (Dict[str, Any]): Данные задачи
+
+        Returns:
+            str: SHA-256 хэш данных задачи
+        """
+        data = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """Преобразует строку таблицы в описание задачи."""
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        # Суммарное время ожидания в очереди перед всеми запусками задачи
+        # (без времени предыдущих попыток выполнения)
+        job["queue_wait"] = job["queue_wait"] if job["started_at"] else None
+        return job
+
+    def submit(
+        self,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        priority: str = BATCH,
+        tenant: str = "default",
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Ставит задачу в очередь.
+
+        Если задача с таким ключом идемпотентности уже существует, новая
+        задача не создается. Задача, завершившаяся с ошибкой, при повторной
+        отправке ставится в очередь заново.
+
+        Args:
+            payload (Dict[str, Any]): Данные задачи
+            idempotency_key (str, optional): Ключ идемпотентности, по умолчанию
+                                             хэш данных задачи
+            priority (str): Класс приоритета задачи (interactive или batch)
+            tenant (str): Источник задачи
+
+        Returns:
+            Tuple[Dict[str, Any], bool]: Задача и признак того, что она
+                                         была поставлена в очередь
+
+        Raises:
+            IdempotencyConflictError: Если задача с таким ключом
+                                      идемпотентности имеет другие данные
+        """
+        key = idempotency_key or self.make_idempotency_key(payload)
+        now = time.time()
+        with self._lock, closing(self._connect()) as connection, connection:
+            created = connection.execute(
+                """
+                INSERT OR IGNORE INTO jobs
+                    (id, idempotency_key, status, priority, tenant, payload,
+                     created_at, available_at, queued_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    str(uuid.uuid4()),
+                    key,
+                    QUEUED,
+                    priority,
+                    tenant,
+                    json.dumps(payload, ensure_ascii=False),
+                    now,
+                    now,
+                    now,
+                ),
+            ).rowcount == 1
+            if not created:
+                stored = connection.execute(
+                    "SELECT payload FROM jobs WHERE idempotency_key = ?", (key,)
+                ).fetchone()
+                if json.loads(stored[0]) != payload:
+                    raise IdempotencyConflictError(
+                        "Ключ идемпотентности уже использован для другого запроса"
+                    )
+                created = connection.execute(
+                    """
+                    UPDATE jobs
+                    SET status = ?, error = NULL, attempts = 0, available_at = ?,
+                        started_at = NULL, finished_at = NULL, queued_at = ?,
+                        queue_wait = 0
+                    WHERE idempotency_key = ? AND status = ?
+                    """,
+                    (QUEUED, now, now, key, ERROR),
+                ).rowcount == 1
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE idempotency_key = ?", (key,)
+            ).fetchone()
+        return self._to_dict(row), created
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Забирает из очереди следующую готовую к выполнению задачу.
+
+        Порядок выбора: приоритет задачи, число выполняющихся задач ее
+        источника, время последнего запуска задачи источника, время
+        постановки в очередь. Задачи источников, достигших
+        ограничения на число одновременных задач, пропускаются.
+
+        Returns:
+            Optional[Dict[str, Any]]: Задача или None, если очередь пуста
+        """
+        now = time.time()
+        with self._lock, closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                """
+                SELECT jobs.id FROM jobs
+                JOIN (
+                    SELECT tenant, SUM(status = ?) AS running,
+                        IFNULL(MAX(started_at), 0) AS last_started
+                    FROM jobs GROUP BY tenant
+                ) AS tenants ON tenants.tenant = jobs.tenant
+                WHERE jobs.status = ? AND jobs.available_at <= ?
+                    AND tenants.running < ?
+                ORDER BY jobs.priority = ? DESC, tenants.running,
+                    tenants.last_started, jobs.created_at
+                LIMIT 1
+                """,
+                (RUNNING, QUEUED, now, self.tenant_max_concurrency, INTERACTIVE),
+            ).fetchone()
+            if row is None:
+                return None
+            claimed = connection.execute(
+                """
+                UPDATE jobs
+                SET status = ?, attempts = attempts + 1, started_at = ?,
+                    queue_wait = queue_wait + MAX(0, ? - IFNULL(queued_at, created_at))
+                WHERE id = ? AND status = ?
+                """,
+                (RUNNING, now, now, row["id"], QUEUED),
+            ).rowcount == 1
+            if not claimed:
+                return None
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE id = ?", (row["id"],)
+            ).fetchone()
+        return self._to_dict(row)
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """
+        Сохраняет результат успешно выполненной задачи.
+
+        Args:
+            job_id (str): Идентификатор задачи
+            result (Dict[str, Any]): Результат проверки
+        """
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished_at = ? WHERE id = ?",
+                (SUCCESS, json.dumps(result, ensure_ascii=False), time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        """
+        Отмечает задачу как завершившуюся с ошибкой.
+
+        Args:
+            job_id (str): Идентификатор задачи
+            error (str): Описание ошибки
+        """
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (ERROR, error, time.time(), job_id),
+            )
+
+    def retry_later(self, job_id: str, delay: float, error: str) -> None:
+        """
+        Возвращает задачу в очередь для повторного выполнения.
+
+        Args:
+            job_id (str): Идентификатор задачи
+            delay (float): Через сколько секунд задачу можно выполнить снова
+            error (str): Причина, по которой задача не была выполнена
+        """
+        now = time.time()
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, available_at = ?, queued_at = ?
+                WHERE id = ?
+                """,
+                (QUEUED, error, now + delay, now, job_id),
+            )
+
+    def requeue_interrupted(self) -> int:
+        """
+        Возвращает в очередь задачи, выполнение которых было прервано.
+
+        Вызывается при запуске сервиса, пока задачи еще не выполняются.
+
+        Returns:
+            int: Количество возвращенных в очередь задач
+        """
+        now = time.time()
+        with self._lock, closing(self._connect()) as connection, connection:
+            return connection.execute(
+                """
+                UPDATE jobs SET status = ?, available_at = ?, queued_at = ?
+                WHERE status = ?
+                """,
+                (QUEUED, now, now, RUNNING),
+            ).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает задачу по идентификатору.
+
+        Args:
+            job_id (str): Идентификатор задачи
+
+        Returns:
+            Optional[Dict[str, Any]]: Задача или None, если она не найдена
+        """
+        with self._lock, closing(self._connect()) as connection:
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def get_counts(self) -> Dict[str, int]:
+        """
+        Возвращает количество задач в каждом статусе.
+
+        Returns:
+            Dict[str, int]: Количество задач по статусам
+        """
+        with self._lock, closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall()
+        return {QUEUED: 0, RUNNING: 0, SUCCESS: 0, ERROR: 0, **dict(rows)}
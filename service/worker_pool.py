@@ -0,0 +1,97 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+from llm.circuit_breaker import CircuitOpenError
+from service.job_queue import JobQueue
+
+
+class WorkerPool:
+    """
+    Пул потоков, выполняющих задачи из очереди.
+
+    Если все модели временно недоступны, задача возвращается в очередь
+    и выполняется позже, но не более max_attempts раз.
+
+    Attributes:
+        queue (JobQueue): Очередь задач
+        handler (Callable): Функция выполнения задачи по ее данным
+        workers (int): Количество потоков
+        poll_interval (float): Пауза между проверками пустой очереди в секундах
+        retry_delay (float): Пауза перед повторным выполнением задачи в секундах
+        max_attempts (int): Максимальное количество попыток выполнения задачи
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handler: Callable[[Dict[str, Any]], Dict[str, Any]],
+        workers: int = 2,
+        poll_interval: float = 1.0,
+        retry_delay: float = 60.0,
+        max_attempts: int = 5,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        """Запускает потоки обработки задач."""
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"worker-{i + 1}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = None) -> None:
+        """
+        Останавливает потоки после завершения текущих задач.
+
+        Args:
+            timeout (float, optional): Максимальное время ожидания каждого потока
+        """
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self) -> None:
+        """Цикл обработки задач одного потока."""
+        while not self._stop_event.is_set():
+            job = self.queue.claim()
+            if job is None:
+                self._stop_event.wait(self.poll_interval)
+                continue
+            self._process(job)
+
+    def _process(self, job: Dict[str, Any]) -> None:
+        """
+        Выполняет задачу и сохраняет ее результат или ошибку.
+
+        Args:
+            job (Dict[str, Any]): Задача из очереди
+        """
+        logging.info(f"▶️ Начато выполнение задачи {job['id']}")
+        try:
+            result = self.handler(job["payload"])
+        except CircuitOpenError as e:
+            if job["attempts"] < self.max_attempts:
+                logging.warning(
+                    f"⛔ Задача {job['id']} отложена на {self.retry_delay:.0f} с: {e}"
+                )
+                self.queue.retry_later(job["id"], self.retry_delay, str(e))
+            else:
+                logging.error(f"❌ Задача {job['id']} не выполнена: {e}")
+                self.queue.fail(job["id"], str(e))
+        except Exception as e:
+            logging.exception(f"❌ Ошибка при выполнении задачи {job['id']}: {e}")
+            self.queue.fail(job["id"], str(e))
+        else:
+            self.queue.complete(job["id"], result)
+            logging.info(f"✅ Задача {job['id']} выполнена")
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+import pytest
+
+from service import job_queue
+from service.job_queue import QUEUED, RUNNING, IdempotencyConflictError, JobQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(job_queue, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite"))
+
+
+def test_submit_is_idempotent(queue):
+    job, created = queue.submit({"report": "текст"})
+    same_job, created_again = queue.submit({"report": "текст"})
+
+    assert created and not created_again
+    assert same_job["id"] == job["id"]
+    assert same_job["status"] == QUEUED
+
+
+def test_reused_key_with_other_payload(queue):
+    queue.submit({"report": "текст"}, idempotency_key="key")
+
+    with pytest.raises(IdempotencyConflictError):
+        queue.submit({"report": "другой текст"}, idempotency_key="key")
+
+
+def test_queue_wait_excludes_run_time(queue, clock):
+    job, _ = queue.submit({"report": "текст"})
+    assert job["queue_wait"] is None
+
+    clock.now += 5
+    job = queue.claim()
+    assert job["status"] == RUNNING
+    assert job["queue_wait"] == 5
+
+    # Задача выполнялась 100 секунд и была отложена
+    clock.now += 100
+    queue.retry_later(job["id"], 10, "модель недоступна")
+    assert queue.claim() is None
+
+    clock.now += 10
+    assert queue.claim()["queue_wait"] == 15
+
+    # Сервис перезапущен во время выполнения задачи
+    clock.now += 50
+    queue.requeue_interrupted()
+    clock.now += 2
+    assert queue.claim()["queue_wait"] == 17
+
+
+def test_failed_job_is_requeued_with_new_wait(queue, clock):
+    job, _ = queue.submit({"report": "текст"})
+    clock.now += 3
+    queue.claim()
+    queue.fail(job["id"], "ошибка")
+
+    clock.now += 60
+    job, created = queue.submit({"report": "текст"})
+    clock.now += 1
+
+    assert created
+    assert queue.claim()["queue_wait"] == 1
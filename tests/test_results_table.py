@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from utils.results_table import (
+    append_result_row,
+    compute_batch_stats,
+    export_results_table,
+    iter_result_rows,
+    make_result_row,
+)
+
+pd = pytest.importorskip("pandas")
+
+
+def make_results(total_score, criteria, model="GigaChat-Max", duration=10.0):
+    return {
+        "check_scores": {
+            "total_score": total_score,
+            "criteria": criteria,
+            "source": "structured" if criteria else "text",
+        },
+        "node_durations": {"report_check": duration, "feedback_forming": 2.0},
+        "node_llms": {"report_check": model},
+        "check_results": "...",
+        "feedback": "...",
+    }
+
+
+def test_make_result_row():
+    row = make_result_row(
+        "report.pdf", make_results(80.0, [], duration=8.0), "2025-01-01 10:00"
+    )
+
+    assert row["total_score"] == 80.0
+    assert row["score_source"] == "text"
+    assert row["model"] == "GigaChat-Max"
+    assert row["duration"] == 10.0
+
+
+def test_result_rows_round_trip(tmp_path):
+    path = tmp_path / "results.jsonl"
+    rows = [{"file_name": "a.pdf"}, {"file_name": "б.pdf"}]
+    for row in rows:
+        append_result_row(str(path), row)
+
+    assert list(iter_result_rows(str(path))) == rows
+
+
+def test_export_results_table(tmp_path):
+    criteria = [{"name": "Анализ", "score": 40.0, "max_score": 50.0}]
+    results = [
+        ("a.pdf", make_results(60.0, criteria)),
+        ("b.pdf", make_results(None, [], model="GPT-4o")),
+        # Повторная проверка заменяет предыдущий результат
+        ("a.pdf", make_results(90.0, criteria)),
+    ]
+    for file_name, result in results:
+        append_result_row(
+            str(tmp_path / "results.jsonl"),
+            make_result_row(file_name, result, "2025-01-01 10:00"),
+        )
+
+    paths = export_results_table(str(tmp_path), "csv")
+
+    table = pd.read_csv(paths[0]).set_index("file_name")
+    assert sorted(table.index) == ["a.pdf", "b.pdf"]
+    assert table.loc["a.pdf", "total_score"] == 90.0
+    assert table.loc["a.pdf", "criteria.Анализ"] == 40.0
+    assert table.loc["a.pdf", "durations.report_check"] == 10.0
+
+    with open(paths[1], encoding="utf-8") as f:
+        stats = json.load(f)
+    assert stats["reports"] == 2
+    assert stats["scored"] == 1
+    assert stats["structured"] == 1
+    assert stats["total_score"]["mean"] == 90.0
+    assert stats["by_model"]["GPT-4o"]["mean_score"] is None
+    assert stats["by_criterion"]["Анализ"]["mean_share"] == 0.8
+    assert stats["durations"]["mean_by_stage"]["feedback_forming"] == 2.0
+
+
+def test_empty_batch_stats():
+    assert compute_batch_stats(pd.DataFrame(), pd.DataFrame()) == {"reports": 0}
@@ -0,0 +1,121 @@
+import pytest
+
+from utils.score_extraction import extract_check_scores, extract_total_score
+
+CHECK_TEXT = "## Критерий 1\nВсе хорошо.\n\n## Итоговая оценка: 80/100"
+
+
+def make_block(content):
+    return f"```json\n{content}\n```"
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("**Итоговая оценка**: 78/100", 78),
+        ("Итоговая оценка: **64**", 64),
+        ("Итоговая оценка = **72**", 72),
+        ("Итоговая оценка — 85 баллов из 100", 85),
+        ("**Итоговая оценка**:\n$$\n= \\frac{85+90+70}{3} \\approx 81.67\n$$", 81.67),
+        (
+            "Итоговая оценка:\n$$\nS = 0.2 \\cdot 50 + 0.1 \\cdot 50 = 15\n$$\n"
+            "$$\nИтог = 15 + 60 = 75\n$$",
+            75,
+        ),
+        ("## Итоговая оценка\n\n$$ 0.5 \\cdot 80 + 0.5 \\cdot 90 = \\mathbf{85} $$", 85),
+        ("Итоговый балл = 0.4 \\cdot 80 + 0.6 \\cdot 70 = 74 баллов", 74),
+    ],
+)
+def test_extract_total_score(text, expected):
+    assert extract_total_score(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        None,
+        "",
+        "Итоговый вывод: отчет хороший по 3 пунктам",
+        "Итоговая оценка: 70 или 80",
+        "Итоговая оценка $$= 50 + 30 = 80 \\cdot 0.9$$",
+        "Итоговая оценка: 150",
+    ],
+)
+def test_extract_total_score_ambiguous(text):
+    assert extract_total_score(text) is None
+
+
+def test_structured_scores():
+    block = make_block(
+        '{"criteria": [{"name": " Анализ ", "score": 40, "max_score": 50}], '
+        '"total_score": 82.5}'
+    )
+    text, scores = extract_check_scores(f"{CHECK_TEXT}\n\n{block}")
+
+    assert text == CHECK_TEXT + "\n"
+    assert scores == {
+        "total_score": 82.5,
+        "criteria": [{"name": "Анализ", "score": 40.0, "max_score": 50.0}],
+        "source": "structured",
+    }
+
+
+def test_block_is_stripped_from_middle_of_text():
+    block = make_block('{"total_score": 90, "criteria": []}')
+    text, scores = extract_check_scores(f"Начало\n\n{block}\n\nЗаключение")
+
+    assert text == "Начало\n\nЗаключение\n"
+    assert scores["total_score"] == 90
+    assert scores["source"] == "structured"
+
+
+def test_last_block_with_total_score_is_used():
+    first = make_block('{"total_score": 10}')
+    other = make_block('{"example": 1}')
+    last = make_block('{"total_score": 70}')
+    text, scores = extract_check_scores(f"А\n\n{first}\n\nБ\n\n{last}\n\n{other}")
+
+    assert scores["total_score"] == 70
+    assert first in text and other in text and last not in text
+
+
+def test_block_without_language_tag():
+    text, scores = extract_check_scores('Текст\n\n```\n{"total_score": 55}\n```')
+
+    assert text == "Текст\n"
+    assert scores["total_score"] == 55
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"total_score": 120}',
+        '{"total_score": -5}',
+        '{"total_score": true}',
+        '{"total_score": "80"}',
+        '{"total_score": 80,}',
+    ],
+)
+def test_invalid_total_falls_back_to_text(content):
+    text, scores = extract_check_scores(f"{CHECK_TEXT}\n\n{make_block(content)}")
+
+    assert text == CHECK_TEXT + "\n"
+    assert scores == {"total_score": 80.0, "criteria": [], "source": "text"}
+
+
+def test_invalid_criteria_are_skipped():
+    block = make_block(
+        '{"total_score": 60, "criteria": ['
+        '{"name": "A", "score": false}, {"name": "B", "score": "5"}, '
+        '{"score": 5}, "C", {"name": "D", "score": 5, "max_score": true}]}'
+    )
+    _, scores = extract_check_scores(block)
+
+    assert scores["criteria"] == [{"name": "D", "score": 5.0, "max_score": None}]
+
+
+def test_no_scores():
+    text, scores = extract_check_scores("Оценка не указана")
+
+    assert text == "Оценка не указана"
+    assert scores == {"total_score": None, "criteria": [], "source": None}
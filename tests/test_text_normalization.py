@@ -0,0 +1,95 @@
+from utils.text_normalization import PAGE_BREAK, normalize_document, normalize_text
+
+TOC = (
+    "Содержание\n"
+    "Введение ........................ 3\n"
+    "1. Анализ рынка ................. 5\n"
+    "2. Цели проекта ................. 8\n"
+    "Заключение ...................... 12"
+)
+
+
+def make_pages(bodies, header="Отчет по проекту «Альфа»", numbered=True):
+    pages = []
+    for number, body in enumerate(bodies, start=1):
+        footer = f"\n{number}" if numbered else ""
+        pages.append(f"{header}\n{body}{footer}")
+    return PAGE_BREAK.join(pages)
+
+
+def test_soft_hyphen_joins_word():
+    assert normalize_text("разра­\nботка проекта") == "разработка проекта"
+
+
+def test_line_end_hyphen_is_kept():
+    assert normalize_text("Северо-\nзападный округ") == "Северо-западный округ"
+    assert normalize_text("что-\nто важное") == "что-то важное"
+
+
+def test_toc_block_is_removed():
+    text = normalize_text(f"Титульный лист\n\n{TOC}\n\nВведение\nТекст отчета")
+
+    assert "......" not in text
+    assert "Содержание" in text
+    assert text.endswith("Введение\nТекст отчета")
+
+
+def test_toc_like_line_in_body_is_kept():
+    body = "Смета проекта\nМатериалы ........ 10\nИтого ........ 15\nТекст"
+
+    assert normalize_text(body) == body
+
+
+def test_headers_and_page_numbers_at_page_edges():
+    text = normalize_text(
+        make_pages(["Первая страница", "Вторая страница", "Третья страница"])
+    )
+
+    assert text == (
+        "Отчет по проекту «Альфа»\n"
+        "Первая страница\nВторая страница\nТретья страница"
+    )
+
+
+def test_header_with_page_number_is_removed():
+    pages = [
+        f"Отчет по проекту, стр. {number}\nВведение\nТекст страницы {number}\n"
+        "Раздел\nКонец"
+        for number in range(1, 4)
+    ]
+    text = normalize_text(PAGE_BREAK.join(pages))
+
+    assert text.count("Отчет по проекту") == 1
+    assert "Текст страницы 3" in text
+
+
+def test_numbered_edge_lines_are_kept():
+    pages = [
+        f"Этап {number} проекта\nОписание этапа {number}\nКонец страницы"
+        for number in range(1, 4)
+    ]
+    text = normalize_text(PAGE_BREAK.join(pages))
+
+    assert "Этап 1 проекта" in text
+    assert "Этап 2 проекта" in text
+    assert "Этап 3 проекта" in text
+
+
+def test_repeated_lines_in_page_body_are_kept():
+    body = "Заголовок\nВведение\nДа\nДа\nРаздел\nИтог"
+
+    assert normalize_text(PAGE_BREAK.join([body] * 3)).count("Да") == 6
+
+
+def test_table_numbers_are_kept():
+    body = "Показатель\n42\n17\nКонец"
+
+    assert normalize_text(PAGE_BREAK.join([body] * 3)).count("42") == 3
+
+
+def test_normalize_document_disabled():
+    text, stats = normalize_document(f"А{PAGE_BREAK}Б", enabled=False)
+
+    assert text == "А\nБ"
+    assert stats["normalized"] is False
+    assert stats["tokens_saved"] == 0
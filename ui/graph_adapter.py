@@ -0,0 +1,126 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import streamlit as st
+
+from graph.graph_config import build_graph_config
+from llm.scheduler import INTERACTIVE
+from ui.ui_components import create_results_section
+from utils.prompt_manager import prompt_manager
+
+# Московское время (UTC+3) для отображения времени начала проверки
+MOSCOW_TIMEZONE = timezone(timedelta(hours=3))
+
+# Сообщения о ходе выполнения этапов проверки
+NODE_SPINNER_MESSAGES = {
+    "criteria_forming": "Адаптация критериев под проект...",
+    "report_check": "Проверка отчета...",
+    "feedback_forming": "Формирование обратной связи для студента...",
+}
+
+
+class StreamlitProgress:
+    """
+    Отображает ход выполнения этапов графа проверки в виде спиннеров Streamlit.
+
+    Методы передаются в граф как обработчики on_node_start и on_node_end
+    и должны вызываться в потоке сценария Streamlit.
+    """
+
+    def __init__(self):
+        self._spinners = {}
+
+    def on_node_start(self, node):
+        """Показывает спиннер этапа проверки."""
+        spinner = st.spinner(NODE_SPINNER_MESSAGES[node])
+        spinner.__enter__()
+        self._spinners[node] = spinner
+
+    def on_node_end(self, node):
+        """Скрывает спиннер этапа проверки."""
+        spinner = self._spinners.pop(node, None)
+        if spinner is not None:
+            spinner.__exit__(None, None, None)
+
+
+class StreamlitQueueStatus:
+    """
+    Отображает позицию проверки в очереди и ожидаемое время ее запуска.
+
+    Метод on_wait передается в admission_controller.admit.
+    """
+
+    def __init__(self):
+        self._placeholder = st.empty()
+
+    def on_wait(self, position, eta):
+        """Обновляет сообщение о позиции в очереди."""
+        # Устанавливаем Московское время
+        start_at = datetime.fromtimestamp(time.time() + eta, MOSCOW_TIMEZONE)
+        self._placeholder.info(
+            f"Проверка в очереди: позиция {position}. "
+            f"Ожидаемое время начала: {start_at.strftime('%H:%M')} "
+            f"(примерно через {max(1, round(eta / 60))} мин.)",
+            icon="⏳",
+        )
+
+    def clear(self):
+        """Скрывает сообщение о позиции в очереди."""
+        self._placeholder.empty()
+
+
+class StreamlitResultsStream:
+    """
+    Отображает результаты проверки по мере завершения этапов графа.
+
+    Метод update вызывается для каждого обновления состояния из
+    graph.stream(..., stream_mode="updates"): адаптированные критерии
+    показываются сразу после этапа "Аналитик", результаты проверки -
+    после этапа "Проверяющий", пока формируется обратная связь.
+    """
+
+    def __init__(self):
+        self._placeholder = st.empty()
+        self._results = {}
+
+    def update(self, values):
+        """Добавляет результаты завершившегося этапа и перерисовывает секцию."""
+        values = values or {}
+        results = {
+            field: values[field]
+            for field in ("structured_criteria", "check_results", "feedback")
+            if values.get(field) is not None
+        }
+        if not results:
+            return
+        self._results.update(results)
+        with self._placeholder.container():
+            create_results_section(
+                self._results.get("structured_criteria"),
+                self._results.get("check_results"),
+                self._results.get("feedback"),
+            )
+
+    def clear(self):
+        """Скрывает промежуточные результаты после завершения проверки."""
+        self._placeholder.empty()
+
+
+def build_streamlit_graph_config():
+    """
+    Формирует конфигурацию запуска графа на основе настроек из session_state.
+
+    Returns:
+        dict: Конфигурация для graph.invoke
+    """
+    progress = StreamlitProgress()
+    return build_graph_config(
+        get_prompt=prompt_manager.get_prompt,
+        model_name=st.session_state.get("llm_choice", "DeepSeek Chat"),
+        node_models=st.session_state.get("node_llm_choices", {}),
+        use_cache=st.session_state.get("use_llm_cache", True),
+        on_node_start=progress.on_node_start,
+        on_node_end=progress.on_node_end,
+        priority=INTERACTIVE,
+        tenant=st.session_state.get("session_id", "web"),
+    )
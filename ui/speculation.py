@@ -0,0 +1,238 @@
+import hashlib
+import logging
+
+import streamlit as st
+
+from graph.graph_config import NODE_PROMPTS, build_graph_config
+from graph.graph_functions import criteria_forming
+from llm.response_cache import response_cache
+from llm.scheduler import BATCH
+from utils.file_utils import extract_text_from_bytes
+from utils.ocr import ocr_processor
+from utils.prompt_manager import prompt_manager
+from utils.speculation import make_speculation_key, speculative_executor
+from utils.text_normalization import normalize_document
+
+
+def extract_document(data, file_name, normalize, ocr_cache_writes=None):
+    """
+    Извлекает и нормализует текст загруженного файла.
+
+    Returns:
+        tuple: Текст и статистика нормализации
+    """
+    return normalize_document(
+        extract_text_from_bytes(data, file_name, ocr_cache_writes), enabled=normalize
+    )
+
+
+def extract_document_in_memory(file, normalize):
+    """
+    Извлекает текст файла заранее, не сохраняя распознанные страницы на диск.
+
+    Содержимое файла читается в фоновом потоке, а не при запуске задачи.
+
+    Returns:
+        tuple: Результат extract_document и отложенные записи в кэш OCR
+    """
+    cache_writes = []
+    result = extract_document(file.getvalue(), file.name, normalize, cache_writes)
+    return result, cache_writes
+
+
+def get_file_digest(file, digests):
+    """
+    Возвращает хэш содержимого загруженного файла.
+
+    Хэш вычисляется один раз для каждого загруженного файла и хранится
+    в состоянии сессии по идентификатору и размеру файла, поэтому при
+    повторных запусках сценария Streamlit файл заново не читается.
+
+    Args:
+        file (UploadedFile): Загруженный файл
+        digests (dict): Вычисленные ранее хэши по (file_id, size)
+
+    Returns:
+        str: SHA-256 хэш содержимого файла
+    """
+    file_key = (file.file_id, file.size)
+    if file_key not in digests:
+        digests[file_key] = hashlib.sha256(file.getbuffer()).hexdigest()
+    return digests[file_key]
+
+
+def adapt_criteria(passport_future, criteria_future, default_criteria, config):
+    """
+    Адаптирует критерии под паспорт проекта после извлечения их текста.
+
+    Ответ модели не сохраняется в кэш ответов LLM: запись откладывается
+    до использования результата в проверке.
+
+    Returns:
+        tuple: Результат этапа адаптации критериев с его метриками
+               и отложенные записи в кэш ответов LLM
+    """
+    (passport, _), _ = passport_future.result()
+    criteria = (
+        criteria_future.result()[0][0] if criteria_future else default_criteria
+    )
+    cache_writes = []
+    config = {
+        **config,
+        "configurable": {**config["configurable"], "cache_writes": cache_writes},
+    }
+    result = criteria_forming({"passport": passport, "criteria": criteria}, config)
+    return result, cache_writes
+
+
+def save_deferred_writes(slot, cache_writes):
+    """
+    Сохраняет в кэши данные заблаговременной задачи после ее использования.
+
+    Args:
+        slot (str): Вид задачи: passport, report, criteria или criteria_forming
+        cache_writes (list): Отложенные записи в кэш
+    """
+    if slot != "criteria_forming":
+        ocr_processor.save_pages(cache_writes)
+    elif st.session_state.get("use_llm_cache", True):
+        for key, value in cache_writes:
+            response_cache.set(key, value)
+
+
+def start_speculative_work(
+    passport_file, report_file, criteria_file, default_criteria, normalize
+):
+    """
+    Запускает извлечение текста и адаптацию критериев, не дожидаясь
+    нажатия кнопки проверки.
+
+    Задачи запускаются по ключу содержимого файлов и настроек, поэтому
+    при повторных запусках сценария Streamlit они не дублируются, а хэши
+    содержимого файлов вычисляются один раз (см. get_file_digest). Задачи
+    для замененных файлов или измененных настроек отменяются. До нажатия
+    кнопки проверки результаты хранятся только в памяти: кэш ответов LLM
+    и кэш распознанных страниц не используются, записи в них сохраняются
+    при использовании результата (см. take_speculative_result).
+
+    Args:
+        passport_file (UploadedFile): Паспорт проекта или None
+        report_file (UploadedFile): Отчет по проекту или None
+        criteria_file (UploadedFile): Файл с критериями или None
+        default_criteria (str): Критерии по умолчанию
+        normalize (bool): Нормализовать ли текст паспорта и отчета
+    """
+    # Результаты, уже использованные в проверке, заново не вычисляются
+    taken = st.session_state.setdefault("speculation_taken", set())
+    files = {"passport": passport_file, "report": report_file, "criteria": criteria_file}
+    files = {slot: file for slot, file in files.items() if file}
+    normalize_slots = {"passport": normalize, "report": normalize, "criteria": False}
+    previous_digests = st.session_state.get("speculation_digests", {})
+    digests = {
+        (file.file_id, file.size): previous_digests[(file.file_id, file.size)]
+        for file in files.values()
+        if (file.file_id, file.size) in previous_digests
+    }
+    keys = {
+        slot: make_speculation_key(
+            "extraction",
+            get_file_digest(file, digests),
+            file.name,
+            normalize_slots[slot],
+        )
+        for slot, file in files.items()
+    }
+    st.session_state["speculation_digests"] = digests
+
+    config = None
+    if passport_file:
+        node_models = st.session_state.get("node_llm_choices", {})
+        config = build_graph_config(
+            get_prompt=prompt_manager.get_prompt,
+            model_name=st.session_state.get("llm_choice", "DeepSeek Chat"),
+            node_models=node_models,
+            use_cache=False,
+            priority=BATCH,
+            tenant=st.session_state.get("session_id", "web"),
+        )
+        keys["criteria_forming"] = make_speculation_key(
+            "criteria",
+            keys["passport"],
+            keys.get("criteria") or default_criteria,
+            config["configurable"]["model_name"],
+            node_models.get("criteria_forming"),
+            st.session_state.get("use_llm_cache", True),
+            prompt_manager.get_prompt(NODE_PROMPTS["criteria_forming"]),
+        )
+    adapt_criteria_needed = config is not None and keys["criteria_forming"] not in taken
+
+    futures = {}
+    for slot, file in files.items():
+        if keys[slot] not in taken or (
+            adapt_criteria_needed and slot in ("passport", "criteria")
+        ):
+            futures[slot] = speculative_executor.submit(
+                keys[slot], extract_document_in_memory, file, normalize_slots[slot]
+            )
+
+    if adapt_criteria_needed:
+        speculative_executor.submit(
+            keys["criteria_forming"],
+            adapt_criteria,
+            futures["passport"],
+            futures.get("criteria"),
+            default_criteria,
+            config,
+        )
+
+    for slot, key in st.session_state.get("speculation", {}).items():
+        if keys.get(slot) != key:
+            speculative_executor.discard(key)
+    st.session_state["speculation"] = keys
+
+
+def take_speculative_result(slot):
+    """
+    Забирает результат спекулятивной задачи для текущих файлов и настроек.
+
+    Args:
+        slot (str): Вид задачи: passport, report, criteria или criteria_forming
+
+    Returns:
+        Результат задачи или None, если задача не запускалась
+        или завершилась с ошибкой
+    """
+    key = st.session_state.get("speculation", {}).get(slot)
+    future = speculative_executor.take(key)
+    if future is None:
+        return None
+    st.session_state.setdefault("speculation_taken", set()).add(key)
+    try:
+        result, cache_writes = future.result()
+    except Exception as e:
+        logging.warning(f"Результат заблаговременной задачи {slot} не получен: {e}")
+        return None
+    save_deferred_writes(slot, cache_writes)
+    return result
+
+
+def get_document(slot, file, normalize):
+    """
+    Возвращает текст файла, извлеченный заранее, или извлекает его сейчас.
+
+    Args:
+        slot (str): Вид файла: passport, report или criteria
+        file (UploadedFile): Загруженный файл или None
+        normalize (bool): Нормализовать ли текст
+
+    Returns:
+        tuple: Текст и статистика нормализации
+    """
+    result = take_speculative_result(slot)
+    if result is None:
+        result = (
+            extract_document(file.getbuffer(), file.name, normalize)
+            if file
+            else normalize_document("", enabled=normalize)
+        )
+    return result
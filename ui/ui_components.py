@@ -1,5 +1,88 @@
+import logging
+import os
+import statistics
+import time
+
 import streamlit as st
 
+from llm.circuit_breaker import circuit_breakers
+from llm.model_stats import AUTO_MODEL
+from utils.artifact_store import artifact_store
+from utils.prompt_manager import get_prompt_version
+
+
+# Количество последних перезапусков сценария для расчета медианы
+RERUN_TIMINGS_WINDOW = 20
+
+
+@st.cache_data(show_spinner=False)
+def _read_text_cached(path, mtime):
+    """Читает текстовый файл; mtime входит в ключ кэша."""
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def read_static_text(path):
+    """
+    Читает неизменяемый при работе приложения текстовый файл
+    (критерии по умолчанию, README).
+
+    Содержимое кэшируется между перезапусками сценария Streamlit
+    и перечитывается с диска только после изменения файла.
+
+    Args:
+        path (str): Путь к файлу
+
+    Returns:
+        str: Содержимое файла
+    """
+    return _read_text_cached(path, os.path.getmtime(path))
+
+
+@st.cache_data(show_spinner=False)
+def _read_about_section_cached(path, mtime):
+    """Выделяет раздел о проекте из README; mtime входит в ключ кэша."""
+    return _read_text_cached(path, mtime).split("\n\n\n")[1]
+
+
+def read_about_section(path="README.md"):
+    """
+    Возвращает раздел README для вкладки "О проекте".
+
+    Args:
+        path (str): Путь к README
+
+    Returns:
+        str: Текст раздела в формате Markdown
+    """
+    return _read_about_section_cached(path, os.path.getmtime(path))
+
+
+def show_rerun_timing(start_time):
+    """
+    Сохраняет длительность перезапуска сценария Streamlit и, если задана
+    переменная окружения SHOW_RERUN_TIMING, выводит ее на странице
+    вместе с объемом данных сессии.
+
+    Args:
+        start_time (float): Время начала перезапуска (time.perf_counter())
+    """
+    duration_ms = (time.perf_counter() - start_time) * 1000
+    timings = st.session_state.setdefault("rerun_timings", [])
+    timings.append(duration_ms)
+    del timings[:-RERUN_TIMINGS_WINDOW]
+    usage = artifact_store.get_session_usage(st.session_state.session_id)
+    logging.debug(
+        f"Перезапуск сценария: {duration_ms:.1f} мс, данные сессии: {usage}"
+    )
+    if os.getenv("SHOW_RERUN_TIMING", "false").lower() in ("true", "1", "yes"):
+        st.caption(
+            f"⏱️ Перезапуск сценария: {duration_ms:.1f} мс "
+            f"(медиана последних {len(timings)}: {statistics.median(timings):.1f} мс). "
+            f"Данные сессии: {usage['memory_bytes'] / 1024:.0f} КБ в памяти, "
+            f"{usage['disk_bytes'] / 1024:.0f} КБ на диске"
+        )
+
 
 def get_file_uploader(label, file_types):
     """
@@ -38,33 +121,104 @@ def check_file_uploads(passport, criteria):
         st.warning(f"Предупреждение: {', '.join(warnings)}.")
 
 
+def format_llm_option(model_name):
+    """
+    Формирует подпись модели в выпадающем списке с учетом
+    состояния ее предохранителя.
+
+    Args:
+        model_name (str): Название модели
+
+    Returns:
+        str: Подпись модели; недоступные модели помечаются
+    """
+    if model_name == AUTO_MODEL:
+        return "⚡ Auto (самая быстрая из доступных)"
+    if circuit_breakers.is_available(model_name):
+        return model_name
+    return f"⛔ {model_name} (временно недоступна)"
+
+
+# Модели, доступные для выбора в интерфейсе
+LLM_OPTIONS = [
+    # "GigaChat (Lite)",
+    "DeepSeek Chat",
+    "DeepSeek R1",
+    "YandexGPT Pro",
+    "YandexGPT Lite",
+    # "Gemini 2.0 Pro",
+    # "Gemini 2.5 Pro",
+    # "Gemma 3 27B",
+    "Gemini 2.0 Flash",
+    # "Llama 3.3 70B Instruct",
+    "Qwen 32B",
+    "Qwen 2.5 72B",
+    # "Mistral Small 24B",
+    AUTO_MODEL,
+]
+
+# Этапы проверки, для которых можно выбрать отдельную модель
+NODE_TITLES = {
+    "criteria_forming": "Адаптация критериев",
+    "report_check": "Проверка отчета",
+    "feedback_forming": "Формирование обратной связи",
+}
+
+# Вариант выбора, при котором этап использует основную модель
+SAME_AS_MAIN_LLM = "Как основная модель"
+
+
 def select_llm():
     """
     Создает выпадающий список для выбора LLM модели из доступных
-    вариантов.
+    вариантов. Модели с открытым предохранителем помечаются как
+    временно недоступные. Вариант AUTO_MODEL выбирает для каждого
+    этапа проверки самую быструю доступную модель.
 
     Returns:
         str: Название выбранной пользователем LLM модели из списка
              доступных моделей.
     """
-    return st.selectbox(
-        "Выберите LLM:",
-        [
-            # "GigaChat (Lite)",
-            "DeepSeek Chat",
-            "DeepSeek R1",
-            "YandexGPT Pro",
-            "YandexGPT Lite",
-            # "Gemini 2.0 Pro",
-            # "Gemini 2.5 Pro",
-            # "Gemma 3 27B",
-            "Gemini 2.0 Flash",
-            # "Llama 3.3 70B Instruct",
-            "Qwen 32B",
-            "Qwen 2.5 72B",
-            # "Mistral Small 24B",
-        ],
+    llm_choice = st.selectbox(
+        "Выберите LLM:", LLM_OPTIONS, format_func=format_llm_option
     )
+    if not circuit_breakers.is_available(llm_choice):
+        breaker = circuit_breakers.get(llm_choice)
+        st.warning(
+            f"⚠️ Модель {llm_choice} сейчас не отвечает. Повторная попытка станет "
+            f"возможна через {breaker.seconds_until_retry():.0f} с, "
+            "пока рекомендуем выбрать другую модель."
+        )
+    return llm_choice
+
+
+def select_node_llms():
+    """
+    Создает секцию выбора отдельных LLM моделей для этапов проверки.
+
+    Returns:
+        dict: Словарь, где ключ - название этапа, значение - выбранная
+              модель. Этапы, использующие основную модель, не включаются.
+    """
+    node_llm_choices = {}
+    with st.expander("Модели для отдельных этапов проверки", icon="🧩"):
+        st.caption(
+            "Для простых этапов, например формирования обратной связи, "
+            "можно выбрать более быструю модель."
+        )
+        for node, title in NODE_TITLES.items():
+            choice = st.selectbox(
+                title,
+                [SAME_AS_MAIN_LLM, *LLM_OPTIONS],
+                format_func=lambda option: (
+                    option
+                    if option == SAME_AS_MAIN_LLM
+                    else format_llm_option(option)
+                ),
+            )
+            if choice != SAME_AS_MAIN_LLM:
+                node_llm_choices[node] = choice
+    return node_llm_choices
 
 
 def create_download_section(check_result, html_content, pdf_bytes, file_name_base):
@@ -166,29 +320,53 @@ def create_options_section():
         tuple:
             - skip_feedback (bool): Пропускать ли генерацию обратной связи для студента
             - llm_choice (str): Название выбранной LLM модели
+            - node_llm_choices (dict): Модели, выбранные для отдельных этапов
+            - use_llm_cache (bool): Использовать ли сохраненные ответы LLM
+            - normalize_text (bool): Очищать ли текст документов от колонтитулов,
+              номеров страниц и оглавления
     """
     skip_feedback = not st.toggle(
         "💬 Формировать обратную связь для студента", value=True
     )
+    use_llm_cache = st.toggle(
+        "♻️ Использовать сохраненные ответы для повторных проверок",
+        value=True,
+        help="При повторной проверке того же отчета с теми же критериями "
+        "и моделью результат будет взят из кэша без обращения к модели.",
+    )
+    normalize_text = st.toggle(
+        "🧹 Очищать текст документов перед проверкой",
+        value=True,
+        help="Из текста отчета и паспорта удаляются колонтитулы, номера страниц, "
+        "оглавление, переносы слов и лишние пробелы. Это сокращает объем "
+        "запроса к модели и ускоряет проверку.",
+    )
     llm_choice = select_llm()
-    return skip_feedback, llm_choice
+    node_llm_choices = select_node_llms()
+    return skip_feedback, llm_choice, node_llm_choices, use_llm_cache, normalize_text
 
 
 def create_results_section(check_criteria, check_result, feedback):
     """
     Создает секцию отображения результатов оценки проекта.
 
+    Части результатов, которые еще не сформированы (равны None),
+    не отображаются, поэтому секцию можно выводить по мере
+    завершения этапов проверки.
+
     Args:
-        check_criteria (str): Адаптированные критерии оценки в формате markdown
-        check_result (str): Результаты оценки в формате markdown
+        check_criteria (str): Адаптированные критерии оценки в формате markdown или None
+        check_result (str): Результаты оценки в формате markdown или None
         feedback (str): Обратная связь для студента в формате markdown или None
     """
     st.header("📊 Результаты проверки")
-    with st.expander("Адаптированные критерии проверки:", icon="📋"):
-        st.markdown(check_criteria)
+    if check_criteria is not None:
+        with st.expander("Адаптированные критерии проверки:", icon="📋"):
+            st.markdown(check_criteria)
 
-    with st.expander("Результаты проверки:", icon="📝"):
-        st.markdown(check_result)
+    if check_result is not None:
+        with st.expander("Результаты проверки:", icon="📝"):
+            st.markdown(check_result)
 
     if feedback:
         with st.expander("Обратная связь для студента:", icon="💬"):
@@ -210,3 +388,60 @@ def create_user_feedback_form():
         comment = st.text_area("Комментарий (необязательно):")
         sent_feedback = st.button("Отправить обратную связь")
         return mark, comment, sent_feedback
+
+
+def render_prompt_editor(prompt_manager):
+    """
+    Отображает интерфейс редактора промптов в Streamlit.
+
+    Позволяет пользователю:
+    - Выбрать промпт для редактирования
+    - Просмотреть/изменить содержимое промпта
+    - Сохранить изменения
+    - Сбросить отдельный промпт или все промпты
+
+    Args:
+        prompt_manager (PromptManager): Менеджер промптов
+    """
+    st.subheader("Управление промптами")
+
+    # Выбор промпта для редактирования
+    prompt_names = list(prompt_manager.prompts.keys())
+    selected_prompt = st.selectbox(
+        "Выберите промпт для просмотра/редактирования", prompt_names
+    )
+
+    if selected_prompt:
+        current_prompt = prompt_manager.get_prompt(selected_prompt)
+        is_modified = selected_prompt in prompt_manager.modified_prompts
+
+        # Показываем версию промпта и статус модификации
+        st.caption(f"Версия промпта: {get_prompt_version(current_prompt)}")
+        if is_modified:
+            st.warning("⚠️ Промпт был изменен")
+
+        # Поле для редактирования
+        new_prompt = st.text_area(
+            "Содержимое промпта", value=current_prompt, height=400
+        )
+
+        col1, col2, col3 = st.columns(3)
+
+        # Кнопка сохранения изменений
+        if col1.button("Сохранить изменения"):
+            if new_prompt != prompt_manager.prompts[selected_prompt]:
+                prompt_manager.modify_prompt(selected_prompt, new_prompt)
+                st.success("✅ Изменения сохранены")
+            else:
+                prompt_manager.reset_prompt(selected_prompt)
+                st.info("ℹ️ Промпт вернулся к оригинальной версии")
+
+        # Кнопка сброса текущего промпта
+        if is_modified and col2.button("Сбросить этот промпт"):
+            prompt_manager.reset_prompt(selected_prompt)
+            st.rerun()
+
+        # Кнопка сброса всех промптов
+        if prompt_manager.modified_prompts and col3.button("Сбросить все промпты"):
+            prompt_manager.reset_all_prompts()
+            st.rerun()
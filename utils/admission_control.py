@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+
+class AdmissionController:
+    """
+    Ограничение числа одновременных проверок в одном процессе.
+
+    Проверки сверх ограничения ожидают в очереди и запускаются в порядке
+    поступления. Ожидающим сообщается их позиция в очереди и оценка
+    времени до запуска по средней длительности проверки.
+
+    Attributes:
+        max_concurrent (int): Максимальное число одновременных проверок
+        alpha (float): Коэффициент сглаживания средней длительности проверки
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        alpha: float = 0.3,
+        initial_duration: float = 90.0,
+    ):
+        self.max_concurrent = max_concurrent
+        self.alpha = alpha
+        self.avg_duration = initial_duration
+        self._condition = threading.Condition()
+        self._queue = []
+        self._running: Dict[int, float] = {}
+        self._sequence = itertools.count()
+        self._admitted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _estimate_start(self, position: int) -> float:
+        """
+        Оценивает время до запуска проверки с заданной позицией в очереди.
+
+        Каждый слот освобождается через среднюю длительность проверки после
+        запуска выполняемой в нем проверки.
+        """
+        now = time.time()
+        slots = [
+            max(0.0, self.avg_duration - (now - started_at))
+            for started_at in self._running.values()
+        ]
+        slots += [0.0] * (self.max_concurrent - len(slots))
+        heapq.heapify(slots)
+        start = 0.0
+        for _ in range(position):
+            start = heapq.heappop(slots)
+            heapq.heappush(slots, start + self.avg_duration)
+        return start
+
+    @contextmanager
+    def admit(
+        self,
+        on_wait: Optional[Callable[[int, float], None]] = None,
+        poll_interval: float = 1.0,
+    ) -> Iterator[float]:
+        """
+        Ожидает разрешения на запуск проверки.
+
+        Args:
+            on_wait (Callable, optional): Вызывается во время ожидания с позицией
+                                          в очереди (начиная с 1) и оценкой
+                                          времени до запуска в секундах
+            poll_interval (float): Интервал обновления позиции в секундах
+
+        Yields:
+            float: Время ожидания в очереди в секундах
+        """
+        ticket = next(self._sequence)
+        start_time = time.time()
+        with self._condition:
+            self._queue.append(ticket)
+        try:
+            while True:
+                with self._condition:
+                    position = self._queue.index(ticket) + 1
+                    if position == 1 and len(self._running) < self.max_concurrent:
+                        self._queue.pop(0)
+                        self._running[ticket] = time.time()
+                        break
+                    eta = self._estimate_start(position)
+                if on_wait:
+                    on_wait(position, eta)
+                with self._condition:
+                    self._condition.wait(poll_interval)
+        except BaseException:
+            with self._condition:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    self._condition.notify_all()
+            raise
+
+        wait = time.time() - start_time
+        with self._condition:
+            self._admitted += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+
+        try:
+            yield wait
+        finally:
+            with self._condition:
+                duration = time.time() - self._running.pop(ticket)
+                self.avg_duration = (
+                    self.alpha * duration + (1 - self.alpha) * self.avg_duration
+                )
+                self._condition.notify_all()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Возвращает метрики очереди проверок.
+
+        Returns:
+            Dict[str, Any]: Число выполняющихся и ожидающих проверок, число
+                            запущенных проверок, среднее и максимальное время
+                            ожидания и средняя длительность проверки
+        """
+        with self._condition:
+            return {
+                "running": len(self._running),
+                "queue_depth": len(self._queue),
+                "admitted": self._admitted,
+                "avg_wait": self._total_wait / self._admitted if self._admitted else 0.0,
+                "max_wait": self._max_wait,
+                "avg_duration": self.avg_duration,
+            }
+
+
+# Global instance
+admission_controller = AdmissionController(
+    max_concurrent=int(os.getenv("MAX_CONCURRENT_CHECKS", "4"))
+)
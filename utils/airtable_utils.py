@@ -1,8 +1,15 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 import streamlit as st
-from pyairtable import Api
+
+from utils.shared_store import shared_store
+
+# Пространство имен идентификаторов записей Airtable в общем хранилище
+RECORDS_NAMESPACE = "airtable_records"
+
+# Время хранения идентификатора записи для обновления обратной связи (30 дней)
+RECORD_ID_TTL = 30 * 24 * 3600
 
 
 class AirtableHandler:
@@ -10,16 +17,41 @@ class AirtableHandler:
     Класс для работы с Airtable.
     """
 
-    def __init__(self):
+    def __init__(self, record_key: Optional[str] = None):
         """
         Инициализирует подключение к Airtable, используя секреты Streamlit.
+
+        Args:
+            record_key: Ключ проверки (например, имя папки с результатами в S3),
+                        по которому идентификатор созданной записи сохраняется
+                        в общем хранилище. Запись можно обновить из любого
+                        экземпляра приложения.
         """
+        # pyairtable нужен только для сохранения результатов после проверки
+        from pyairtable import Api
+
         self.api_key = st.secrets["AIRTABLE_API_KEY"]
         self.base_id = st.secrets["AIRTABLE_BASE_ID"]
         self.table_name = st.secrets["AIRTABLE_TABLE_NAME"]
         self.api = Api(self.api_key)
         self.table = self.api.table(self.base_id, self.table_name)
-        self.record_id = None
+        self.record_key = record_key
+        self._record_id = None
+
+    @property
+    def record_id(self) -> Optional[str]:
+        """Идентификатор созданной записи."""
+        if self._record_id is None and self.record_key:
+            self._record_id = shared_store.get(RECORDS_NAMESPACE, self.record_key)
+        return self._record_id
+
+    @record_id.setter
+    def record_id(self, record_id: Optional[str]) -> None:
+        self._record_id = record_id
+        if self.record_key:
+            shared_store.set(
+                RECORDS_NAMESPACE, self.record_key, record_id, ttl=RECORD_ID_TTL
+            )
 
     def save_to_airtable(self, results_json: Dict[str, Any]) -> None:
         """
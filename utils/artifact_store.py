@@ -0,0 +1,277 @@
+import atexit
+import hashlib
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Union
+
+
+def _is_process_alive(pid: int) -> bool:
+    """Проверяет, работает ли процесс с указанным pid."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+class ArtifactStore:
+    """
+    Хранилище крупных данных сессий веб-приложения.
+
+    В session_state Streamlit хранятся только небольшие дескрипторы,
+    а сами данные (тексты документов, загруженные файлы, результаты
+    проверки, HTML и PDF) - в этом хранилище. Небольшие данные хранятся
+    в памяти процесса, крупные - в файлах на диске. Общий объем данных
+    на диске ограничен: при его превышении удаляются данные давно
+    неактивных сессий. Данные сессий, к которым не обращались дольше
+    времени жизни, удаляются полностью.
+
+    Каждый процесс хранит файлы в своей поддиректории <хост>_<pid>,
+    поэтому несколько экземпляров приложения с общей директорией
+    не удаляют данные сессий друг друга.
+
+    Attributes:
+        root (str): Общая директория для хранения крупных данных
+        path (str): Директория крупных данных текущего процесса
+        max_disk_bytes (int): Максимальный объем данных на диске
+        inline_limit (int): Максимальный размер данных, хранимых в памяти
+        ttl (float): Время жизни данных неактивной сессии в секундах
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_disk_bytes: int = 1024**3,
+        inline_limit: int = 16 * 1024,
+        ttl: float = 3 * 3600,
+    ):
+        self.root = path
+        self.path = os.path.join(path, f"{socket.gethostname()}_{os.getpid()}")
+        self.max_disk_bytes = max_disk_bytes
+        self.inline_limit = inline_limit
+        self.ttl = ttl
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # Индекс хранится только в памяти, поэтому файлы, оставшиеся
+        # от предыдущего процесса с тем же pid и от завершившихся
+        # процессов на этом хосте, уже не нужны
+        shutil.rmtree(self.path, ignore_errors=True)
+        self._remove_stale_dirs()
+        atexit.register(shutil.rmtree, self.path, ignore_errors=True)
+
+    def _remove_stale_dirs(self) -> None:
+        """Удаляет директории завершившихся процессов на этом хосте."""
+        prefix = f"{socket.gethostname()}_"
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return
+        for name in names:
+            pid = name[len(prefix) :] if name.startswith(prefix) else ""
+            if pid.isdigit() and not _is_process_alive(int(pid)):
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    def _file_path(self, session_id: str, name: str) -> str:
+        """Путь к файлу с данными на диске."""
+        return os.path.join(
+            self.path,
+            hashlib.sha256(session_id.encode("utf-8")).hexdigest()[:32],
+            hashlib.sha256(name.encode("utf-8")).hexdigest()[:32],
+        )
+
+    def _remove_entry(self, session_id: str, name: str) -> None:
+        """Удаляет данные из хранилища."""
+        entry = self._sessions[session_id]["entries"].pop(name, None)
+        if entry is not None and entry["on_disk"]:
+            try:
+                os.remove(self._file_path(session_id, name))
+            except OSError as e:
+                logging.warning(f"Не удалось удалить файл данных сессии: {e}")
+
+    def _remove_session(self, session_id: str) -> None:
+        """Удаляет все данные сессии."""
+        for name in list(self._sessions[session_id]["entries"]):
+            self._remove_entry(session_id, name)
+        del self._sessions[session_id]
+        shutil.rmtree(
+            os.path.dirname(self._file_path(session_id, "")), ignore_errors=True
+        )
+
+    def _disk_bytes(self) -> int:
+        """Объем данных всех сессий на диске."""
+        return sum(
+            entry["size"]
+            for session in self._sessions.values()
+            for entry in session["entries"].values()
+            if entry["on_disk"]
+        )
+
+    def _evict(self, current_session_id: str) -> None:
+        """Удаляет устаревшие сессии и давно неактивные сессии сверх лимита."""
+        now = time.time()
+        for session_id in [
+            session_id
+            for session_id, session in self._sessions.items()
+            if now - session["accessed_at"] > self.ttl
+            and session_id != current_session_id
+        ]:
+            logging.info(f"Удаление данных неактивной сессии {session_id}")
+            self._remove_session(session_id)
+
+        by_access = sorted(
+            (
+                session_id
+                for session_id in self._sessions
+                if session_id != current_session_id
+            ),
+            key=lambda session_id: self._sessions[session_id]["accessed_at"],
+        )
+        for session_id in by_access:
+            if self._disk_bytes() <= self.max_disk_bytes:
+                break
+            logging.warning(
+                f"Превышен объем хранилища данных сессий, "
+                f"удаление данных сессии {session_id}"
+            )
+            self._remove_session(session_id)
+
+    def put(
+        self, session_id: str, name: str, data: Union[str, bytes]
+    ) -> Dict[str, Any]:
+        """
+        Сохраняет данные сессии, заменяя ранее сохраненные с тем же именем.
+
+        Args:
+            session_id (str): Идентификатор сессии
+            name (str): Имя данных в пределах сессии
+            data (Union[str, bytes]): Данные
+
+        Returns:
+            Dict[str, Any]: Дескриптор для хранения в session_state
+        """
+        is_text = isinstance(data, str)
+        content = data.encode("utf-8") if is_text else bytes(data)
+        on_disk = len(content) > self.inline_limit
+
+        with self._lock:
+            session = self._sessions.setdefault(
+                session_id, {"entries": {}, "accessed_at": time.time()}
+            )
+            session["accessed_at"] = time.time()
+            self._remove_entry(session_id, name)
+
+            entry = {"size": len(content), "text": is_text, "on_disk": on_disk}
+            if on_disk:
+                file_path = self._file_path(session_id, name)
+                os.makedirs(os.path.dirname(file_path), exist_ok=True)
+                with open(file_path, "wb") as f:
+                    f.write(content)
+            else:
+                entry["content"] = content
+            session["entries"][name] = entry
+            self._evict(session_id)
+
+        return {"session_id": session_id, "name": name, "size": len(content)}
+
+    def get(self, handle: Optional[Dict[str, Any]]) -> Optional[Union[str, bytes]]:
+        """
+        Возвращает данные по дескриптору.
+
+        Args:
+            handle (Dict[str, Any], optional): Дескриптор, полученный от put
+
+        Returns:
+            Optional[Union[str, bytes]]: Данные или None, если дескриптор
+                                         не задан или данные уже удалены
+        """
+        if not handle:
+            return None
+        with self._lock:
+            session = self._sessions.get(handle["session_id"])
+            entry = session["entries"].get(handle["name"]) if session else None
+            if entry is None:
+                return None
+            session["accessed_at"] = time.time()
+            if entry["on_disk"]:
+                try:
+                    with open(
+                        self._file_path(handle["session_id"], handle["name"]), "rb"
+                    ) as f:
+                        content = f.read()
+                except OSError as e:
+                    logging.error(f"Не удалось прочитать данные сессии: {e}")
+                    return None
+            else:
+                content = entry["content"]
+        return content.decode("utf-8") if entry["text"] else content
+
+    def clear_session(self, session_id: str) -> None:
+        """
+        Удаляет все данные сессии (например, перед новой проверкой).
+
+        Args:
+            session_id (str): Идентификатор сессии
+        """
+        with self._lock:
+            if session_id in self._sessions:
+                self._remove_session(session_id)
+
+    def get_session_usage(self, session_id: str) -> Dict[str, int]:
+        """
+        Возвращает объем данных сессии.
+
+        Args:
+            session_id (str): Идентификатор сессии
+
+        Returns:
+            Dict[str, int]: Количество сохраненных данных и их объем
+                            в памяти и на диске в байтах
+        """
+        with self._lock:
+            entries = self._sessions.get(session_id, {"entries": {}})["entries"]
+            return {
+                "artifacts": len(entries),
+                "memory_bytes": sum(
+                    entry["size"] for entry in entries.values() if not entry["on_disk"]
+                ),
+                "disk_bytes": sum(
+                    entry["size"] for entry in entries.values() if entry["on_disk"]
+                ),
+            }
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+        Возвращает объем данных всех сессий.
+
+        Returns:
+            Dict[str, int]: Количество сессий и объем данных в памяти
+                            и на диске в байтах
+        """
+        with self._lock:
+            entries = [
+                entry
+                for session in self._sessions.values()
+                for entry in session["entries"].values()
+            ]
+            return {
+                "sessions": len(self._sessions),
+                "memory_bytes": sum(
+                    entry["size"] for entry in entries if not entry["on_disk"]
+                ),
+                "disk_bytes": sum(entry["size"] for entry in entries if entry["on_disk"]),
+            }
+
+
+# Global instance
+artifact_store = ArtifactStore(
+    os.getenv("ARTIFACT_STORE_PATH", ".cache/artifacts"),
+    max_disk_bytes=int(os.getenv("ARTIFACT_STORE_MAX_MB", "1024")) * 1024**2,
+    inline_limit=int(os.getenv("ARTIFACT_STORE_INLINE_KB", "16")) * 1024,
+    ttl=float(os.getenv("ARTIFACT_STORE_TTL", str(3 * 3600))),
+)
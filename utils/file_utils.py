@@ -1,44 +1,8 @@
-import os
-import uuid
-from io import BytesIO
-
-import markdown2
-from fpdf import FPDF
-
 import logging
+from io import BytesIO
+from typing import Optional, Union
 
-from langchain_community.document_loaders import Docx2txtLoader, PyPDFLoader, TextLoader
-
-
-def save_file(file, name=None):
-    """
-    Сохраняет загруженный файл с уникальным идентификатором.
-
-    Args:
-        file: Объект загруженного файла.
-        name (str, optional): Пользовательское имя для файла.
-                              Если не указано, используется оригинальное имя.
-
-    Returns:
-        str: Имя сохраненного файла с уникальным идентификатором.
-    """
-    unique_id = str(uuid.uuid4())
-    file_name = f"{unique_id}_{name if name else file.name}"
-    with open(file_name, "wb") as f:
-        f.write(file.getbuffer())
-    return file_name
-
-
-def delete_files(files):
-    """
-    Удаляет указанные файлы из файловой системы.
-
-    Args:
-        files (list): Список путей к файлам, которые необходимо удалить.
-    """
-    for file in files:
-        if file:
-            os.remove(file)
+from utils.text_extraction import extract_text
 
 
 def convert_markdown_to_pdf(markdown_content):
@@ -51,6 +15,10 @@ def convert_markdown_to_pdf(markdown_content):
     Returns:
         BytesIO: PDF документ в виде объекта BytesIO.
     """
+    # Библиотеки экспорта нужны только после проверки
+    import markdown2
+    from fpdf import FPDF
+
     html_text = markdown2.markdown(markdown_content)
 
     pdf = FPDF()
@@ -87,6 +55,8 @@ def convert_markdown_to_html(markdown_content):
         - Включает MathJax для математических формул
         - Содержит встроенные CSS стили
     """
+    import markdown2
+
     html_text = markdown2.markdown(
         markdown_content, extras=["fenced-code-blocks", "tables"]
     )
@@ -133,57 +103,45 @@ def convert_markdown_to_html(markdown_content):
     return html_template
 
 
-def save_uploaded_files(files_to_save):
+def extract_text_from_bytes(
+    data: Union[bytes, memoryview],
+    file_name: str,
+    ocr_cache_writes: Optional[list] = None,
+) -> str:
     """
-    Сохраняет загруженные файлы во временную директорию.
+    Извлекает текстовое содержимое из файла PDF, DOCX или TXT в памяти.
 
     Args:
-        files_to_save (dict): Словарь с загруженными файлами, где ключ -
-                             идентификатор файла, значение - объект файла.
+        data (bytes | memoryview): Содержимое файла.
+        file_name (str): Имя файла, по расширению которого определяется формат.
+        ocr_cache_writes (list, optional): Если передан, распознанный текст
+            страниц не сохраняется в кэш на диске, а добавляется в этот список.
 
     Returns:
-        dict: Словарь с путями к сохраненным файлам, где ключ - идентификатор
-              файла, значение - путь к сохраненному файлу.
+        str: Извлеченный текст из файла.
+
+    Raises:
+        ValueError: Если формат файла не поддерживается.
+
+    Поддерживаемые форматы файлов: .pdf, .docx, .txt. Бэкенд извлечения
+    и ограничения объема текста выбираются в utils.text_extraction.
     """
-    saved_files = {}
-    for key, file in files_to_save.items():
-        if file:
-            saved_files[key] = save_file(file)
-    return saved_files
+    try:
+        return extract_text(data, file_name, ocr_cache_writes=ocr_cache_writes)
+    except Exception as e:
+        logging.error(f"Ошибка при чтении файла {file_name}: {str(e)}")
+        raise e
 
 
-def extract_text_from_file(uploaded_file: str) -> str:
+def extract_text_from_file(file_path: str) -> str:
     """
-    Извлекает текстовое содержимое из файлов PDF, DOCX или TXT.
+    Извлекает текстовое содержимое из файла PDF, DOCX или TXT на диске.
 
     Args:
-        uploaded_file (str): Путь к загруженному файлу.
+        file_path (str): Путь к файлу.
 
     Returns:
-        str: Извлеченный текст из файла. Возвращает пустую строку,
-             если формат файла не поддерживается
-             или произошла ошибка при чтении.
-
-    Поддерживаемые форматы файлов:
-        - .pdf: Использует PyPDFLoader для извлечения текста со всех страниц.
-        - .docx: Использует Docx2txtLoader для извлечения текстового
-                 содержимого.
-        - .txt: Использует TextLoader с автоопределением кодировки.
+        str: Извлеченный текст из файла.
     """
-    try:
-        if uploaded_file.endswith(".docx"):
-            return Docx2txtLoader(uploaded_file).load()[0].page_content
-        elif uploaded_file.endswith(".pdf"):
-            return PyPDFLoader(uploaded_file, mode='single').load()[0].page_content
-        elif uploaded_file.endswith(".txt"):
-            return (
-                TextLoader(uploaded_file, encoding="utf-8", autodetect_encoding=True)
-                .load()[0]
-                .page_content
-            )
-        else:
-            logging.error(f"Неподдерживаемый формат файла: {uploaded_file}")
-            raise ValueError(f"Неподдерживаемый формат файла: {uploaded_file}")
-    except Exception as e:
-        logging.error(f"Ошибка при чтении файла {uploaded_file}: {str(e)}")
-        raise e
+    with open(file_path, "rb") as f:
+        return extract_text_from_bytes(f.read(), file_path)
@@ -0,0 +1,209 @@
+import hashlib
+import importlib.util
+import logging
+import os
+import shutil
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+
+def _ocr_image(image: bytes, lang: str) -> str:
+    """
+    Распознает текст на изображении страницы с помощью Tesseract.
+
+    Выполняется в отдельном процессе пула.
+    """
+    import pytesseract
+    from PIL import Image
+
+    return pytesseract.image_to_string(Image.open(BytesIO(image)), lang=lang)
+
+
+def _render_pages(data: bytes, page_numbers: List[int], dpi: int) -> List[bytes]:
+    """
+    Преобразует страницы PDF в изображения PNG.
+
+    Использует pypdfium2 или PyMuPDF, в зависимости от того,
+    какая библиотека установлена.
+    """
+    images = []
+    if importlib.util.find_spec("pypdfium2"):
+        import pypdfium2
+
+        document = pypdfium2.PdfDocument(data)
+        try:
+            for number in page_numbers:
+                output = BytesIO()
+                document[number].render(scale=dpi / 72).to_pil().save(output, "PNG")
+                images.append(output.getvalue())
+        finally:
+            document.close()
+    else:
+        import fitz
+
+        with fitz.open(stream=data, filetype="pdf") as document:
+            for number in page_numbers:
+                images.append(document[number].get_pixmap(dpi=dpi).tobytes("png"))
+    return images
+
+
+class OCRProcessor:
+    """
+    Распознавание текста на страницах PDF без текстового слоя.
+
+    Страницы распознаются параллельно в пуле процессов, а результат
+    распознавания каждой страницы сохраняется в кэш на диске, поэтому
+    повторная загрузка того же файла не требует повторного распознавания.
+
+    Attributes:
+        cache_dir (str): Директория кэша распознанных страниц
+        lang (str): Языки распознавания Tesseract
+        dpi (int): Разрешение изображений страниц
+        workers (int): Количество процессов распознавания
+        min_chars (int): Минимальное количество символов на странице,
+                         при котором считается, что у нее есть текстовый слой
+        enabled (bool): Включено ли распознавание
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        lang: str = "rus+eng",
+        dpi: int = 300,
+        workers: Optional[int] = None,
+        min_chars: int = 20,
+        enabled: bool = True,
+    ):
+        self.cache_dir = cache_dir
+        self.lang = lang
+        self.dpi = dpi
+        self.workers = workers or os.cpu_count() or 1
+        self.min_chars = min_chars
+        self.enabled = enabled
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """
+        Проверяет, можно ли распознавать страницы.
+
+        Returns:
+            bool: True, если распознавание включено и установлены Tesseract,
+                  pytesseract и библиотека для отрисовки страниц PDF
+        """
+        return (
+            self.enabled
+            and shutil.which("tesseract") is not None
+            and importlib.util.find_spec("pytesseract") is not None
+            and (
+                importlib.util.find_spec("pypdfium2") is not None
+                or importlib.util.find_spec("fitz") is not None
+            )
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Создает пул процессов при первом обращении."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _cache_path(self, document_hash: str, number: int) -> str:
+        """Путь к файлу кэша распознанной страницы."""
+        return os.path.join(
+            self.cache_dir, f"{document_hash}_{number}_{self.lang}_{self.dpi}.txt"
+        )
+
+    def is_empty_page(self, text: str) -> bool:
+        """
+        Проверяет, нет ли у страницы текстового слоя.
+
+        Args:
+            text (str): Текст, извлеченный из текстового слоя страницы
+
+        Returns:
+            bool: True, если на странице меньше min_chars значимых символов
+        """
+        return sum(char.isalnum() for char in text) < self.min_chars
+
+    def fill_empty_pages(
+        self,
+        data: bytes,
+        pages: List[str],
+        cache_writes: Optional[List[Tuple[str, str]]] = None,
+    ) -> List[str]:
+        """
+        Заменяет текст страниц без текстового слоя распознанным текстом.
+
+        Args:
+            data (bytes): Содержимое PDF файла
+            pages (List[str]): Текст страниц из текстового слоя
+            cache_writes (list, optional): Если передан, распознанный текст
+                не сохраняется в кэш на диске, а добавляется в этот список
+                (путь в кэше и текст) для сохранения позже (см. save_pages)
+
+        Returns:
+            List[str]: Текст страниц, в котором пустые страницы распознаны
+        """
+        empty = [number for number, page in enumerate(pages) if self.is_empty_page(page)]
+        if not empty:
+            return pages
+        if not self.is_available():
+            logging.warning(
+                f"Страниц без текстового слоя: {len(empty)}, "
+                "распознавание текста недоступно"
+            )
+            return pages
+
+        data = bytes(data)
+        document_hash = hashlib.sha256(data).hexdigest()
+        recognized: Dict[int, str] = {}
+        for number in empty:
+            path = self._cache_path(document_hash, number)
+            if os.path.isfile(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    recognized[number] = f.read()
+
+        missing = [number for number in empty if number not in recognized]
+        if missing:
+            logging.info(f"Распознавание {len(missing)} страниц без текстового слоя")
+            images = _render_pages(data, missing, self.dpi)
+            texts = self._get_executor().map(
+                _ocr_image, images, [self.lang] * len(images)
+            )
+            writes = []
+            for number, text in zip(missing, texts):
+                recognized[number] = text
+                writes.append((self._cache_path(document_hash, number), text))
+            if cache_writes is None:
+                self.save_pages(writes)
+            else:
+                cache_writes.extend(writes)
+
+        return [recognized.get(number, page) for number, page in enumerate(pages)]
+
+    def save_pages(self, cache_writes: List[Tuple[str, str]]) -> None:
+        """
+        Сохраняет распознанный текст страниц в кэш на диске.
+
+        Args:
+            cache_writes (list): Пути в кэше и текст страниц
+                                 (см. fill_empty_pages)
+        """
+        if not cache_writes:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for path, text in cache_writes:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+
+# Global instance
+ocr_processor = OCRProcessor(
+    cache_dir=os.getenv("OCR_CACHE_DIR", ".cache/ocr"),
+    lang=os.getenv("OCR_LANG", "rus+eng"),
+    workers=int(os.getenv("OCR_WORKERS", "0")) or None,
+    enabled=os.getenv("OCR_ENABLED", "true").lower() in ("true", "1", "yes"),
+)
@@ -1,41 +1,132 @@
+import hashlib
 import os
-from typing import Dict, Optional
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
-import streamlit as st
+from utils.shared_store import MemorySharedStore, SharedStore, shared_store
+
+
+def get_prompt_version(content: str) -> str:
+    """
+    Вычисляет версию промпта по его содержимому.
+
+    Args:
+        content (str): Текст промпта
+
+    Returns:
+        str: Первые 16 символов SHA-256 хэша текста промпта
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+@lru_cache(maxsize=64)
+def compile_template(content: str) -> Any:
+    """
+    Создает шаблон промпта LangChain.
+
+    Шаблон создается один раз для каждого варианта текста промпта
+    и используется повторно при всех последующих вызовах.
+
+    Args:
+        content (str): Текст промпта
+
+    Returns:
+        ChatPromptTemplate: Шаблон с одним системным сообщением
+    """
+    from langchain_core.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages([("system", content)])
 
 
 class PromptManager:
     """
     Класс для управления промптами в системе.
 
-    Позволяет просматривать, модифицировать и сбрасывать промпты,
-    а также предоставляет интерфейс для их редактирования через Streamlit.
+    Позволяет просматривать, модифицировать и сбрасывать промпты.
+    Интерфейс редактирования промптов в Streamlit находится в
+    ui.ui_components.render_prompt_editor. Модифицированные промпты
+    хранятся в общем хранилище, поэтому все экземпляры веб-приложения
+    используют одни и те же промпты.
+
+    Каждая версия промпта идентифицируется хэшем содержимого
+    (см. get_prompt_version), а ее текст сохраняется в хранилище,
+    поэтому в результатах проверки достаточно хранить только версию.
+    Файлы промптов перечитываются после их изменения на диске.
 
     Attributes:
+        prompts_dir (str): Директория с промптами
         prompts (Dict[str, str]): Словарь оригинальных промптов
-        modified_prompts (Dict[str, str]): Словарь модифицированных промптов
+        store (SharedStore): Хранилище модифицированных промптов и версий
+        reload_interval (float): Минимальный интервал проверки изменения
+                                 файлов промптов в секундах
     """
 
-    def __init__(self):
-        # Словари для хранения оригинальных и модифицированных промптов
+    # Пространство имен модифицированных промптов в общем хранилище
+    STORE_NAMESPACE = "modified_prompts"
+
+    # Пространство имен текстов версий промптов в общем хранилище
+    VERSIONS_NAMESPACE = "prompt_versions"
+
+    def __init__(
+        self,
+        prompts_dir: str = "prompts",
+        store: Optional[SharedStore] = None,
+        reload_interval: float = 1.0,
+    ):
+        self.prompts_dir = prompts_dir
+        # Словарь для хранения оригинальных промптов
         self.prompts: Dict[str, str] = {}
-        self.modified_prompts: Dict[str, str] = {}
+        self.store = store or MemorySharedStore()
+        self.reload_interval = reload_interval
+        self._mtimes: Dict[str, float] = {}
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
         self._load_prompts()
 
+    @property
+    def modified_prompts(self) -> Dict[str, str]:
+        """Словарь модифицированных промптов."""
+        return self.store.items(self.STORE_NAMESPACE)
+
+    def _register_version(self, content: str) -> str:
+        """Сохраняет текст версии промпта в хранилище и возвращает версию."""
+        version = get_prompt_version(content)
+        if self.store.get(self.VERSIONS_NAMESPACE, version) is None:
+            self.store.set(self.VERSIONS_NAMESPACE, version, content)
+        return version
+
     def _load_prompts(self):
         """
-        Загружает все промпты из директории prompts.
+        Загружает все промпты из директории prompts_dir.
 
-        Читает .py файлы, извлекает строки шаблонов между тройными кавычками
-        и сохраняет их в словарь prompts.
+        Читает .txt файлы и сохраняет их содержимое в словарь prompts
+        под именами вида <ИМЯ_ФАЙЛА>_TEMPLATE. Файлы, не изменившиеся
+        с прошлой загрузки, повторно не читаются.
         """
-        prompts_dir = "prompts"
-        for file in os.listdir(prompts_dir):
+        for file in os.listdir(self.prompts_dir):
             if file.endswith(".txt"):
-                with open(os.path.join(prompts_dir, file), "r", encoding="utf-8") as f:
+                path = os.path.join(self.prompts_dir, file)
+                mtime = os.path.getmtime(path)
+                if self._mtimes.get(path) == mtime:
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
                     content = f.read()
                     prompt_name = os.path.splitext(file)[0].upper() + "_TEMPLATE"
                     self.prompts[prompt_name] = content
+                self._mtimes[path] = mtime
+                self._register_version(content)
+
+    def _reload_if_changed(self):
+        """Перечитывает измененные файлы промптов не чаще reload_interval."""
+        now = time.time()
+        if now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if now - self._checked_at >= self.reload_interval:
+                self._load_prompts()
+                self._checked_at = now
 
     def get_prompt(self, prompt_name: str) -> Optional[str]:
         """
@@ -48,7 +139,22 @@ class PromptManager:
             Optional[str]: Модифицированная версия промпта если существует,
                            иначе оригинальная версия
         """
-        return self.modified_prompts.get(prompt_name, self.prompts.get(prompt_name))
+        self._reload_if_changed()
+        return self.store.get(
+            self.STORE_NAMESPACE, prompt_name, self.prompts.get(prompt_name)
+        )
+
+    def get_prompt_by_version(self, version: str) -> Optional[str]:
+        """
+        Получает текст промпта по его версии.
+
+        Args:
+            version (str): Версия промпта (см. get_prompt_version)
+
+        Returns:
+            Optional[str]: Текст промпта или None, если версия неизвестна
+        """
+        return self.store.get(self.VERSIONS_NAMESPACE, version)
 
     def modify_prompt(self, prompt_name: str, new_content: str):
         """
@@ -59,7 +165,8 @@ class PromptManager:
             new_content (str): Новое содержимое промпта
         """
         if prompt_name in self.prompts:
-            self.modified_prompts[prompt_name] = new_content
+            self._register_version(new_content)
+            self.store.set(self.STORE_NAMESPACE, prompt_name, new_content)
 
     def reset_prompt(self, prompt_name: str):
         """
@@ -68,65 +175,12 @@ class PromptManager:
         Args:
             prompt_name (str): Имя промпта для сброса
         """
-        if prompt_name in self.modified_prompts:
-            del self.modified_prompts[prompt_name]
+        self.store.delete(self.STORE_NAMESPACE, prompt_name)
 
     def reset_all_prompts(self):
         """Сбрасывает все промпты к их оригинальным версиям."""
-        self.modified_prompts.clear()
-
-    def render_prompt_editor(self):
-        """
-        Отображает интерфейс редактора промптов в Streamlit.
-
-        Позволяет пользователю:
-        - Выбрать промпт для редактирования
-        - Просмотреть/изменить содержимое промпта
-        - Сохранить изменения
-        - Сбросить отдельный промпт или все промпты
-        """
-        st.subheader("Управление промптами")
-
-        # Выбор промпта для редактирования
-        prompt_names = list(self.prompts.keys())
-        selected_prompt = st.selectbox(
-            "Выберите промпт для просмотра/редактирования", prompt_names
-        )
-
-        if selected_prompt:
-            current_prompt = self.get_prompt(selected_prompt)
-            is_modified = selected_prompt in self.modified_prompts
-
-            # Показываем статус модификации
-            if is_modified:
-                st.warning("⚠️ Промпт был изменен")
-
-            # Поле для редактирования
-            new_prompt = st.text_area(
-                "Содержимое промпта", value=current_prompt, height=400
-            )
-
-            col1, col2, col3 = st.columns(3)
-
-            # Кнопка сохранения изменений
-            if col1.button("Сохранить изменения"):
-                if new_prompt != self.prompts[selected_prompt]:
-                    self.modify_prompt(selected_prompt, new_prompt)
-                    st.success("✅ Изменения сохранены")
-                else:
-                    self.reset_prompt(selected_prompt)
-                    st.info("ℹ️ Промпт вернулся к оригинальной версии")
-
-            # Кнопка сброса текущего промпта
-            if is_modified and col2.button("Сбросить этот промпт"):
-                self.reset_prompt(selected_prompt)
-                st.rerun()
-
-            # Кнопка сброса всех промптов
-            if self.modified_prompts and col3.button("Сбросить все промпты"):
-                self.reset_all_prompts()
-                st.rerun()
+        self.store.clear(self.STORE_NAMESPACE)
 
 
 # Global instance
-prompt_manager = PromptManager()
+prompt_manager = PromptManager(store=shared_store)
@@ -0,0 +1,219 @@
+import gzip
+import importlib.util
+import io
+import json
+import logging
+import os
+from typing import IO, Any, Dict, Optional
+
+# Имя файла с результатами проверки в папке проверки
+RESULTS_FILE_NAME = "results.json"
+
+# Версия формата записи результатов: 1 - JSON с текстами промптов
+# и отдельными копиями результатов в Markdown, 2 - сжатая запись
+# с версиями промптов
+RESULTS_FORMAT_VERSION = 2
+
+# Расширения файла результатов для форматов архивации
+ARCHIVE_EXTENSIONS = {
+    "zstd": ".zst",
+    "gzip": ".gz",
+    "json": "",
+}
+
+# Сигнатуры сжатых файлов
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Соответствие ключей промптов в записях формата 1 этапам проверки
+LEGACY_PROMPT_KEYS = {
+    "criteria_forming": "criteria_forming",
+    "check_report": "report_check",
+    "feedback_forming": "feedback_forming",
+}
+
+# Размер блока при потоковой записи
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+def get_archive_format() -> str:
+    """
+    Возвращает формат архивации результатов.
+
+    Формат задается переменной окружения RESULTS_ARCHIVE_FORMAT
+    (zstd, gzip или json - несжатый JSON). По умолчанию используется
+    zstd, если установлен пакет zstandard, иначе gzip.
+
+    Returns:
+        str: Формат архивации
+    """
+    archive_format = os.getenv("RESULTS_ARCHIVE_FORMAT")
+    if archive_format not in ARCHIVE_EXTENSIONS:
+        if archive_format:
+            logging.warning(f"Неизвестный формат архивации результатов: {archive_format}")
+        archive_format = "zstd"
+    if archive_format == "zstd" and importlib.util.find_spec("zstandard") is None:
+        archive_format = "gzip"
+    return archive_format
+
+
+def get_results_file_name(archive_format: str) -> str:
+    """
+    Возвращает имя файла результатов для формата архивации.
+
+    Args:
+        archive_format (str): Формат архивации
+
+    Returns:
+        str: Имя файла, например results.json.zst
+    """
+    return RESULTS_FILE_NAME + ARCHIVE_EXTENSIONS[archive_format]
+
+
+def write_results(f: IO[bytes], results_json: Dict[str, Any], archive_format: str) -> None:
+    """
+    Записывает результаты проверки в файл в формате архивации.
+
+    JSON кодируется по частям и сразу передается в сжимающий поток,
+    поэтому полная строка JSON в памяти не формируется.
+
+    Args:
+        f (IO[bytes]): Файл, открытый на запись в двоичном режиме
+        results_json (Dict[str, Any]): Результаты проверки
+        archive_format (str): Формат архивации (см. ARCHIVE_EXTENSIONS)
+    """
+    record = {**results_json, "format_version": RESULTS_FORMAT_VERSION}
+    if archive_format == "json":
+        chunks = json.JSONEncoder(ensure_ascii=False, indent=4).iterencode(record)
+        stream = f
+    else:
+        chunks = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":")
+        ).iterencode(record)
+        if archive_format == "zstd":
+            import zstandard
+
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(
+                f, closefd=False
+            )
+        else:
+            stream = gzip.GzipFile(fileobj=f, mode="wb", mtime=0)
+
+    buffer = []
+    size = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= WRITE_CHUNK_SIZE:
+            stream.write("".join(buffer).encode("utf-8"))
+            buffer, size = [], 0
+    stream.write("".join(buffer).encode("utf-8"))
+    if stream is not f:
+        stream.close()
+
+
+def upgrade_results(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Приводит запись результатов формата 1 к формату 2.
+
+    Тексты промптов заменяются их версиями (хэшами содержимого),
+    сами тексты сохраняются в prompts.texts.
+
+    Args:
+        record (Dict[str, Any]): Запись результатов
+
+    Returns:
+        Dict[str, Any]: Запись результатов в формате 2
+    """
+    if record.get("format_version", 1) >= RESULTS_FORMAT_VERSION:
+        return record
+    # Записи, сохраненные до появления format_version, но уже с версиями промптов
+    if "versions" in record.get("prompts", {}):
+        record["format_version"] = RESULTS_FORMAT_VERSION
+        return record
+
+    from utils.prompt_manager import get_prompt_version
+
+    prompts = record.get("prompts", {})
+    texts = {
+        node: prompts[key]
+        for key, node in LEGACY_PROMPT_KEYS.items()
+        if isinstance(prompts.get(key), str)
+    }
+    record["prompts"] = {
+        "custom_use": prompts.get("custom_use", False),
+        "versions": {node: get_prompt_version(text) for node, text in texts.items()},
+        "texts": texts,
+    }
+    record["format_version"] = RESULTS_FORMAT_VERSION
+    return record
+
+
+def read_results(f: IO[bytes]) -> Dict[str, Any]:
+    """
+    Читает результаты проверки в любом формате.
+
+    Формат сжатия определяется по сигнатуре файла, записи
+    старого формата приводятся к текущему (см. upgrade_results).
+
+    Args:
+        f (IO[bytes]): Файл, открытый на чтение в двоичном режиме
+                       (с возможностью перемещения по файлу)
+
+    Returns:
+        Dict[str, Any]: Результаты проверки
+    """
+    stream = f
+    magic = f.read(4)
+    f.seek(0)
+    if magic == ZSTD_MAGIC:
+        import zstandard
+
+        stream = zstandard.ZstdDecompressor().stream_reader(stream, closefd=False)
+    elif magic[:2] == GZIP_MAGIC:
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    text = io.TextIOWrapper(stream, encoding="utf-8")
+    try:
+        record = json.load(text)
+    finally:
+        # Файл закрывает вызывающий код, а не обертка
+        text.detach()
+    return upgrade_results(record)
+
+
+def find_results_path(fs: Any, folder_path: str) -> Optional[str]:
+    """
+    Находит файл результатов в папке проверки.
+
+    Args:
+        fs: Файловая система (например, s3fs.S3FileSystem)
+        folder_path (str): Путь к папке проверки
+
+    Returns:
+        Optional[str]: Путь к файлу результатов или None, если его нет
+    """
+    for extension in (".zst", ".gz", ""):
+        path = f"{folder_path}/{RESULTS_FILE_NAME}{extension}"
+        if fs.exists(path):
+            return path
+    return None
+
+
+def load_results(fs: Any, folder_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Загружает результаты проверки из папки проверки в любом формате.
+
+    Args:
+        fs: Файловая система (например, s3fs.S3FileSystem)
+        folder_path (str): Путь к папке проверки
+
+    Returns:
+        Optional[Dict[str, Any]]: Результаты проверки или None,
+                                  если файла результатов нет
+    """
+    path = find_results_path(fs, folder_path)
+    if path is None:
+        return None
+    with fs.open(path, "rb") as f:
+        return read_results(f)
+
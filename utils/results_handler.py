@@ -2,7 +2,49 @@ from typing import Any, Dict, Optional
 
 from streamlit import session_state
 
+from utils.artifact_store import artifact_store
 from utils.file_utils import convert_markdown_to_html, convert_markdown_to_pdf
+from utils.prompt_manager import prompt_manager
+from utils.speculation import speculative_executor
+
+
+def store_artifact(name: str, data: Any) -> None:
+    """
+    Сохраняет данные проверки в хранилище данных сессий,
+    а в session_state - только их дескриптор.
+
+    Args:
+        name (str): Имя данных (ключ session_state)
+        data (Any): Текст, байты или None
+    """
+    session_state[name] = (
+        None
+        if data is None
+        else artifact_store.put(session_state.session_id, name, data)
+    )
+
+
+def load_artifact(name: str) -> Any:
+    """
+    Загружает данные проверки по дескриптору из session_state.
+
+    Args:
+        name (str): Имя данных (ключ session_state)
+
+    Returns:
+        Any: Текст, байты или None, если данных нет или они уже удалены
+    """
+    return artifact_store.get(session_state.get(name))
+
+
+def get_session_memory() -> Dict[str, int]:
+    """
+    Возвращает объем данных текущей сессии в хранилище.
+
+    Returns:
+        Dict[str, int]: Количество данных и их объем в памяти и на диске
+    """
+    return artifact_store.get_session_usage(session_state.session_id)
 
 
 def handle_check_results(
@@ -17,20 +59,38 @@ def handle_check_results(
         custom_criteria (bool): Флаг использования пользовательских критериев
         skip_feedback (bool): Флаг пропуска генерации обратной связи
     """
-    session_state.passport_content = graph.get_state(config=config).values["passport"]
-    session_state.report_content = graph.get_state(config=config).values["report"]
-    session_state.check_result = graph.get_state(config=config).values["check_results"]
-    session_state.input_criteria = (
-        graph.get_state(config=config).values["criteria"] if custom_criteria else ""
+    values = graph.get_state(config=config).values
+    store_artifact("passport_content", values["passport"])
+    store_artifact("report_content", values["report"])
+    store_artifact("check_result", values["check_results"])
+    store_artifact("input_criteria", values["criteria"] if custom_criteria else "")
+    store_artifact("check_criteria", values["structured_criteria"])
+    store_artifact("feedback", None if skip_feedback else values["feedback"])
+
+    # Метрики этапов проверки
+    node_durations = values.get("node_durations", {})
+    session_state.structuring_criteria_duration = node_durations.get(
+        "criteria_forming", 0
+    )
+    session_state.checking_report_duration = node_durations.get("report_check", 0)
+    session_state.feedback_forming_duration = node_durations.get(
+        "feedback_forming", 0
     )
-    session_state.check_criteria = graph.get_state(config=config).values[
-        "structured_criteria"
-    ]
-    session_state.feedback = (
-        None if skip_feedback else graph.get_state(config=config).values["feedback"]
+    session_state.node_llms = values.get("node_llms", {})
+    session_state.node_output_tokens = values.get("node_output_tokens", {})
+    session_state.node_cache_hits = values.get("node_cache_hits", {})
+    session_state.node_queue_waits = values.get("node_queue_waits", {})
+    session_state.node_prompt_versions = values.get("node_prompt_versions", {})
+    session_state.check_scores = values.get("check_scores", {})
+
+    store_artifact(
+        "pdf_bytes", convert_markdown_to_pdf(values["check_results"]).getvalue()
     )
-    session_state.pdf_bytes = convert_markdown_to_pdf(session_state.check_result)
-    session_state.html_content = convert_markdown_to_html(session_state.check_result)
+    store_artifact("html_content", convert_markdown_to_html(values["check_results"]))
+
+    # Состояние графа с полными текстами документов больше не нужно
+    if hasattr(graph.checkpointer, "delete_thread"):
+        graph.checkpointer.delete_thread(config["configurable"]["thread_id"])
 
 
 def prepare_results_json() -> Dict[str, Any]:
@@ -46,28 +106,46 @@ def prepare_results_json() -> Dict[str, Any]:
         "timestamp": session_state.current_time,
         "session_id": session_state.session_id,
         "llm": session_state.llm_choice,
+        "llms_used": session_state.get("node_llms", {}),
         "duration": session_state.duration,
+        "queue_wait": session_state.get("queue_wait", 0),
+        "admission": session_state.get("admission_metrics", {}),
+        "normalization": session_state.get("normalization", {}),
+        "speculation": {
+            "criteria_precomputed": session_state.get("speculation_used", False),
+            "metrics": speculative_executor.get_metrics(),
+        },
         "structuring_criteria_duration": session_state.structuring_criteria_duration,
         "checking_report_duration": session_state.checking_report_duration,
         "feedback_forming_duration": session_state.feedback_forming_duration,
+        "output_tokens": session_state.get("node_output_tokens", {}),
+        "cache_hits": session_state.get("node_cache_hits", {}),
+        "queue_waits": session_state.get("node_queue_waits", {}),
+        "session_memory": get_session_memory(),
         "inputs": {
             "names": [
-                file.name
-                for file in session_state.files_to_save.values()
-                if file is not None
+                handle["name"]
+                for handle in session_state.files_to_save.values()
+                if handle is not None
             ],
             "content": {
-                "passport": session_state.passport_content,
-                "report": session_state.report_content,
-                "criteria": session_state.input_criteria,
+                "passport": load_artifact("passport_content"),
+                "report": load_artifact("report_content"),
+                "criteria": load_artifact("input_criteria"),
             },
         },
         "outputs": {
             "content": {
-                "check_results": session_state.check_result,
-                "check_criteria": session_state.check_criteria,
-                "feedback_for_student": session_state.feedback,
-            }
+                "check_results": load_artifact("check_result"),
+                "check_criteria": load_artifact("check_criteria"),
+                "feedback_for_student": load_artifact("feedback"),
+            },
+            "scores": session_state.get("check_scores", {}),
         },
         "feedback_from_user": {},
+        # Тексты промптов сохраняются отдельно по их версиям
+        "prompts": {
+            "custom_use": bool(prompt_manager.modified_prompts),
+            "versions": session_state.get("node_prompt_versions", {}),
+        },
     }
@@ -0,0 +1,232 @@
+import json
+import os
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Форматы сводной таблицы результатов пакетной проверки
+RESULTS_TABLE_FORMATS = ("jsonl", "csv", "parquet")
+
+# Имя файла, в который результаты записываются по мере проверки отчетов
+RESULTS_LOG_NAME = "results.jsonl"
+
+# Квантили итоговой оценки в статистике пакета
+SCORE_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def make_result_row(
+    file_name: str, results: Dict[str, Any], processed_at: str
+) -> Dict[str, Any]:
+    """
+    Формирует строку сводной таблицы по результатам проверки отчета.
+
+    Args:
+        file_name (str): Имя файла отчета
+        results (Dict[str, Any]): Результаты работы графа проверки
+        processed_at (str): Время проверки
+
+    Returns:
+        Dict[str, Any]: Строка таблицы
+    """
+    check_scores = results.get("check_scores") or {}
+    node_durations = results.get("node_durations", {})
+    return {
+        "file_name": file_name,
+        "processed_at": processed_at,
+        "model": results.get("node_llms", {}).get("report_check"),
+        "total_score": check_scores.get("total_score"),
+        "score_source": check_scores.get("source"),
+        "criteria": check_scores.get("criteria", []),
+        "duration": sum(node_durations.values()),
+        "durations": node_durations,
+        "models": results.get("node_llms", {}),
+        "output_tokens": results.get("node_output_tokens", {}),
+        "prompt_versions": results.get("node_prompt_versions", {}),
+        "structured_criteria": results.get("structured_criteria"),
+        "check_results": results.get("check_results"),
+        "feedback": results.get("feedback"),
+    }
+
+
+def append_result_row(path: str, row: Dict[str, Any]) -> None:
+    """
+    Дописывает строку в файл результатов в формате JSON Lines.
+
+    Строка записывается сразу после проверки отчета, поэтому результаты
+    не накапливаются в памяти и не теряются при прерывании проверки.
+
+    Args:
+        path (str): Путь к файлу результатов
+        row (Dict[str, Any]): Строка таблицы (см. make_result_row)
+    """
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+def iter_result_rows(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Читает строки файла результатов в формате JSON Lines.
+
+    Args:
+        path (str): Путь к файлу результатов
+
+    Yields:
+        Dict[str, Any]: Строки таблицы
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_results_table(path: str) -> Tuple[Any, Any]:
+    """
+    Загружает результаты пакетной проверки в таблицу pandas.
+
+    Вложенные словари (длительности, модели и токены по этапам)
+    разворачиваются в столбцы вида durations.report_check, оценки
+    по критериям - в столбцы criteria.<название критерия>. Для отчетов,
+    проверенных повторно, остается последний результат.
+
+    Args:
+        path (str): Путь к файлу результатов в формате JSON Lines
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Таблица результатов по отчетам
+            и таблица оценок по критериям (file_name, name, score, max_score)
+    """
+    import pandas as pd
+
+    frame = pd.json_normalize(list(iter_result_rows(path)), max_level=1)
+    if frame.empty:
+        return frame, pd.DataFrame(columns=["file_name", "name", "score", "max_score"])
+    frame = frame.drop_duplicates("file_name", keep="last").reset_index(drop=True)
+
+    criteria = frame[["file_name", "criteria"]].explode("criteria").dropna()
+    criteria = pd.concat(
+        [
+            criteria[["file_name"]].reset_index(drop=True),
+            pd.json_normalize(criteria["criteria"].tolist()),
+        ],
+        axis=1,
+    ).reindex(columns=["file_name", "name", "score", "max_score"])
+
+    if not criteria.empty:
+        scores = criteria.pivot_table(
+            index="file_name", columns="name", values="score", aggfunc="last"
+        ).add_prefix("criteria.")
+        frame = frame.merge(scores, left_on="file_name", right_index=True, how="left")
+    return frame.drop(columns="criteria"), criteria
+
+
+def write_results_table(frame: Any, path: str) -> None:
+    """
+    Сохраняет таблицу результатов в CSV или Parquet (по расширению файла).
+
+    Args:
+        frame (pd.DataFrame): Таблица результатов (см. load_results_table)
+        path (str): Путь к файлу
+    """
+    if path.endswith(".parquet"):
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False)
+
+
+def _round(value: Any) -> Any:
+    """Округляет число до двух знаков, пропуски заменяет на None."""
+    return None if value is None or value != value else round(float(value), 2)
+
+
+def _to_records(table: Any) -> Dict[str, Dict[str, Any]]:
+    """Преобразует таблицу в словарь по строкам, заменяя пропуски на None."""
+    table = table.round(2).astype(object)
+    return table.where(table.notna(), None).to_dict(orient="index")
+
+
+def compute_batch_stats(frame: Any, criteria: Any) -> Dict[str, Any]:
+    """
+    Вычисляет статистику пакетной проверки.
+
+    Статистика считается операциями pandas над всей таблицей,
+    без обхода строк в цикле.
+
+    Args:
+        frame (pd.DataFrame): Таблица результатов по отчетам
+        criteria (pd.DataFrame): Таблица оценок по критериям
+
+    Returns:
+        Dict[str, Any]: Количество отчетов, распределение итоговой оценки,
+                        статистика по моделям, критериям и длительностям
+    """
+    if frame.empty:
+        return {"reports": 0}
+
+    total_score = frame["total_score"].astype(float)
+    score_stats = total_score.describe()
+    quantiles = total_score.quantile(list(SCORE_QUANTILES))
+
+    by_model = frame.assign(total_score=total_score).groupby("model").agg(
+        reports=("file_name", "size"),
+        mean_score=("total_score", "mean"),
+        mean_duration=("duration", "mean"),
+    )
+
+    criteria = criteria.assign(
+        score=criteria["score"].astype(float),
+        share=criteria["score"].astype(float) / criteria["max_score"].astype(float),
+    )
+    by_criterion = criteria.groupby("name").agg(
+        reports=("file_name", "size"),
+        mean_score=("score", "mean"),
+        mean_share=("share", "mean"),
+    )
+
+    durations = frame.filter(like="durations.")
+    durations.columns = durations.columns.str.removeprefix("durations.")
+
+    return {
+        "reports": len(frame),
+        "scored": int(total_score.notna().sum()),
+        "structured": int((frame["score_source"] == "structured").sum()),
+        "total_score": {
+            "mean": _round(score_stats.get("mean")),
+            "std": _round(score_stats.get("std")),
+            "min": _round(score_stats.get("min")),
+            "max": _round(score_stats.get("max")),
+            "quantiles": {str(q): _round(value) for q, value in quantiles.items()},
+        },
+        "by_model": _to_records(by_model),
+        "by_criterion": _to_records(by_criterion),
+        "durations": {
+            "total": _round(frame["duration"].sum()),
+            "mean_by_stage": {
+                stage: _round(value) for stage, value in durations.mean().items()
+            },
+        },
+    }
+
+
+def export_results_table(output_dir: str, results_format: str) -> List[str]:
+    """
+    Формирует сводную таблицу и статистику пакетной проверки.
+
+    Args:
+        output_dir (str): Директория с результатами проверки
+        results_format (str): Формат сводной таблицы (см. RESULTS_TABLE_FORMATS)
+
+    Returns:
+        List[str]: Пути к созданным файлам
+    """
+    log_path = os.path.join(output_dir, RESULTS_LOG_NAME)
+    frame, criteria = load_results_table(log_path)
+
+    paths = []
+    if results_format != "jsonl":
+        table_path = os.path.join(output_dir, f"results.{results_format}")
+        write_results_table(frame, table_path)
+        paths.append(table_path)
+
+    stats_path = os.path.join(output_dir, "batch_stats.json")
+    with open(stats_path, "w", encoding="utf-8") as f:
+        json.dump(compute_batch_stats(frame, criteria), f, ensure_ascii=False, indent=4)
+    paths.append(stats_path)
+    return paths
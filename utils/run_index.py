@@ -0,0 +1,204 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.score_extraction import extract_total_score
+
+# Столбцы индекса запусков проверки и их типы SQLite
+RUN_INDEX_COLUMNS = {
+    "run_id": "TEXT PRIMARY KEY",
+    "timestamp": "TEXT",
+    "session_id": "TEXT",
+    "llm": "TEXT",
+    "llm_criteria_forming": "TEXT",
+    "llm_report_check": "TEXT",
+    "llm_feedback_forming": "TEXT",
+    "duration": "REAL",
+    "queue_wait": "REAL",
+    "criteria_forming_duration": "REAL",
+    "report_check_duration": "REAL",
+    "feedback_forming_duration": "REAL",
+    "output_tokens": "INTEGER",
+    "rating": "TEXT",
+    "comment": "TEXT",
+    "file_names": "TEXT",
+    "prompt_criteria_forming": "TEXT",
+    "prompt_report_check": "TEXT",
+    "prompt_feedback_forming": "TEXT",
+    "score": "REAL",
+    "source_mtime": "REAL",
+    "indexed_at": "REAL",
+}
+
+
+def make_run_row(
+    run_id: str, results_json: Dict[str, Any], source_mtime: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Формирует строку индекса по записи результатов проверки.
+
+    Args:
+        run_id (str): Идентификатор запуска (имя папки проверки в S3)
+        results_json (Dict[str, Any]): Результаты проверки
+        source_mtime (float, optional): Время изменения записи в S3
+
+    Returns:
+        Dict[str, Any]: Значения столбцов индекса
+    """
+    llms_used = results_json.get("llms_used", {})
+    prompt_versions = results_json.get("prompts", {}).get("versions", {})
+    feedback_from_user = results_json.get("feedback_from_user", {})
+    outputs = results_json.get("outputs", {})
+    # Итоговая оценка из структурированных оценок, а для записей
+    # без них - из текста результатов проверки
+    score = outputs.get("scores", {}).get("total_score")
+    if score is None:
+        score = extract_total_score(outputs.get("content", {}).get("check_results"))
+    return {
+        "run_id": run_id,
+        "timestamp": results_json.get("timestamp"),
+        "session_id": results_json.get("session_id"),
+        "llm": results_json.get("llm"),
+        "llm_criteria_forming": llms_used.get("criteria_forming"),
+        "llm_report_check": llms_used.get("report_check"),
+        "llm_feedback_forming": llms_used.get("feedback_forming"),
+        "duration": results_json.get("duration"),
+        "queue_wait": results_json.get("queue_wait"),
+        "criteria_forming_duration": results_json.get("structuring_criteria_duration"),
+        "report_check_duration": results_json.get("checking_report_duration"),
+        "feedback_forming_duration": results_json.get("feedback_forming_duration"),
+        "output_tokens": sum(
+            tokens or 0 for tokens in results_json.get("output_tokens", {}).values()
+        ),
+        "rating": feedback_from_user.get("rating"),
+        "comment": feedback_from_user.get("comment"),
+        "file_names": ", ".join(results_json.get("inputs", {}).get("names", [])),
+        "prompt_criteria_forming": prompt_versions.get("criteria_forming"),
+        "prompt_report_check": prompt_versions.get("report_check"),
+        "prompt_feedback_forming": prompt_versions.get("feedback_forming"),
+        "score": score,
+        "source_mtime": source_mtime,
+        "indexed_at": time.time(),
+    }
+
+
+class RunIndex:
+    """
+    Индекс запусков проверки для аналитики.
+
+    Метаданные каждого запуска (время, модели, длительности, оценка
+    пользователя, имена файлов, версии промптов, итоговая оценка отчета)
+    хранятся одной строкой в SQLite. Строка записывается при сохранении
+    результатов и обновляется при получении обратной связи, а запуски,
+    сохраненные другими экземплярами приложения, добавляются
+    инкрементальной синхронизацией с S3 (см. query_runs.py).
+
+    Attributes:
+        path (str): Путь к файлу базы данных
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с базой и создает таблицу при первом обращении."""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with connection:
+                columns = ", ".join(
+                    f"{name} {column_type}"
+                    for name, column_type in RUN_INDEX_COLUMNS.items()
+                )
+                connection.execute(f"CREATE TABLE IF NOT EXISTS runs ({columns})")
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS runs_timestamp ON runs (timestamp)"
+                )
+            self._initialized = True
+        return connection
+
+    def upsert(
+        self,
+        run_id: str,
+        results_json: Dict[str, Any],
+        source_mtime: Optional[float] = None,
+    ) -> None:
+        """
+        Добавляет или обновляет строку запуска.
+
+        Ошибки записи в индекс логируются и не прерывают сохранение результатов.
+
+        Args:
+            run_id (str): Идентификатор запуска (имя папки проверки в S3)
+            results_json (Dict[str, Any]): Результаты проверки
+            source_mtime (float, optional): Время изменения записи в S3
+        """
+        row = make_run_row(run_id, results_json, source_mtime)
+        try:
+            with self._lock, closing(self._connect()) as connection, connection:
+                connection.execute(
+                    f"INSERT OR REPLACE INTO runs ({', '.join(row)}) "
+                    f"VALUES ({', '.join('?' for _ in row)})",
+                    list(row.values()),
+                )
+        except Exception as e:
+            logging.error(f"Ошибка при записи в индекс запусков: {e}")
+
+    def get_source_mtimes(self) -> Dict[str, Optional[float]]:
+        """
+        Возвращает время изменения записей, по которым построены строки.
+
+        Returns:
+            Dict[str, Optional[float]]: Время изменения по идентификаторам запусков
+        """
+        with self._lock, closing(self._connect()) as connection:
+            return dict(connection.execute("SELECT run_id, source_mtime FROM runs"))
+
+    def query(
+        self, sql: str, params: Tuple[Any, ...] = ()
+    ) -> Tuple[List[str], List[Tuple[Any, ...]]]:
+        """
+        Выполняет SQL-запрос к таблице runs.
+
+        Args:
+            sql (str): Запрос
+            params (tuple): Параметры запроса
+
+        Returns:
+            Tuple[List[str], List[tuple]]: Названия столбцов и строки результата
+        """
+        with self._lock, closing(self._connect()) as connection:
+            cursor = connection.execute(sql, params)
+            columns = [column[0] for column in cursor.description or []]
+            return columns, cursor.fetchall()
+
+    def export(self, path: str) -> int:
+        """
+        Выгружает индекс в файл Parquet или CSV (по расширению файла).
+
+        Args:
+            path (str): Путь к файлу
+
+        Returns:
+            int: Количество выгруженных строк
+        """
+        import pandas as pd
+
+        columns, rows = self.query("SELECT * FROM runs ORDER BY timestamp")
+        frame = pd.DataFrame(rows, columns=columns)
+        if path.endswith(".parquet"):
+            frame.to_parquet(path, index=False)
+        else:
+            frame.to_csv(path, index=False)
+        return len(frame)
+
+
+# Global instance
+run_index = RunIndex(os.getenv("RUN_INDEX_PATH", ".cache/run_index.sqlite"))
@@ -1,10 +1,19 @@
+import hashlib
 import json
-from typing import Dict
+import logging
+import os
+from typing import Any, Dict
 
-import s3fs
 import streamlit as st
 
 from utils.prompt_manager import prompt_manager
+from utils.results_archive import get_archive_format, get_results_file_name, write_results
+
+# Версии промптов, тексты которых уже сохранены в S3 этим процессом
+_saved_prompt_versions = set()
+
+# Ключи исходных файлов, которые уже есть в S3 (проверено этим процессом)
+_saved_blobs = set()
 
 
 class S3Handler:
@@ -13,6 +22,9 @@ class S3Handler:
     """
 
     def __init__(self):
+        # s3fs нужен только для сохранения результатов после проверки
+        import s3fs
+
         self.fs = s3fs.S3FileSystem(
             key=st.secrets["AWS_ACCESS_KEY_ID"],
             secret=st.secrets["AWS_SECRET_ACCESS_KEY"],
@@ -70,23 +82,93 @@ class S3Handler:
                 file_path = f"{self.base_path}/{file_type}"
                 self._save_file(file_path, content)
 
+    def save_blob(self, content: bytes, extension: str = "") -> str:
+        """
+        Сохраняет файл в S3 под ключом по хэшу его содержимого
+        (blobs/<SHA-256><расширение>), если такого файла еще нет.
+
+        Args:
+            content: Содержимое файла
+            extension: Расширение файла (например, .pdf)
+
+        Returns:
+            str: Ключ файла относительно корня бакета
+        """
+        key = f"blobs/{hashlib.sha256(content).hexdigest()}{extension.lower()}"
+        if key in _saved_blobs:
+            return key
+        blob_path = f"{self.bucket}/{key}"
+        if self.fs.exists(blob_path):
+            logging.info(f"Файл {key} уже есть в S3, загрузка пропущена")
+        else:
+            self._save_file(blob_path, content)
+        _saved_blobs.add(key)
+        return key
+
+    def save_source_files_to_s3(self, files: Dict[str, bytes]) -> Dict[str, Any]:
+        """
+        Сохраняет исходные файлы проверки без дублирования.
+
+        Содержимое файлов сохраняется однократно (см. save_blob),
+        а в папку проверки записывается манифест manifest.json
+        с именами файлов и ссылками на их содержимое.
+
+        Args:
+            files: Словарь с содержимым исходных файлов по их именам
+
+        Returns:
+            Dict[str, Any]: Манифест исходных файлов
+        """
+        manifest = {
+            "files": [
+                {
+                    "name": file_name,
+                    "size": len(content),
+                    "key": self.save_blob(content, os.path.splitext(file_name)[1]),
+                }
+                for file_name, content in files.items()
+                if content
+            ]
+        }
+        with self.fs.open(f"{self.base_path}/manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=4)
+        return manifest
+
+    def save_prompt_versions(self, versions: Dict[str, str]) -> None:
+        """
+        Сохраняет тексты версий промптов в S3 (prompts/<версия>.txt),
+        если они еще не сохранены.
+
+        Args:
+            versions: Версии промптов по этапам проверки
+        """
+        for version in set(versions.values()) - _saved_prompt_versions:
+            prompt_path = f"{self.bucket}/prompts/{version}.txt"
+            if not self.fs.exists(prompt_path):
+                content = prompt_manager.get_prompt_by_version(version)
+                if content is None:
+                    logging.warning(f"Текст версии промпта {version} не найден")
+                    continue
+                with self.fs.open(prompt_path, "w", encoding="utf-8") as f:
+                    f.write(content)
+            _saved_prompt_versions.add(version)
+
     def save_results_json_to_s3(self, results_json: Dict) -> None:
         """
-        Сохраняет все результаты в S3 в виде json.
+        Сохраняет все результаты в S3 одной записью в формате архивации
+        (см. utils.results_archive), по умолчанию results.json.zst.
+
+        В записи сохраняются только версии промптов, а их тексты -
+        однократно в prompts/<версия>.txt.
 
         Args:
             results_json: Результаты проверки
         """
-        # Добавляем тексты промптов и флаг модификации промптов
-        results_json["prompts"] = {
-            "custom_use": bool(prompt_manager.modified_prompts),
-            "criteria_forming": prompt_manager.get_prompt("CRITERIA_FORMING_TEMPLATE"),
-            "check_report": prompt_manager.get_prompt("CHECK_REPORT_TEMPLATE"),
-            "feedback_forming": prompt_manager.get_prompt("FEEDBACK_FORMING_TEMPLATE"),
-        }
-        results_json_path = f"{self.base_path}/results.json"
-        with self.fs.open(results_json_path, "w", encoding="utf-8") as f:
-            json.dump(results_json, f, ensure_ascii=False, indent=4)
+        self.save_prompt_versions(results_json.get("prompts", {}).get("versions", {}))
+        archive_format = get_archive_format()
+        results_json_path = f"{self.base_path}/{get_results_file_name(archive_format)}"
+        with self.fs.open(results_json_path, "wb") as f:
+            write_results(f, results_json, archive_format)
 
 
 def save_to_s3(s3_handler, files_to_s3_save, report_file_name, results_json, timestamp):
@@ -95,12 +177,17 @@ def save_to_s3(s3_handler, files_to_s3_save, report_file_name, results_json, tim
 
     Args:
         s3_handler: Объект для работы с S3
-        files_to_s3_save: Словарь с файлами для сохранения
+        files_to_s3_save: Исходные файлы и файлы результатов
+                          (см. prepare_s3_files)
         report_file_name: Имя файла отчета
         results_json: JSON с результатами проверки
     """
     s3_handler.log_check_run(report_file_name, timestamp)
-    s3_handler.save_files_to_s3(files_to_s3_save)
+    s3_handler.save_source_files_to_s3(files_to_s3_save["sources"])
+    # Результаты в Markdown дублируют запись результатов, поэтому
+    # отдельно сохраняются только при архивации в несжатый JSON
+    if get_archive_format() == "json":
+        s3_handler.save_files_to_s3(files_to_s3_save["results"])
     s3_handler.save_results_json_to_s3(results_json)
 
 
@@ -109,26 +196,28 @@ def prepare_s3_files(files_to_save, check_result, check_criteria, feedback):
     Подготавливает файлы для сохранения в S3.
 
     Args:
-        files_to_save: Словарь с исходными файлами
+        files_to_save: Словарь с содержимым исходных файлов по их именам
         check_result: Результаты проверки
         check_criteria: Структурированные критерии оценки
         feedback: Обратная связь для студента
 
     Returns:
-        Dict[str, bytes]: Словарь с подготовленными файлами для сохранения в S3
+        Dict[str, Dict[str, bytes]]: Исходные файлы (sources) и файлы
+                                     результатов (results) для сохранения в S3
     """
-    files_to_s3_save = {}
     # Получаем исходные файлы
-    for file in files_to_save.values():
-        if file:
-            files_to_s3_save[file.name] = file.getvalue()
+    source_files = {
+        file_name: content for file_name, content in files_to_save.items() if content
+    }
 
     # Добавляем результаты проверки и критерии
-    files_to_s3_save["Результаты проверки.md"] = check_result.encode()
-    files_to_s3_save["Адаптированные критерии проверки.md"] = check_criteria.encode()
+    result_files = {
+        "Результаты проверки.md": check_result.encode(),
+        "Адаптированные критерии проверки.md": check_criteria.encode(),
+    }
 
     # Добавляем обратную связь, если она была сгенерирована
     if feedback:
-        files_to_s3_save["Обратная связь для студента.md"] = feedback.encode()
+        result_files["Обратная связь для студента.md"] = feedback.encode()
 
-    return files_to_s3_save
+    return {"sources": source_files, "results": result_files}
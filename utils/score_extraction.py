@@ -0,0 +1,187 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Упоминание итоговой оценки: "Итоговая оценка", "Итоговый балл"
+TOTAL_SCORE_MARKER = re.compile(r"итогов(?:ая|ый)\s+(?:оценк|балл)\w*", re.IGNORECASE)
+
+# Формула: $$...$$ или $...$
+FORMULA = re.compile(r"\$\$(.+?)\$\$|\$([^$\n]+)\$", re.DOTALL)
+
+# Результат равенства: "= 78", "\approx 81.67", "= \mathbf{78}", "= **78**"
+RELATION_RESULT = re.compile(
+    r"(?:=|≈|\\approx)\s*(?:\\[a-z]+\s*\{\s*)*\**\s*(\d{1,3}(?:[.,]\d+)?)",
+    re.IGNORECASE,
+)
+
+# Любое число
+NUMBER = re.compile(r"\d{1,3}(?:[.,]\d+)?")
+
+# Указание шкалы после оценки: "/100", "из 100"
+SCALE = re.compile(r"\s*(?:/|из|of)\s*100\b", re.IGNORECASE)
+
+# Продолжение расчета после числа: другие числа и дроби
+CALCULATION = re.compile(r"\d|\\frac")
+
+# Количество символов после упоминания итоговой оценки, в которых ищется число
+SCORE_WINDOW = 400
+
+# Максимальная оценка
+MAX_SCORE = 100
+
+# Блок JSON с оценками в результатах проверки (см. prompts/check_report.txt)
+SCORES_BLOCK = re.compile(
+    r"```(?:json)?[ \t]*\n?\s*(\{(?:(?!```).)*\})\s*```", re.DOTALL
+)
+
+
+def _is_number(value: Any) -> bool:
+    """Проверяет, что значение - число (bool числом не считается)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _to_score(value: str) -> Optional[float]:
+    """Преобразует найденное число в оценку, если оно в допустимом диапазоне."""
+    score = float(value.replace(",", "."))
+    return score if 0 <= score <= MAX_SCORE else None
+
+
+def _get_relation_result(expression: str) -> Optional[float]:
+    """
+    Возвращает результат последнего равенства в выражении.
+
+    Если после результата расчет продолжается, результат
+    считается неоднозначным.
+    """
+    results = list(RELATION_RESULT.finditer(expression))
+    if not results:
+        return None
+    tail = SCALE.sub("", expression[results[-1].end() :])
+    if CALCULATION.search(tail):
+        return None
+    return _to_score(results[-1].group(1))
+
+
+def _get_score_after_marker(window: str) -> Optional[float]:
+    """Извлекает итоговую оценку из текста после ее упоминания."""
+    formulas = [match.group(1) or match.group(2) for match in FORMULA.finditer(window)]
+    if formulas:
+        return _get_relation_result(formulas[-1])
+
+    # Без формулы оценка записана в той же строке: "Итоговая оценка: 78/100"
+    line = window.split("\n", 1)[0]
+    if RELATION_RESULT.search(line):
+        return _get_relation_result(line)
+    numbers = NUMBER.findall(SCALE.sub("", line))
+    return _to_score(numbers[0]) if len(numbers) == 1 else None
+
+
+def extract_total_score(check_results: Optional[str]) -> Optional[float]:
+    """
+    Извлекает итоговую оценку по шкале от 0 до 100 из результатов проверки.
+
+    Ищет упоминания итоговой оценки ("Итоговая оценка", "Итоговый балл")
+    с последнего. Если после упоминания (до пустой строки, но не далее
+    SCORE_WINDOW символов) есть формула $$...$$, берет результат последнего
+    равенства ("=" или "\\approx") в последней формуле, иначе - результат
+    равенства или единственное число в строке упоминания. Если результат
+    неоднозначен (после него расчет продолжается, в строке несколько чисел),
+    оценка не угадывается.
+
+    Args:
+        check_results (str, optional): Результаты проверки в формате Markdown
+
+    Returns:
+        Optional[float]: Итоговая оценка или None, если ее не удалось
+                         однозначно найти
+    """
+    if not check_results:
+        return None
+    markers = list(TOTAL_SCORE_MARKER.finditer(check_results))
+    for marker in reversed(markers):
+        window = check_results[marker.end() : marker.end() + SCORE_WINDOW]
+        # Расчет итоговой оценки заканчивается пустой строкой после формулы
+        window = re.split(r"\n\s*\n(?!\s*\$\$)", window, maxsplit=1)[0]
+        score = _get_score_after_marker(window)
+        if score is not None:
+            return score
+    return None
+
+
+def _parse_criteria(criteria: Any) -> List[Dict[str, Any]]:
+    """Отбирает оценки критериев с названием и числовой оценкой."""
+    parsed = []
+    for criterion in criteria if isinstance(criteria, list) else []:
+        if not isinstance(criterion, dict):
+            continue
+        name, score = criterion.get("name"), criterion.get("score")
+        if not isinstance(name, str) or not _is_number(score):
+            continue
+        max_score = criterion.get("max_score")
+        parsed.append(
+            {
+                "name": name.strip(),
+                "score": float(score),
+                "max_score": (
+                    float(max_score) if _is_number(max_score) else None
+                ),
+            }
+        )
+    return parsed
+
+
+def extract_check_scores(check_results: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    Отделяет структурированные оценки от результатов проверки.
+
+    Модель добавляет в конец результатов проверки блок JSON с оценками
+    по критериям и итоговой оценкой (иногда после него следует еще
+    заключительный текст). Используется последний блок с total_score;
+    он удаляется из текста, который
+    показывается пользователю и передается на этап обратной связи.
+    Если блока нет или он некорректен, итоговая оценка извлекается
+    из текста (см. extract_total_score), а оценки по критериям не заполняются.
+
+    Args:
+        check_results (str): Ответ модели на этапе проверки отчета
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: Результаты проверки в формате Markdown
+            и оценки: total_score (итоговая оценка или None),
+            criteria (список с name, score и max_score по критериям)
+            и source (structured - из блока JSON, text - из текста,
+            None - оценку найти не удалось)
+    """
+    check_results = check_results or ""
+    scores = None
+    blocks = [
+        match
+        for match in SCORES_BLOCK.finditer(check_results)
+        if "total_score" in match.group(1)
+    ]
+    if blocks:
+        match = blocks[-1]
+        check_results = (
+            check_results[: match.start()].rstrip()
+            + "\n\n"
+            + check_results[match.end() :].lstrip()
+        ).strip() + "\n"
+        try:
+            scores = json.loads(match.group(1))
+        except json.JSONDecodeError:
+            scores = None
+
+    total_score = scores.get("total_score") if isinstance(scores, dict) else None
+    if _is_number(total_score) and 0 <= total_score <= MAX_SCORE:
+        return check_results, {
+            "total_score": float(total_score),
+            "criteria": _parse_criteria(scores.get("criteria")),
+            "source": "structured",
+        }
+
+    total_score = extract_total_score(check_results)
+    return check_results, {
+        "total_score": total_score,
+        "criteria": [],
+        "source": "text" if total_score is not None else None,
+    }
@@ -0,0 +1,289 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+from typing import Any, Dict, Optional
+
+
+class SharedStore(ABC):
+    """
+    Общее хранилище состояния приложения.
+
+    Состояние, которое должно быть согласованным между несколькими
+    экземплярами веб-приложения (измененные промпты, идентификаторы
+    записей Airtable, состояния графа проверки), хранится не в памяти
+    процесса, а в этом хранилище. Значения хранятся по пространствам
+    имен и должны сериализоваться в JSON.
+
+    Реализации выбираются по схеме адреса (см. create_shared_store),
+    новую реализацию можно добавить в SHARED_STORE_BACKENDS.
+    """
+
+    @abstractmethod
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """
+        Возвращает значение.
+
+        Args:
+            namespace (str): Пространство имен
+            key (str): Ключ
+            default (Any): Значение, если ключа нет или срок его хранения истек
+
+        Returns:
+            Any: Значение
+        """
+
+    @abstractmethod
+    def set(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        """
+        Сохраняет значение.
+
+        Args:
+            namespace (str): Пространство имен
+            key (str): Ключ
+            value (Any): Значение, сериализуемое в JSON
+            ttl (float, optional): Время хранения в секундах, None - бессрочно
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str) -> None:
+        """
+        Удаляет значение.
+
+        Args:
+            namespace (str): Пространство имен
+            key (str): Ключ
+        """
+
+    @abstractmethod
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """
+        Возвращает все значения пространства имен.
+
+        Args:
+            namespace (str): Пространство имен
+
+        Returns:
+            Dict[str, Any]: Значения по ключам
+        """
+
+    @abstractmethod
+    def clear(self, namespace: str) -> None:
+        """
+        Удаляет все значения пространства имен.
+
+        Args:
+            namespace (str): Пространство имен
+        """
+
+    def create_checkpointer(self) -> Any:
+        """
+        Создает хранилище состояний графа проверки (checkpointer LangGraph).
+
+        Returns:
+            BaseCheckpointSaver: Хранилище состояний графа
+        """
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver()
+
+
+class MemorySharedStore(SharedStore):
+    """
+    Хранилище в памяти процесса.
+
+    Подходит для одного экземпляра приложения, CLI и тестовых запусков.
+    """
+
+    def __init__(self, location: str = ""):
+        self._data: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _is_alive(self, entry: Dict[str, Any]) -> bool:
+        """Проверяет, не истек ли срок хранения значения."""
+        return entry["expires_at"] is None or entry["expires_at"] > time.time()
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(namespace, {}).get(key)
+            return entry["value"] if entry and self._is_alive(entry) else default
+
+    def set(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            self._data.setdefault(namespace, {})[key] = {
+                "value": value,
+                "expires_at": time.time() + ttl if ttl else None,
+            }
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._data.get(namespace, {}).pop(key, None)
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                key: entry["value"]
+                for key, entry in self._data.get(namespace, {}).items()
+                if self._is_alive(entry)
+            }
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._data.pop(namespace, None)
+
+
+class SQLiteSharedStore(SharedStore):
+    """
+    Хранилище в файле SQLite.
+
+    Несколько экземпляров приложения на одном сервере (или с общим
+    томом) используют один файл базы данных и видят одно и то же
+    состояние. В том же файле хранятся состояния графа проверки.
+
+    Attributes:
+        path (str): Путь к файлу базы данных
+    """
+
+    def __init__(self, location: str):
+        self.path = location
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Открывает соединение с базой и создает таблицу при первом обращении."""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with connection:
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS shared_state (
+                        namespace TEXT NOT NULL,
+                        key TEXT NOT NULL,
+                        value TEXT NOT NULL,
+                        expires_at REAL,
+                        PRIMARY KEY (namespace, key)
+                    )
+                    """
+                )
+            self._initialized = True
+        return connection
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        with self._lock, closing(self._connect()) as connection:
+            row = connection.execute(
+                """
+                SELECT value FROM shared_state
+                WHERE namespace = ? AND key = ?
+                AND (expires_at IS NULL OR expires_at > ?)
+                """,
+                (namespace, key, time.time()),
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(
+        self, namespace: str, key: str, value: Any, ttl: Optional[float] = None
+    ) -> None:
+        now = time.time()
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO shared_state VALUES (?, ?, ?, ?)",
+                (
+                    namespace,
+                    key,
+                    json.dumps(value, ensure_ascii=False),
+                    now + ttl if ttl else None,
+                ),
+            )
+            connection.execute(
+                "DELETE FROM shared_state WHERE expires_at <= ?", (now,)
+            )
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM shared_state WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        with self._lock, closing(self._connect()) as connection:
+            rows = connection.execute(
+                """
+                SELECT key, value FROM shared_state
+                WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)
+                """,
+                (namespace, time.time()),
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def clear(self, namespace: str) -> None:
+        with self._lock, closing(self._connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM shared_state WHERE namespace = ?", (namespace,)
+            )
+
+    def create_checkpointer(self) -> Any:
+        """
+        Создает хранилище состояний графа в том же файле SQLite.
+
+        Требует пакет langgraph-checkpoint-sqlite; если он не установлен,
+        состояния графа хранятся в памяти процесса.
+        """
+        try:
+            from langgraph.checkpoint.sqlite import SqliteSaver
+        except ImportError:
+            logging.warning(
+                "⚠️ Пакет langgraph-checkpoint-sqlite не установлен "
+                "(см. requirements.txt): состояния графа хранятся в памяти "
+                "процесса и не доступны другим экземплярам приложения"
+            )
+            return super().create_checkpointer()
+        self._connect().close()
+        return SqliteSaver(sqlite3.connect(self.path, check_same_thread=False))
+
+
+# Реализации общего хранилища по схеме адреса
+SHARED_STORE_BACKENDS = {
+    "memory": MemorySharedStore,
+    "sqlite": SQLiteSharedStore,
+}
+
+
+def create_shared_store(url: str) -> SharedStore:
+    """
+    Создает общее хранилище по адресу вида <схема>://<расположение>,
+    например sqlite://.cache/shared_state.sqlite или memory://.
+
+    Args:
+        url (str): Адрес хранилища
+
+    Returns:
+        SharedStore: Хранилище
+
+    Raises:
+        ValueError: Если схема адреса не поддерживается
+    """
+    scheme, _, location = url.partition("://")
+    if scheme not in SHARED_STORE_BACKENDS:
+        raise ValueError(
+            f"Неподдерживаемое общее хранилище: {scheme}. "
+            f"Доступны: {', '.join(SHARED_STORE_BACKENDS)}"
+        )
+    return SHARED_STORE_BACKENDS[scheme](location)
+
+
+# Global instance
+shared_store = create_shared_store(
+    os.getenv("SHARED_STORE_URL", "sqlite://.cache/shared_state.sqlite")
+)
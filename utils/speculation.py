@@ -0,0 +1,160 @@
+import hashlib
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+
+def make_speculation_key(kind: str, *parts: Any) -> str:
+    """
+    Формирует ключ спекулятивной задачи по содержимому входных данных.
+
+    Args:
+        kind (str): Тип задачи (например, extraction или criteria)
+        *parts: Входные данные задачи (bytes или значения, приводимые к str)
+
+    Returns:
+        str: Ключ задачи вида <тип>:<SHA-256 хэш>
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, (bytes, memoryview)) else str(part).encode("utf-8")
+        digest.update(hashlib.sha256(data).digest())
+    return f"{kind}:{digest.hexdigest()}"
+
+
+class SpeculativeExecutor:
+    """
+    Фоновое выполнение работы, которая, вероятно, понадобится для проверки.
+
+    Пока пользователь заполняет форму, извлечение текста и адаптация
+    критериев запускаются заранее. Результаты хранятся только в памяти
+    процесса по ключу содержимого и забираются при запуске проверки.
+    Задачи, результат которых так и не был использован (файл заменили,
+    сессию закрыли), учитываются как лишняя работа.
+
+    Attributes:
+        max_entries (int): Максимальное количество хранимых задач
+        ttl (float): Время хранения неиспользованной задачи в секундах
+    """
+
+    def __init__(self, max_workers: int = 4, max_entries: int = 256, ttl: float = 1800):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="speculation"
+        )
+        self._tasks: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._started = Counter()
+        self._used = Counter()
+        self._wasted = Counter()
+        self._wasted_seconds = Counter()
+
+    def _run(self, task: Dict[str, Any], fn: Callable, args) -> Any:
+        """Выполняет задачу и запоминает время ее выполнения."""
+        start_time = time.time()
+        try:
+            return fn(*args)
+        finally:
+            task["duration"] = time.time() - start_time
+
+    def _discard(self, key: str) -> None:
+        """Удаляет неиспользованную задачу и учитывает ее как лишнюю работу."""
+        task = self._tasks.pop(key)
+        kind = key.split(":", 1)[0]
+        if task["future"].cancel():
+            return
+        self._wasted[kind] += 1
+        self._wasted_seconds[kind] += task.get(
+            "duration", time.time() - task["started_at"]
+        )
+
+    def submit(self, key: str, fn: Callable, *args: Any) -> Future:
+        """
+        Запускает задачу, если задача с таким ключом еще не запущена.
+
+        Args:
+            key (str): Ключ задачи (см. make_speculation_key)
+            fn (Callable): Функция задачи
+            *args: Аргументы функции
+
+        Returns:
+            Future: Результат задачи
+        """
+        with self._lock:
+            now = time.time()
+            for old_key in [
+                old_key
+                for old_key, task in self._tasks.items()
+                if now - task["started_at"] > self.ttl
+            ]:
+                self._discard(old_key)
+
+            if key in self._tasks:
+                self._tasks.move_to_end(key)
+                return self._tasks[key]["future"]
+
+            task = {"started_at": now}
+            task["future"] = self._executor.submit(self._run, task, fn, args)
+            self._tasks[key] = task
+            self._started[key.split(":", 1)[0]] += 1
+            while len(self._tasks) > self.max_entries:
+                self._discard(next(iter(self._tasks)))
+            return task["future"]
+
+    def take(self, key: Optional[str]) -> Optional[Future]:
+        """
+        Забирает задачу для использования ее результата.
+
+        Args:
+            key (str, optional): Ключ задачи
+
+        Returns:
+            Optional[Future]: Результат задачи или None, если задача не запускалась
+        """
+        with self._lock:
+            task = self._tasks.pop(key, None) if key else None
+            if task is None:
+                return None
+            self._used[key.split(":", 1)[0]] += 1
+            return task["future"]
+
+    def discard(self, key: Optional[str]) -> None:
+        """
+        Отменяет задачу, результат которой больше не понадобится.
+
+        Args:
+            key (str, optional): Ключ задачи
+        """
+        with self._lock:
+            if key in self._tasks:
+                self._discard(key)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Возвращает метрики спекулятивной работы по типам задач.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Количество запущенных, использованных
+                                       и лишних задач и время лишней работы
+        """
+        with self._lock:
+            return {
+                kind: {
+                    "started": self._started[kind],
+                    "used": self._used[kind],
+                    "wasted": self._wasted[kind],
+                    "wasted_seconds": self._wasted_seconds[kind],
+                }
+                for kind in self._started
+            }
+
+
+# Global instance
+speculative_executor = SpeculativeExecutor(
+    max_workers=int(os.getenv("SPECULATION_WORKERS", "4")),
+    max_entries=int(os.getenv("SPECULATION_MAX_ENTRIES", "256")),
+)
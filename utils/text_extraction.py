@@ -0,0 +1,300 @@
+import importlib.util
+import logging
+import os
+import zipfile
+from io import BytesIO
+from typing import Callable, Dict, Iterator, List, Optional, Union
+from xml.etree.ElementTree import iterparse
+
+from utils.ocr import ocr_processor
+
+# Функция бэкенда извлекает текст из файла в памяти постранично
+# (для DOCX и TXT страницей считается абзац или строка)
+PageExtractor = Callable[[BytesIO], Iterator[str]]
+
+
+class EmptyDocumentError(ValueError):
+    """Документ не содержит текста, пригодного для проверки."""
+
+
+WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def decode_text(data: bytes) -> str:
+    """
+    Декодирует текст с автоопределением кодировки.
+
+    Args:
+        data (bytes): Содержимое текстового файла
+
+    Returns:
+        str: Декодированный текст
+    """
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        import chardet
+
+        encoding = chardet.detect(data)["encoding"] or "cp1251"
+        return data.decode(encoding, errors="replace")
+
+
+def _pdf_pypdfium2(stream: BytesIO) -> Iterator[str]:
+    """Извлечение текста из PDF с помощью pypdfium2 (PDFium)."""
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(stream.getvalue())
+    try:
+        for page in document:
+            text_page = page.get_textpage()
+            yield text_page.get_text_range()
+            text_page.close()
+            page.close()
+    finally:
+        document.close()
+
+
+def _pdf_pymupdf(stream: BytesIO) -> Iterator[str]:
+    """Извлечение текста из PDF с помощью PyMuPDF."""
+    import fitz
+
+    with fitz.open(stream=stream.getvalue(), filetype="pdf") as document:
+        for page in document:
+            yield page.get_text()
+
+
+def _pdf_pypdf(stream: BytesIO) -> Iterator[str]:
+    """Извлечение текста из PDF с помощью pypdf."""
+    from pypdf import PdfReader
+
+    for page in PdfReader(stream).pages:
+        yield page.extract_text() or ""
+
+
+def _docx_xml(stream: BytesIO) -> Iterator[str]:
+    """
+    Потоковое извлечение абзацев из DOCX без сторонних библиотек.
+
+    Читает word/document.xml из архива по мере разбора, не загружая
+    документ целиком.
+    """
+    with zipfile.ZipFile(stream) as archive, archive.open("word/document.xml") as xml:
+        parts = []
+        for event, element in iterparse(xml, events=("end",)):
+            if element.tag == f"{WORD_NAMESPACE}t":
+                parts.append(element.text or "")
+            elif element.tag == f"{WORD_NAMESPACE}tab":
+                parts.append("\t")
+            elif element.tag in (f"{WORD_NAMESPACE}br", f"{WORD_NAMESPACE}cr"):
+                parts.append("\n")
+            elif element.tag == f"{WORD_NAMESPACE}p":
+                yield "".join(parts)
+                parts = []
+                element.clear()
+
+
+def _docx_docx2txt(stream: BytesIO) -> Iterator[str]:
+    """Извлечение текста из DOCX с помощью docx2txt."""
+    import docx2txt
+
+    yield docx2txt.process(stream)
+
+
+def _txt_decode(stream: BytesIO) -> Iterator[str]:
+    """Построчное чтение текстового файла."""
+    yield from decode_text(stream.getvalue()).splitlines()
+
+
+# Бэкенды извлечения текста по форматам в порядке предпочтения:
+# быстрые бэкенды используются, если установлены их библиотеки
+EXTRACTION_BACKENDS: Dict[str, Dict[str, PageExtractor]] = {
+    ".pdf": {
+        "pypdfium2": _pdf_pypdfium2,
+        "pymupdf": _pdf_pymupdf,
+        "pypdf": _pdf_pypdf,
+    },
+    ".docx": {
+        "xml": _docx_xml,
+        "docx2txt": _docx_docx2txt,
+    },
+    ".txt": {
+        "decode": _txt_decode,
+    },
+}
+
+# Библиотеки, необходимые бэкендам
+BACKEND_MODULES = {
+    "pypdfium2": "pypdfium2",
+    "pymupdf": "fitz",
+    "pypdf": "pypdf",
+    "docx2txt": "docx2txt",
+}
+
+# Разделитель страниц при объединении текста
+PAGE_SEPARATOR = "\n"
+
+# Разделитель настоящих страниц (PDF): по нему нормализация текста
+# находит начало и конец страниц с колонтитулами
+PAGE_BREAK = "\f"
+
+# Форматы, в которых бэкенды возвращают настоящие страницы
+PAGED_FORMATS = (".pdf",)
+
+
+def is_backend_available(backend: str) -> bool:
+    """
+    Проверяет, установлена ли библиотека бэкенда.
+
+    Args:
+        backend (str): Название бэкенда
+
+    Returns:
+        bool: True, если бэкенд можно использовать
+    """
+    module = BACKEND_MODULES.get(backend)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def get_available_backends(extension: str) -> List[str]:
+    """
+    Возвращает доступные бэкенды для формата в порядке предпочтения.
+
+    Args:
+        extension (str): Расширение файла (например, ".pdf")
+
+    Returns:
+        List[str]: Названия доступных бэкендов
+    """
+    return [
+        backend
+        for backend in EXTRACTION_BACKENDS.get(extension, {})
+        if is_backend_available(backend)
+    ]
+
+
+def select_backend(extension: str, backend: Optional[str] = None) -> str:
+    """
+    Выбирает бэкенд для формата.
+
+    Бэкенд можно задать явно или переменной окружения
+    EXTRACTION_BACKEND_<ФОРМАТ> (например, EXTRACTION_BACKEND_PDF),
+    иначе используется первый доступный бэкенд.
+
+    Args:
+        extension (str): Расширение файла
+        backend (str, optional): Название бэкенда
+
+    Returns:
+        str: Название выбранного бэкенда
+
+    Raises:
+        ValueError: Если формат не поддерживается или бэкенд недоступен
+    """
+    if extension not in EXTRACTION_BACKENDS:
+        raise ValueError(f"Неподдерживаемый формат файла: {extension}")
+
+    backend = backend or os.getenv(f"EXTRACTION_BACKEND_{extension[1:].upper()}")
+    if backend:
+        if backend not in EXTRACTION_BACKENDS[extension]:
+            raise ValueError(f"Неизвестный бэкенд {backend} для формата {extension}")
+        if not is_backend_available(backend):
+            raise ValueError(f"Бэкенд {backend} недоступен: библиотека не установлена")
+        return backend
+
+    available = get_available_backends(extension)
+    if not available:
+        raise ValueError(f"Нет доступных бэкендов для формата {extension}")
+    return available[0]
+
+
+def iter_pages(
+    data: Union[bytes, memoryview], file_name: str, backend: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Постранично извлекает текст из файла в памяти.
+
+    Args:
+        data (bytes | memoryview): Содержимое файла
+        file_name (str): Имя файла, по расширению которого определяется формат
+        backend (str, optional): Название бэкенда
+
+    Yields:
+        str: Текст очередной страницы
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    backend = select_backend(extension, backend)
+    yield from EXTRACTION_BACKENDS[extension][backend](BytesIO(data))
+
+
+def extract_text(
+    data: Union[bytes, memoryview],
+    file_name: str,
+    backend: Optional[str] = None,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    ocr_cache_writes: Optional[list] = None,
+) -> str:
+    """
+    Извлекает текст из файла в памяти с ограничением объема.
+
+    Страницы читаются по одной, поэтому при достижении ограничения
+    оставшиеся страницы не разбираются (кроме бэкендов, возвращающих
+    весь текст одной страницей). По умолчанию ограничения берутся
+    из переменных окружения EXTRACTION_MAX_PAGES и EXTRACTION_MAX_CHARS.
+    Страницы PDF без текстового слоя (сканы) распознаются с помощью OCR.
+
+    Args:
+        data (bytes | memoryview): Содержимое файла
+        file_name (str): Имя файла, по расширению которого определяется формат
+        backend (str, optional): Название бэкенда
+        max_pages (int, optional): Максимальное количество страниц (для PDF)
+        max_chars (int, optional): Максимальное количество символов
+        ocr_cache_writes (list, optional): Список для отложенного сохранения
+            распознанных страниц в кэш (см. OCRProcessor.fill_empty_pages)
+
+    Returns:
+        str: Извлеченный текст (страницы PDF разделены символом PAGE_BREAK)
+    """
+    max_pages = max_pages or int(os.getenv("EXTRACTION_MAX_PAGES", "0")) or None
+    max_chars = max_chars or int(os.getenv("EXTRACTION_MAX_CHARS", "0")) or None
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension not in PAGED_FORMATS:
+        max_pages = None
+
+    separator = PAGE_BREAK if extension in PAGED_FORMATS else PAGE_SEPARATOR
+    pages = []
+    chars = 0
+    for number, page in enumerate(iter_pages(data, file_name, backend), start=1):
+        if max_pages and number > max_pages:
+            logging.warning(f"Файл {file_name} обрезан до {max_pages} страниц")
+            break
+        if max_chars and chars + len(page) > max_chars:
+            pages.append(page[: max_chars - chars])
+            logging.warning(f"Файл {file_name} обрезан до {max_chars} символов")
+            break
+        pages.append(page)
+        chars += len(page) + len(separator)
+
+    if extension in PAGED_FORMATS:
+        pages = ocr_processor.fill_empty_pages(data, pages, ocr_cache_writes)
+
+    return separator.join(pages)[:max_chars]
+
+
+def has_text_content(text: str, min_chars: Optional[int] = None) -> bool:
+    """
+    Проверяет, содержит ли документ текст, пригодный для проверки.
+
+    Скан без распознанного текста или пустой файл дают лишь несколько
+    символов, и проверка такого документа моделью не имеет смысла.
+
+    Args:
+        text (str): Извлеченный текст
+        min_chars (int, optional): Минимальное количество букв и цифр,
+                                   по умолчанию MIN_DOCUMENT_CHARS или 100
+
+    Returns:
+        bool: True, если в тексте не меньше min_chars букв и цифр
+    """
+    min_chars = min_chars or int(os.getenv("MIN_DOCUMENT_CHARS", "100"))
+    return sum(char.isalnum() for char in text) >= min_chars
@@ -0,0 +1,266 @@
+import logging
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Строки с оформленным номером страницы: "- 12 -", "Стр. 12", "Страница 12 из 40", "Page 3 of 9"
+PAGE_NUMBER_LINE = re.compile(
+    r"^(?:[\-–—]\s*\d{1,4}\s*[\-–—]"
+    r"|(?:стр\.?|страница|page)\s*\d{1,4}(?:\s*(?:из|of|/)\s*\d{1,4})?"
+    r"|\d{1,4}\s*(?:из|of|/)\s*\d{1,4})$",
+    re.IGNORECASE,
+)
+
+# Строка из одного числа: номер страницы или, например, ячейка таблицы
+NUMBER_LINE = re.compile(r"^\d{1,4}$")
+
+# Строки оглавления с точками-заполнителями: "1.2 Цели проекта ........ 5"
+TOC_LINE = re.compile(r"^.{2,}?(?:\s*[.…·_]){4,}\s*\d{1,4}\s*$")
+
+# Перенос слова по слогам с мягким переносом в конце строки: "разра\u00ad\nботка"
+SOFT_HYPHENATION = re.compile(r"(\w)\u00ad\n[ \t]*(\w)")
+
+# Дефис в конце строки: "северо-\nзападный". Дефис может быть частью
+# составного слова ("что-то"), поэтому он сохраняется, а удаляется только
+# перевод строки
+LINE_END_HYPHEN = re.compile(r"(\w)-\n[ \t]*([a-zа-яё])")
+
+# Номер страницы в начале или конце строки колонтитула: "Отчет по проекту 12",
+# "12 Отчет по проекту", "Отчет по проекту 12 из 40"
+HEADER_PAGE_NUMBER = re.compile(
+    r"^\d{1,4}\b|\b\d{1,4}(?:\s*(?:из|of|/)\s*\d{1,4})?$", re.IGNORECASE
+)
+
+# Минимальное количество идущих подряд строк оглавления
+MIN_TOC_LINES = 3
+
+# Максимальное количество непустых строк между строками одного оглавления
+# (например, перенесенное название раздела или колонтитул)
+MAX_TOC_GAP = 2
+
+# Количество первых непустых строк документа, в которых ищется оглавление
+TOC_SEARCH_LINES = 200
+
+# Минимальное количество страниц, на которых повторяется строка колонтитула
+MIN_HEADER_REPEATS = 3
+
+# Максимальная длина строки колонтитула
+MAX_HEADER_LENGTH = 100
+
+# Количество первых и последних непустых строк страницы, среди которых
+# ищутся колонтитулы и номера страниц
+PAGE_EDGE_LINES = 2
+
+# Разделитель страниц в извлеченном тексте (см. text_extraction.PAGE_BREAK)
+PAGE_BREAK = "\f"
+
+
+def _header_key(line: str) -> str:
+    """Ключ строки колонтитула: номер страницы в начале или конце не учитывается."""
+    return HEADER_PAGE_NUMBER.sub("#", line)
+
+
+def _is_header_candidate(line: str) -> bool:
+    """Проверяет, может ли строка быть колонтитулом."""
+    return len(line) <= MAX_HEADER_LENGTH and any(char.isalpha() for char in line)
+
+
+def _get_page_edges(lines: List[str]) -> List[int]:
+    """Возвращает индексы первых и последних непустых строк страницы."""
+    filled = [index for index, line in enumerate(lines) if line]
+    return sorted(set(filled[:PAGE_EDGE_LINES] + filled[-PAGE_EDGE_LINES:]))
+
+
+def _get_toc_lines(pages: List[List[str]]) -> Set[Tuple[int, int]]:
+    """
+    Находит строки оглавления в начале документа.
+
+    Оглавлением считаются не менее MIN_TOC_LINES строк с точками-заполнителями,
+    между которыми не более MAX_TOC_GAP других непустых строк, если первая
+    из них находится среди первых TOC_SEARCH_LINES непустых строк документа.
+    Отдельные похожие строки в теле документа (например, "Итого ..... 15"
+    в таблице) оглавлением не считаются.
+
+    Args:
+        pages (List[List[str]]): Строки страниц документа
+
+    Returns:
+        Set[Tuple[int, int]]: Номера страниц и строк оглавления
+    """
+    filled = [
+        (page_index, index)
+        for page_index, lines in enumerate(pages)
+        for index, line in enumerate(lines)
+        if line
+    ]
+    toc_lines = set()
+    block = []
+    gap = 0
+    for position, (page_index, index) in enumerate(filled):
+        if TOC_LINE.match(pages[page_index][index]):
+            if not block and position >= TOC_SEARCH_LINES:
+                break
+            block.append((page_index, index))
+            gap = 0
+            continue
+        gap += 1
+        if block and gap > MAX_TOC_GAP:
+            if len(block) >= MIN_TOC_LINES:
+                toc_lines.update(block)
+            block = []
+    if len(block) >= MIN_TOC_LINES:
+        toc_lines.update(block)
+    return toc_lines
+
+
+def _are_page_numbers(numbers) -> bool:
+    """
+    Проверяет, похожи ли строки из одного числа на нумерацию страниц.
+
+    Номера страниц идут по возрастанию с шагом 1, а числа из таблиц - нет.
+    """
+    if len(numbers) < MIN_HEADER_REPEATS:
+        return False
+    steps = [current - previous for previous, current in zip(numbers, numbers[1:])]
+    return sum(step == 1 for step in steps) >= 0.8 * len(steps)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Удаляет из извлеченного текста шум, не влияющий на проверку.
+
+    Нормализация детерминирована и выполняет следующие шаги:
+        - склеивает слова, разделенные мягким переносом в конце строки,
+          а у дефиса в конце строки удаляет только перевод строки;
+        - удаляет строки оглавления в начале документа (см. _get_toc_lines);
+        - в первых и последних PAGE_EDGE_LINES строках каждой страницы
+          удаляет номера страниц (строки из одного числа - только если
+          они образуют нумерацию) и оставляет только первое вхождение
+          колонтитулов (строк, повторяющихся на краях не менее
+          MIN_HEADER_REPEATS страниц, без учета номера страницы в начале
+          или конце строки);
+        - схлопывает повторяющиеся пробелы и пустые строки.
+
+    Строки в теле страницы (например, повторяющиеся ячейки таблиц)
+    не удаляются. Страницы разделены символом PAGE_BREAK; текст без
+    разделителей (DOCX, TXT) считается одной страницей.
+
+    Args:
+        text (str): Извлеченный текст документа
+
+    Returns:
+        str: Нормализованный текст
+    """
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = text.replace("\u00a0", " ")
+    text = SOFT_HYPHENATION.sub(r"\1\2", text)
+    text = LINE_END_HYPHEN.sub(r"\1-\2", text)
+    text = text.replace("\u00ad", "")
+
+    pages = [
+        [re.sub(r"[ \t]+", " ", line).strip() for line in page.split("\n")]
+        for page in text.split(PAGE_BREAK)
+    ]
+    edges = [_get_page_edges(lines) for lines in pages]
+    toc_lines = _get_toc_lines(pages)
+
+    # Количество страниц, на краях которых встречается строка
+    counts = Counter(
+        key
+        for lines, indices in zip(pages, edges)
+        for key in {_header_key(lines[index]) for index in indices}
+    )
+    numbered_pages = _are_page_numbers(
+        [
+            int(lines[index])
+            for lines, indices in zip(pages, edges)
+            for index in indices
+            if NUMBER_LINE.match(lines[index])
+        ]
+    )
+
+    result = []
+    seen_headers = set()
+    for page_index, (lines, indices) in enumerate(zip(pages, edges)):
+        edge_indices = set(indices)
+        for index, line in enumerate(lines):
+            if (page_index, index) in toc_lines:
+                continue
+            if index in edge_indices:
+                if PAGE_NUMBER_LINE.match(line):
+                    continue
+                if numbered_pages and NUMBER_LINE.match(line):
+                    continue
+                key = _header_key(line)
+                if counts[key] >= MIN_HEADER_REPEATS and _is_header_candidate(line):
+                    if key in seen_headers:
+                        continue
+                    seen_headers.add(key)
+            result.append(line)
+
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(result)).strip()
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional[Any]:
+    """
+    Загружает токенизатор cl100k_base один раз за время работы процесса.
+
+    Returns:
+        Optional[tiktoken.Encoding]: Токенизатор или None, если он недоступен
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logging.debug(f"Токенизатор tiktoken недоступен: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    Подсчитывает количество токенов в тексте.
+
+    Использует токенизатор cl100k_base из tiktoken. Если токенизатор
+    недоступен (например, нет доступа к сети для загрузки словаря),
+    количество токенов оценивается как число символов, деленное на 4.
+
+    Args:
+        text (str): Текст
+
+    Returns:
+        int: Количество токенов
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text))
+
+
+def normalize_document(text: str, enabled: bool = True) -> Tuple[str, Dict[str, Any]]:
+    """
+    Нормализует текст документа и подсчитывает сэкономленные токены.
+
+    Args:
+        text (str): Извлеченный текст документа
+        enabled (bool): Выполнять ли нормализацию
+
+    Returns:
+        Tuple[str, Dict[str, Any]]: Текст и статистика: количество токенов
+                                    до и после нормализации и сэкономленные
+                                    токены
+    """
+    tokens_before = count_tokens(text)
+    if enabled:
+        text = normalize_text(text)
+    else:
+        text = text.replace(PAGE_BREAK, "\n")
+    tokens_after = count_tokens(text) if enabled else tokens_before
+    return text, {
+        "normalized": enabled,
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_after,
+        "tokens_saved": tokens_before - tokens_after,
+    }